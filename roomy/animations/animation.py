@@ -1,4 +1,5 @@
-from pygame import Surface
+from pygame import Surface, mask
+from pygame.mask import Mask
 
 from typing import Any
 from datetime import timedelta
@@ -63,13 +64,23 @@ class Animation(ABC):
 
         raise NotImplementedError
 
+    @property
+    def mask(self) -> Mask:
+        """
+        Can optionally be overridden.
+        Returns a collision mask for the current frame of the animation.
+        It is recommended to override this with a property that retrieves a cached mask, where possible
+        """
+
+        return mask.from_surface(self.frame)
+
     def update(self, elapsed_ms: int) -> None:
         self._add_elapsed(elapsed_ms)
         self._update(elapsed_ms)
 
     def _update(self, elapsed_ms: int) -> None:
         """
-        Lifecycle method, called automatically each game tick.
+        Lifecycle method, called automatically each time the parent renderable's frame is rendered.
         Can optionally be overridden.
 
         Any additional work that may be needed in specific animations,
@@ -1,4 +1,5 @@
 from pygame import Surface
+from pygame.mask import Mask
 
 from abc import ABC
 from typing import Any
@@ -16,15 +17,27 @@ class FileAnimation(Animation, ABC):
 
         self._settings = self.animation_cache.get_settings(type(parent), animation_key)
 
+        self._pinned_size = None  # The size modifier that this animation's frames are currently pinned in the cache at
+
     @property
     def total_frames(self) -> int:
         return len(self._settings[AnimationDataKey.FRAMES])
 
+    @property
+    def frame_key(self):
+        return self._settings[AnimationDataKey.FRAMES][self.frame_index]
+
     @property
     def frame(self) -> Surface:
-        frame_key = self._settings[AnimationDataKey.FRAMES][self.frame_index]
+        self._pin_frames()
+
+        return self.animation_cache.get_frame(self.frame_key, self.size)
+
+    @property
+    def mask(self) -> Mask:
+        self._pin_frames()
 
-        return self.animation_cache.get_frame(frame_key, self.size)
+        return self.animation_cache.get_mask(self.frame_key, self.size)
 
     @property
     def frame_index(self) -> int:
@@ -34,3 +47,13 @@ class FileAnimation(Animation, ABC):
         """
 
         raise NotImplementedError
+
+    def _pin_frames(self) -> None:
+        """
+        Pins this animation's frames at its current size in the animation cache, so that they are not evicted
+        while this animation is still in use. Re-pins them whenever the animation's size has changed
+        """
+
+        if self.size != self._pinned_size:
+            self.animation_cache.pin_frames(self, self._settings[AnimationDataKey.FRAMES], self.size)
+            self._pinned_size = self.size
@@ -1,6 +1,7 @@
-from typing import Dict, Container
+from typing import Dict, Collection, Iterable, Optional
 
 from .renderables.enums import RenderableHitboxTag
+from .utils.enums import CatchUpPolicy
 
 
 class Config:
@@ -12,6 +13,12 @@ class Config:
     """
     FPS: float = 0  # A value of 0 indicates unlimited framerate (must be >=0)
 
+    # Limits on how much work a single game loop may do to catch up, when ticks are taking longer than the tick rate
+    MAX_CATCH_UP_TICKS: int = 0  # A value of 0 indicates no limit on ticks per loop (must be >=0)
+    CATCH_UP_BUDGET_MS: float = 0  # A value of 0 indicates no time limit on catching up per loop (must be >=0)
+    # Determines what happens to the remaining backlog of ticks when either of the above limits is reached
+    CATCH_UP_POLICY: CatchUpPolicy = CatchUpPolicy.DROP
+
     RESOURCE_FOLDER_PATH = "res"  # Can either be absolute, or relative to the current working directory
 
     # Classes stored here will be stored in the class registrar
@@ -20,8 +27,28 @@ class Config:
     ALLOW_GLOBAL_CUSTOM_CLASSES: bool = True
 
     # Should contain all possible valid tags for the Hitbox class
-    HITBOX_TAGS: Container = set(
+    HITBOX_TAGS: Collection[str] = set(
         attribute for attribute in RenderableHitboxTag
     )
+    # Size of the grid cells which hitboxes are sorted into, to allow them to be queried by area
+    HITBOX_CELL_SIZE: int = 64
+    # Maps hitbox tags to the other tags they are able to collide with. A value of None allows all tags to collide
+    HITBOX_TAG_COLLISION_MATRIX: Optional[Dict[str, Iterable[str]]] = None
+    """
+    Entries are symmetric, so a pair of tags only needs to be listed once. Tags which are not listed in any entry
+    are unable to collide with anything, and hitboxes are only paired if at least one of their tags can collide
+    """
 
     ANIMATION_DEFAULT_FPS: float = 24
+    # Maximum total size of the frames held in the animation cache, in bytes
+    ANIMATION_CACHE_BUDGET_BYTES: int = 0  # A value of 0 indicates no limit (must be >=0)
+    """
+    Once this budget is exceeded, the least recently used frames are evicted from the cache until it is met again.
+    Frames belonging to animations which are still in use are never evicted, and so may cause the budget to be exceeded
+    """
+    # Number of background threads used to decode frames for AnimationCache.preload_frames_async()
+    ANIMATION_PRELOAD_THREADS: int = 0  # A value of 0 lets the thread pool decide (must be >=0)
+    # Folder in which decoded and scaled frames are stored, so that they do not need to be decoded again on later runs
+    ANIMATION_DISK_CACHE_PATH: Optional[str] = None  # A value of None disables the on-disk frame cache
+    # Texture atlas manifest written by TextureAtlasBuilder, relative to the resource folder
+    ANIMATION_ATLAS_MANIFEST_PATH: Optional[str] = None  # A value of None indicates that no texture atlas is used
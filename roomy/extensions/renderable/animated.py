@@ -19,7 +19,7 @@ class Animated(Extension, ABC):
         Extension._set_property(target_cls, "animation", Animated.__animation)
         Extension._set_setter(target_cls, "animation", "animation", Animated.__apply_animation)
 
-        Extension._wrap(target_cls, "update", Animated.__wrap_update)
+        Extension._wrap(target_cls, "frame", Animated.__wrap_frame)
         Extension._set(target_cls, "generate_animation", Animated.__generate_animation)
 
     def __wrap_init(self, *args, **kwargs):
@@ -39,9 +39,12 @@ class Animated(Extension, ABC):
         if animation.priority >= self._animation.priority:
             self._animation = animation
 
-    def __wrap_update(self, tick_number, elapsed_ms, input_events, *args, **kwargs):
+    def __wrap_frame(self, ms_since_last_tick, ms_since_last_frame):
         yield
-        self._animation.update(elapsed_ms)
+        if self.is_dormant:
+            return
+
+        self._animation.update(ms_since_last_frame)
         self.surface = self._animation.frame
 
     def __generate_animation(self) -> Animation:
@@ -16,6 +16,7 @@ class Hitboxed(Extension, ABC):
     @staticmethod
     def extend(target_cls):
         Extension._wrap(target_cls, "__init__", Hitboxed.__wrap_init)
+        Extension._wrap(target_cls, "_on_bounds_changed", Hitboxed.__wrap_on_bounds_changed)
 
         Extension._set_property(target_cls, "hitboxes", Hitboxed.__hitboxes)
         Extension._set_setter(target_cls, "hitboxes", "hitboxes", Hitboxed.__set_hitboxes)
@@ -29,6 +30,13 @@ class Hitboxed(Extension, ABC):
         Extension._set(self, "_hitboxes", frozenset())
         self.hitboxes = self.generate_hitboxes()
 
+    def __wrap_on_bounds_changed(self):
+        yield
+
+        # May be invoked by Renderable's constructor before hitboxes have been initialised
+        for hitbox in getattr(self, "_hitboxes", ()):
+            hitbox.flag_bounds_changed()
+
     def __hitboxes(self) -> FrozenSet[Hitbox]:
         return self._hitboxes
 
@@ -66,6 +74,9 @@ class Hitboxed(Extension, ABC):
 
         When a collision is detected between two objects, each of their respective `.collide()` methods should
         be invoked and passed the other object involved in that collision.
+
+        Alternatively, `Screen.is_collision_pass_enabled` can be set to have the screen detect and dispatch
+        all collisions itself, in which case this method does not need to be overridden.
         """
 
         pass
@@ -1,11 +1,17 @@
 import pygame
 from pygame import Surface
 
-from typing import Optional, Type
+from os import environ
+from contextlib import nullcontext
+from time import perf_counter
+from typing import Optional, Type, Tuple
 
 from .config import Config
 from .constants import Constants
-from .utils import GameEventHandler, GameEventType, ClassRegistrar, AnimationCache
+from .utils import (
+    GameEventHandler, GameEventType, ClassRegistrar, AnimationCache, HitboxTagIndex, FrameProfiler, ProfilerMetric,
+    CatchUpPolicy
+)
 from .renderables import Screen
 
 
@@ -13,7 +19,10 @@ class Game:
     """
     Entry point for your game.
     Requires a pygame display Surface to be passed into the constructor,
-    and .screen to be set to a valid Screen object, before calling .start() to begin the game loop
+    and .screen to be set to a valid Screen object, before calling .start() to begin the game loop.
+
+    Alternatively, a headless instance can be created via .headless(), and stepped manually via .run_ticks()
+    or .run_for() rather than being driven in real time by .start()
     """
 
     def __init__(self, window: Surface, config=Config):
@@ -36,12 +45,35 @@ class Game:
         self._ms_since_tick = 0
         self._ms_since_frame = 0
 
+        self._tick_number = 0
+
         self._clock = pygame.time.Clock()
 
         # Game-level utilities
         self._game_event_handler = GameEventHandler()
         self._class_registrar = ClassRegistrar(self)
         self._animation_cache = AnimationCache(self)
+        self._hitbox_tag_index = HitboxTagIndex(self)
+
+        self._profiler = None  # Opt-in, see .profiler
+
+    @classmethod
+    def headless(cls, window_size: Tuple[int, int] = (1, 1), config=Config) -> "Game":
+        """
+        Creates a Game instance which runs on SDL's dummy video driver, so that no real window is opened.
+        Intended for server-side simulations and automated tests, which should step the game via .run_ticks()
+        or .run_for() instead of calling .start().
+
+        Note that the dummy video driver can only be selected if pygame's display module
+        has not already been initialised with a different driver
+        """
+
+        environ["SDL_VIDEODRIVER"] = "dummy"
+
+        pygame.display.init()
+        window = pygame.display.set_mode(window_size)
+
+        return cls(window, config=config)
 
     @property
     def window(self) -> Surface:
@@ -69,6 +101,14 @@ class Game:
         self._fps = value
         self._frame_delay_ms = 0 if value == 0 else (1000/value)
 
+    @property
+    def tick_number(self) -> int:
+        """
+        The number of ticks that have been run since this game was initialised
+        """
+
+        return self._tick_number
+
     @property
     def screen(self) -> Optional[Screen]:
         return self._screen
@@ -93,9 +133,28 @@ class Game:
     def animation_cache(self) -> AnimationCache:
         return self._animation_cache
 
+    @property
+    def hitbox_tag_index(self) -> HitboxTagIndex:
+        return self._hitbox_tag_index
+
+    @property
+    def profiler(self) -> Optional[FrameProfiler]:
+        """
+        If a FrameProfiler is set here, the time taken by each phase of the game loop will be recorded in it,
+        and periodic snapshots of its recorded data will be emitted as GameEventType.PROFILER_SNAPSHOT events.
+        This also applies to headless games stepped via .run_ticks() or .run_for(), where each call counts as
+        a single loop when recording ProfilerMetric.CATCH_UP_TICKS.
+        Set to None (the default) to disable profiling
+        """
+
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, value: Optional[FrameProfiler]):
+        self._profiler = value
+
     def start(self) -> None:
-        if self._screen is None:
-            raise RuntimeError("a valid Screen object must be set to .screen before the game can be started")
+        self._validate_screen()
 
         self._clock.tick()  # Initial call to reset any accrued time between initialisation and running this method
 
@@ -111,16 +170,17 @@ class Game:
                 # Run only 1 tick per loop since there's no set tick rate
                 self._tick(self._ms_since_tick)
                 self._ms_since_tick = 0
+                ticks = 1
             else:
-                # Run as many ticks as needed to catch up
-                while self._ms_since_tick >= current_tick_delay_ms:
-                    self._tick(current_tick_delay_ms)
-                    self._ms_since_tick -= current_tick_delay_ms
+                # Run as many ticks as needed to catch up, within the limits set in the game's config
+                ticks = self._catch_up(current_tick_delay_ms)
 
             # Run 1 frame, passing in the entire elapsed ms (only 1 frame is ever needed to catch up)
             self._frame(self._ms_since_tick, self._ms_since_frame)
             self._ms_since_frame = 0
 
+            self._record_catch_up_ticks(ticks)
+
             # Add elapsed time
 
             if (current_frame_delay_ms == 0) or (current_tick_delay_ms == 0):
@@ -128,25 +188,168 @@ class Game:
             else:
                 ms_till_tick = current_tick_delay_ms - self._ms_since_tick
                 ms_till_frame = current_frame_delay_ms - self._ms_since_frame
+                ms_till_next = min(ms_till_tick, ms_till_frame)
 
-                elapsed = self._clock.tick(1000/min(ms_till_tick, ms_till_frame))
+                # A carried-over backlog of ticks (see CatchUpPolicy.SLOW) means the next tick is already due
+                elapsed = self._clock.tick() if ms_till_next <= 0 else self._clock.tick(1000/ms_till_next)
 
             self._ms_since_tick += elapsed
             self._ms_since_frame += elapsed
 
+    def run_ticks(self, ticks: int, ms_per_tick: Optional[float] = None, do_render: bool = False) -> None:
+        """
+        Runs the provided number of ticks immediately, as fast as possible rather than in real time.
+        Each tick is passed `ms_per_tick` as its elapsed time, which defaults to the delay dictated by .tick_rate
+        (and so must be provided if the tick rate is unlimited).
+
+        If `do_render` is False, frames are not run at all - nothing is drawn to the window and the display
+        is not updated. Otherwise, a single frame is run after each tick
+        """
+
+        self._validate_screen()
+        ms_per_tick = self._get_fixed_tick_delay_ms(ms_per_tick)
+
+        for tick_index in range(ticks):
+            self._tick(ms_per_tick)
+
+            if do_render:
+                self._frame(0, ms_per_tick)
+
+        self._record_catch_up_ticks(ticks)
+
+    def run_for(self, ms: float, ms_per_tick: Optional[float] = None, do_render: bool = False) -> int:
+        """
+        Runs as many ticks as fit into the provided amount of game time, as fast as possible rather than in real time.
+        Any leftover time which does not amount to a full tick is carried over to the next call.
+        Returns the number of ticks that were run.
+
+        `ms_per_tick` and `do_render` behave as they do in .run_ticks()
+        """
+
+        self._validate_screen()
+        ms_per_tick = self._get_fixed_tick_delay_ms(ms_per_tick)
+
+        ticks = 0
+        self._ms_since_tick += ms
+        while self._ms_since_tick >= ms_per_tick:
+            self._tick(ms_per_tick)
+            self._ms_since_tick -= ms_per_tick
+            ticks += 1
+
+            if do_render:
+                self._frame(self._ms_since_tick, ms_per_tick)
+
+        self._record_catch_up_ticks(ticks)
+
+        return ticks
+
+    def _validate_screen(self) -> None:
+        if self._screen is None:
+            raise RuntimeError("a valid Screen object must be set to .screen before the game can be started")
+
+    def _get_fixed_tick_delay_ms(self, ms_per_tick: Optional[float]) -> float:
+        if ms_per_tick is None:
+            ms_per_tick = self._tick_delay_ms
+
+        if ms_per_tick <= 0:
+            raise ValueError(
+                "a positive `ms_per_tick` value must be provided when stepping the game while .tick_rate is unlimited"
+            )
+
+        return ms_per_tick
+
+    def _catch_up(self, tick_delay_ms: float) -> int:
+        """
+        Runs ticks until the elapsed time has been caught up with, or until a limit set in the game's config
+        has been reached. At least one tick is always run if one is due.
+        Returns the number of ticks that were run
+        """
+
+        max_ticks = self._config.MAX_CATCH_UP_TICKS
+        budget_ms = self._config.CATCH_UP_BUDGET_MS
+
+        start_time = perf_counter()
+
+        ticks = 0
+        while self._ms_since_tick >= tick_delay_ms:
+            if max_ticks and (ticks >= max_ticks):
+                self._limit_catch_up(GameEventType.CATCH_UP_TICKS_LIMITED, ticks, tick_delay_ms)
+                break
+            if budget_ms and ticks and (((perf_counter() - start_time) * 1000) >= budget_ms):
+                self._limit_catch_up(GameEventType.CATCH_UP_BUDGET_EXCEEDED, ticks, tick_delay_ms)
+                break
+
+            self._tick(tick_delay_ms)
+            self._ms_since_tick -= tick_delay_ms
+            ticks += 1
+
+        return ticks
+
+    def _limit_catch_up(self, event_type: GameEventType, ticks: int, tick_delay_ms: float) -> None:
+        """
+        Applies the catch-up policy set in the game's config to the remaining backlog of ticks
+        """
+
+        policy = self._config.CATCH_UP_POLICY
+
+        with self._game_event_handler(event_type, ticks=ticks, backlog_ms=self._ms_since_tick, policy=policy):
+            if policy == CatchUpPolicy.DROP:
+                self._ms_since_tick %= tick_delay_ms
+            elif policy == CatchUpPolicy.SLOW:
+                self._ms_since_tick = min(self._ms_since_tick, ticks * tick_delay_ms)
+            else:
+                raise ValueError(f"unrecognised catch-up policy: {policy}")
+
+    def _measure(self, metric: ProfilerMetric):
+        """
+        Returns a context manager which records the time taken inside it to the current profiler, if there is one
+        """
+
+        if self._profiler is None:
+            return nullcontext()
+
+        return self._profiler.measure(metric)
+
+    def _record_catch_up_ticks(self, ticks: int) -> None:
+        if self._profiler is None:
+            return
+
+        self._profiler.record(ProfilerMetric.CATCH_UP_TICKS, ticks)
+        self._emit_profiler_snapshot()
+
+    def _emit_profiler_snapshot(self) -> None:
+        """
+        Emits a snapshot of the current profiler's data if one is due.
+        Invoked after each tick and after each loop, so that snapshots are emitted however the game is being stepped
+        """
+
+        if (self._profiler is not None) and self._profiler.is_snapshot_due:
+            self._game_event_handler.on_event(GameEventType.PROFILER_SNAPSHOT, snapshot=self._profiler.snapshot())
+
     def _tick(self, ms_since_last_tick: int) -> None:
-        input_events = pygame.event.get()
+        with self._measure(ProfilerMetric.INPUT):
+            input_events = pygame.event.get()
+
+        # Frames preloaded in the background are added to the cache here, so that they are only ever added between ticks
+        self._animation_cache.process_preloaded_frames()
 
         with self.game_event_handler(GameEventType.TICK, ms_since_last_tick=ms_since_last_tick):
-            self._screen.tick(ms_since_last_tick, input_events)
+            self._tick_number += 1
+
+            with self._measure(ProfilerMetric.TICK):
+                self._screen.update(self._tick_number, ms_since_last_tick, input_events)
+
+        self._emit_profiler_snapshot()
 
     def _frame(self, ms_since_last_tick: int, ms_since_last_frame: int) -> None:
         with self._game_event_handler(
                 GameEventType.FRAME,
                 ms_since_last_tick=ms_since_last_tick, ms_since_last_frame=ms_since_last_frame
         ):
-            ##### TODO: .frame and .tick methods are not yet implemented anywhere else
-            self._screen.frame(ms_since_last_tick, ms_since_last_frame)
+            with self._measure(ProfilerMetric.SCREEN_FRAME):
+                self._screen.frame(ms_since_last_tick, ms_since_last_frame)
 
-            updated_rects = self._screen.render(self._window)
-            pygame.display.update(updated_rects)
+            with self._measure(ProfilerMetric.SCREEN_RENDER):
+                updated_rects = self._screen.render(self._window)
+            with self._measure(ProfilerMetric.DISPLAY_UPDATE):
+                pygame.display.update(updated_rects)
@@ -1,2 +1,7 @@
 from .hitbox import Hitbox
 from .recurfacehitbox import RecurfaceHitbox
+from .maskhitbox import MaskHitbox
+from .recthitbox import RectHitbox
+from .circlehitbox import CircleHitbox
+from .polygonhitbox import PolygonHitbox
+from .collisionregistry import CollisionRegistry
@@ -0,0 +1,106 @@
+from pygame import Rect
+
+from typing import Iterable, Optional, Tuple
+
+from .hitbox import Hitbox
+from .recurfacehitbox import RecurfaceHitbox
+from .recthitbox import RectHitbox
+from .methods import Geometry
+
+
+class CircleHitbox(Hitbox):
+    """
+    Circular hitbox, which is positioned relative to the parent Renderable object's render position
+    """
+
+    def __init__(
+            self, parent: "Renderable.with_extensions(Hitboxed)", radius: float,
+            centre: Optional[Tuple[float, float]] = None, tags: Iterable[str] = (),
+            is_static: bool = False, is_continuous: bool = False
+    ):
+        """
+        `centre` should be the offset of the circle's centre from the parent's render position.
+        If it is not provided, the circle will be centred on the parent's surface
+        """
+
+        super().__init__(parent, tags=tags, is_static=is_static, is_continuous=is_continuous)
+
+        self._radius = radius
+        self._centre = None if centre is None else tuple(centre)
+        self._absolute_centre: Optional[Tuple[float, float]] = None
+
+    @property
+    def radius(self) -> float:
+        return self._radius
+
+    @property
+    def absolute_centre(self) -> Optional[Tuple[float, float]]:
+        """
+        Returns the position of this hitbox's centre, relative to the game window
+        """
+
+        if self.absolute_rect is None:  # Also regenerates the absolute centre if it is outdated
+            return None
+
+        return self._absolute_centre
+
+    def get_ray_distance(self, origin: Tuple[float, float], direction: Tuple[float, float]) -> Optional[float]:
+        absolute_centre = self.absolute_centre
+        if absolute_centre is None:
+            return None
+
+        return Geometry.get_ray_circle_distance(origin, direction, absolute_centre, self._radius)
+
+    @staticmethod
+    def _is_collision_circlehitbox(a: "CircleHitbox", b: "CircleHitbox") -> bool:
+        a_centre, b_centre = a.absolute_centre, b.absolute_centre
+
+        distance_squared = ((a_centre[0] - b_centre[0]) ** 2) + ((a_centre[1] - b_centre[1]) ** 2)
+        return distance_squared < ((a.radius + b.radius) ** 2)
+
+    @staticmethod
+    def _is_collision_recthitbox(a: "CircleHitbox", b: RectHitbox) -> bool:
+        return Geometry.is_rect_circle_collision(*b.absolute_bounds, a.absolute_centre, a.radius)
+
+    @staticmethod
+    def _is_collision_recurfacehitbox(a: "CircleHitbox", b: RecurfaceHitbox) -> bool:
+        a_centre = a.absolute_centre
+        b_rect = b.absolute_rect
+
+        if b.is_inverted:
+            return (
+                ((a_centre[0] - a.radius) < b_rect.left) or ((a_centre[0] + a.radius) > b_rect.right) or
+                ((a_centre[1] - a.radius) < b_rect.top) or ((a_centre[1] + a.radius) > b_rect.bottom)
+            )
+        else:
+            return Geometry.is_rect_circle_collision(
+                b_rect.left, b_rect.top, b_rect.right, b_rect.bottom, a_centre, a.radius
+            )
+
+    def _generate_absolute_rect(self) -> Optional[Rect]:
+        parent = self.parent_renderable
+
+        absolute_position = parent.absolute_render_position
+        if absolute_position is None:
+            self._absolute_centre = None
+            return None
+
+        if self._centre is not None:
+            centre = self._centre
+        elif parent.surface is not None:
+            centre = (parent.surface.get_width() / 2, parent.surface.get_height() / 2)
+        else:
+            centre = (0, 0)
+
+        centre_x, centre_y = absolute_position[0] + centre[0], absolute_position[1] + centre[1]
+        self._absolute_centre = (centre_x, centre_y)
+
+        return Geometry.get_bounding_rect(
+            centre_x - self._radius, centre_y - self._radius,
+            centre_x + self._radius, centre_y + self._radius
+        )
+
+
+Hitbox.collision_registry.register(CircleHitbox, CircleHitbox, CircleHitbox._is_collision_circlehitbox)
+Hitbox.collision_registry.register(CircleHitbox, RectHitbox, CircleHitbox._is_collision_recthitbox)
+Hitbox.collision_registry.register(CircleHitbox, RecurfaceHitbox, CircleHitbox._is_collision_recurfacehitbox)
@@ -0,0 +1,54 @@
+from typing import Dict, Tuple, Type, Callable
+
+
+class CollisionRegistry:
+    """
+    Stores the collision checker functions used to check for collisions between each pair of hitbox classes.
+
+    Checkers are resolved by the classes of the two hitboxes involved. The first time a pair of classes is resolved,
+    the closest registered pair of base classes is located (so that subclasses inherit their bases' checkers)
+    and the result is cached, making any later lookups for that pair a single dictionary access.
+    Resolved checkers always accept the two hitboxes in the same order as the classes they were resolved with
+    """
+
+    def __init__(self):
+        self._checkers: Dict[Tuple[type, type], Callable] = {}
+        self._resolved_checkers: Dict[Tuple[type, type], Callable] = {}
+
+    def register(self, cls_a: Type["Hitbox"], cls_b: Type["Hitbox"], checker: Callable[["Hitbox", "Hitbox"], bool]) -> None:
+        """
+        Stores the provided checker function, which should receive an instance of `cls_a` followed by an instance of
+        `cls_b` and return a bool indicating whether they are colliding.
+        A reversed version of the checker is stored automatically, so that each checker only needs registering once
+        """
+
+        self._checkers[(cls_a, cls_b)] = checker
+
+        if cls_a is not cls_b:
+            self._checkers[(cls_b, cls_a)] = lambda b, a: checker(a, b)
+
+        self._resolved_checkers.clear()  # Any previously resolved checkers may now be superseded
+
+    def resolve(self, cls_a: Type["Hitbox"], cls_b: Type["Hitbox"]) -> Callable[["Hitbox", "Hitbox"], bool]:
+        """
+        Returns a checker function for instances of the provided classes, which should be passed an instance of
+        `cls_a` followed by an instance of `cls_b`
+        """
+
+        try:
+            return self._resolved_checkers[(cls_a, cls_b)]
+        except KeyError:
+            pass
+
+        for base_a in cls_a.__mro__:
+            for base_b in cls_b.__mro__:
+                checker = self._checkers.get((base_a, base_b))
+
+                if checker is not None:
+                    self._resolved_checkers[(cls_a, cls_b)] = checker
+                    return checker
+
+        raise TypeError(
+            "unable to locate a compatible collision checker for a collision between "
+            f"`{cls_a.__name__}` and `{cls_b.__name__}` instances"
+        )
@@ -1,29 +1,52 @@
-from objectextensions import Decorators
+from pygame import Rect
 
-from typing import Iterable, Dict, Type, Callable
+from typing import Iterable, Optional, Tuple
 from abc import ABC
 from weakref import ref
 
 from ..tagged import Tagged
+from .collisionregistry import CollisionRegistry
+from .methods import Geometry
 
 
 class Hitbox(Tagged, ABC):
-    @Decorators.classproperty
-    def COLLISION_CHECKERS(cls) -> Dict[Type["Hitbox"], Callable[["Hitbox", "Hitbox"], bool]]:
+    collision_registry = CollisionRegistry()
+    """
+    When two hitboxes are being checked for a collision, a compatible collision checker function for their classes
+    must have been registered in this registry (typically in the same module that the hitbox class is defined in)
+    """
+
+    def __init__(
+            self, parent: "Renderable.with_extensions(Hitboxed)", tags: Iterable[str] = (),
+            is_static: bool = False, is_continuous: bool = False
+    ):
         """
-        When two hitboxes are being checked for a collision, at least one of the two Hitbox objects involved
-        should have a compatible collision checker function stored in this property.
-        It should be stored using the other involved hitbox's class as a key
+        `is_static` should only be True if this hitbox will not move after its parent has finished loading
+        (such as a room's walls), allowing the hitbox manager to store it in a structure optimised for static hitboxes.
+
+        `is_continuous` should be True for hitboxes which may move far enough in a single tick to pass through
+        other hitboxes, so that the area they moved through can be checked for collisions as well
+        (see `.get_time_of_impact()`)
         """
 
-        raise NotImplementedError
+        self._is_static = is_static
+        self._is_continuous = is_continuous
 
-    def __init__(self, parent: "Renderable.with_extensions(Hitboxed)", tags: Iterable[str] = ()):
         # Weakref so that it does not prevent parent object being garbage collected
         self._parent_renderable = ref(parent)  # Hoisted so that it is available when `._is_valid_tag()` is called
 
+        # Cached, and only regenerated after `.flag_bounds_changed()` has been invoked
+        self._absolute_rect: Optional[Rect] = None
+        self._is_absolute_rect_outdated = True
+        # Stored by the hitbox manager at the start of each tick, for continuous hitboxes only
+        self._previous_absolute_rect: Optional[Rect] = None
+
         super().__init__(tags=tags)
 
+        tag_index = parent.game.hitbox_tag_index
+        self._tag_mask = tag_index.get_mask(self.tags)
+        self._collision_mask = tag_index.get_collision_mask(self._tag_mask)
+
     @property
     def hitbox_manager(self) -> "HitboxManager":
         """
@@ -36,6 +59,84 @@ class Hitbox(Tagged, ABC):
     def parent_renderable(self) -> "Renderable.with_extensions(Hitboxed)":
         return self._parent_renderable()
 
+    @property
+    def is_static(self) -> bool:
+        return self._is_static
+
+    @property
+    def is_continuous(self) -> bool:
+        return self._is_continuous
+
+    @property
+    def tag_mask(self) -> int:
+        """
+        This hitbox's tags, represented as a bitmask by the game's HitboxTagIndex
+        """
+
+        return self._tag_mask
+
+    @property
+    def collision_mask(self) -> int:
+        """
+        A bitmask of every tag that this hitbox is able to collide with, according to
+        Config.HITBOX_TAG_COLLISION_MATRIX
+        """
+
+        return self._collision_mask
+
+    @property
+    def absolute_rect(self) -> Optional[Rect]:
+        """
+        Returns the smallest rect containing this hitbox, positioned relative to the game window,
+        or None if this hitbox does not currently occupy any area.
+
+        This rect is cached until the parent Renderable object (or an object above it in the hierarchy) moves
+        or has its surface replaced, and so should not be modified in place
+        """
+
+        if self._is_absolute_rect_outdated:
+            self._absolute_rect = self._generate_absolute_rect()
+            self._is_absolute_rect_outdated = False
+
+        return self._absolute_rect
+
+    @property
+    def previous_absolute_rect(self) -> Optional[Rect]:
+        """
+        Returns this hitbox's `.absolute_rect` as of the start of the current tick.
+        Only tracked for continuous hitboxes; any others are treated as if they have not moved during this tick
+        """
+
+        if self._previous_absolute_rect is None:
+            return self.absolute_rect
+
+        return self._previous_absolute_rect
+
+    @property
+    def swept_rect(self) -> Optional[Rect]:
+        """
+        Returns the smallest rect containing both this hitbox's `.previous_absolute_rect` and its `.absolute_rect`,
+        covering the entire area it has moved through during this tick
+        """
+
+        absolute_rect = self.absolute_rect
+        previous_absolute_rect = self.previous_absolute_rect
+
+        if (absolute_rect is None) or (previous_absolute_rect is None) or (previous_absolute_rect is absolute_rect):
+            return absolute_rect
+
+        return absolute_rect.union(previous_absolute_rect)
+
+    @property
+    def is_bounded(self) -> bool:
+        """
+        Can optionally be overridden.
+        Should only return False if this hitbox is able to collide with hitboxes which are outside of its
+        `.absolute_rect`, as such hitboxes cannot be narrowed down by area when querying for nearby hitboxes
+        """
+
+        return True
+
     def is_collision(self, other: "Hitbox", check_by_parent: bool = True) -> bool:
         """
         Checks for a collision between this hitbox and the provided other hitbox.
@@ -53,19 +154,116 @@ class Hitbox(Tagged, ABC):
         if collision_key in self.hitbox_manager.checked_collisions:
             return False  # This collision check has already been carried out previously this tick
 
-        if type(other) in self.COLLISION_CHECKERS:
-            self.hitbox_manager.checked_collisions.add(collision_key)
+        result = self.test_collision(other)
+        self.hitbox_manager.checked_collisions.add(collision_key)
 
-            return self.COLLISION_CHECKERS[type(other)](self, other)
-        elif type(self) in other.COLLISION_CHECKERS:
-            self.hitbox_manager.checked_collisions.add(collision_key)
+        return result
 
-            return other.COLLISION_CHECKERS[type(self)](self, other)
-        else:
-            raise TypeError(
-                "unable to locate a compatible collision checker for a collision between "
-                f"`{type(self).__name__}` and `{type(other).__name__}` instances"
-            )
+    def test_collision(self, other: "Hitbox") -> bool:
+        """
+        Checks for a collision between this hitbox and the provided other hitbox,
+        without consulting or adding to the hitbox manager's record of collisions already checked this tick.
+
+        Intended for use with sources of hitbox pairs which already guarantee that each pair is only checked once,
+        such as `HitboxManager.candidate_pairs()`.
+
+        If either hitbox is continuous, hitboxes which do not collide as of the end of the tick are also checked for
+        a collision partway through it via `.get_time_of_impact()`, regardless of which checker is registered for them
+        """
+
+        if Hitbox.collision_registry.resolve(type(self), type(other))(self, other):
+            return True
+
+        if self._is_continuous or other.is_continuous:
+            return self.get_time_of_impact(other) is not None
+
+        return False
+
+    def get_time_of_impact(self, other: "Hitbox") -> Optional[float]:
+        """
+        Can optionally be overridden.
+        Should return the earliest point during the current tick at which this hitbox collided with the provided other
+        hitbox, as a fraction of the tick between 0 (its start) and 1 (its end), or None if they did not collide.
+
+        By default, both hitboxes are treated as their absolute rects moving in straight lines from their
+        `.previous_absolute_rect` to their `.absolute_rect`, so that collisions with hitboxes that were passed through
+        entirely during the tick are still detected (a swept AABB test).
+        Unbounded hitboxes are deferred to, as only they can define what colliding with them involves
+        """
+
+        if not other.is_bounded:
+            return other.get_time_of_impact(self)
+
+        if (self.absolute_rect is None) or (other.absolute_rect is None):
+            return None
+
+        return Geometry.get_swept_rect_time_of_impact(
+            self.previous_absolute_rect, self.absolute_rect, other.previous_absolute_rect, other.absolute_rect
+        )
+
+    def store_previous_absolute_rect(self) -> None:
+        """
+        Stores this hitbox's current `.absolute_rect` as its `.previous_absolute_rect`.
+        Invoked automatically by the hitbox manager at the start of each tick, for continuous hitboxes only
+        """
+
+        self._previous_absolute_rect = self.absolute_rect
+
+    def get_ray_distance(self, origin: Tuple[float, float], direction: Tuple[float, float]) -> Optional[float]:
+        """
+        Can optionally be overridden.
+        Should return the distance along the provided ray (whose direction is normalised) at which it first hits
+        this hitbox, 0 if the ray starts inside this hitbox, or None if the ray never hits this hitbox.
+        By default, the ray is tested against this hitbox's `.absolute_rect`
+        """
+
+        absolute_rect = self.absolute_rect
+        if absolute_rect is None:
+            return None
+
+        return Geometry.get_ray_rect_distance(
+            origin, direction, absolute_rect.left, absolute_rect.top, absolute_rect.right, absolute_rect.bottom
+        )
+
+    def flag_bounds_changed(self) -> None:
+        """
+        Discards the cached `.absolute_rect` for this hitbox, and notifies the current hitbox manager
+        that it may have changed.
+        Invoked automatically when the parent Renderable object's position or surface changes
+        """
+
+        self._is_absolute_rect_outdated = True
+
+        parent = self.parent_renderable
+        if (parent is None) or (parent.game.screen is None):
+            return
+
+        parent.game.screen.hitbox_manager.flag_bounds_changed(self)
+
+    def _generate_absolute_rect(self) -> Optional[Rect]:
+        """
+        Must be overridden.
+        Should return a new rect for `.absolute_rect`, based on the current state of the parent Renderable object
+        """
+
+        raise NotImplementedError
+
+    def _get_parent_surface_rect(self) -> Optional[Rect]:
+        """
+        Returns a rect covering the parent Renderable object's surface, at its absolute render position.
+        Positions are rounded in the same way as when drawing, so that the rect matches what is displayed
+        """
+
+        parent = self.parent_renderable
+
+        absolute_position = parent.absolute_render_position
+        if (absolute_position is None) or (parent.surface is None):
+            return None
+
+        return Rect(
+            round(absolute_position[0]), round(absolute_position[1]),
+            parent.surface.get_width(), parent.surface.get_height()
+        )
 
     def _is_valid_tag(self, tag: str) -> bool:
         return tag in self.parent_renderable.game.config.HITBOX_TAGS
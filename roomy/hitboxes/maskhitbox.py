@@ -0,0 +1,96 @@
+from pygame import Rect, Surface, mask
+from pygame.mask import Mask
+
+from typing import Iterable, Optional
+
+from .hitbox import Hitbox
+from .recurfacehitbox import RecurfaceHitbox
+
+
+class MaskHitbox(Hitbox):
+    """
+    Pixel-perfect hitbox, which covers only the non-transparent pixels of the parent Renderable object's surface.
+
+    A mask is only generated when the parent's surface is replaced. If the parent is an Animated object whose
+    current animation frame is that surface, the animation's mask is used instead - for file-based animations,
+    this will be retrieved from the game's AnimationCache so that each frame's mask is only ever generated once
+    """
+
+    def __init__(
+            self, parent: "Renderable.with_extensions(Hitboxed)", tags: Iterable[str] = (),
+            is_static: bool = False, is_continuous: bool = False
+    ):
+        super().__init__(parent, tags=tags, is_static=is_static, is_continuous=is_continuous)
+
+        self._mask: Optional[Mask] = None
+        self._mask_surface: Optional[Surface] = None  # The surface that the current mask was generated from
+
+    @property
+    def mask(self) -> Optional[Mask]:
+        surface = self.parent_renderable.surface
+
+        if surface is None:
+            return None
+
+        if surface is not self._mask_surface:
+            self._mask = self._generate_mask(surface)
+            self._mask_surface = surface
+
+        return self._mask
+
+    @staticmethod
+    def _is_collision_maskhitbox(a: "MaskHitbox", b: "MaskHitbox") -> bool:
+        a_rect = a.absolute_rect
+        b_rect = b.absolute_rect
+
+        if not a_rect.colliderect(b_rect):
+            return False
+
+        return a.mask.overlap(b.mask, (b_rect.x - a_rect.x, b_rect.y - a_rect.y)) is not None
+
+    @staticmethod
+    def _is_collision_recurfacehitbox(a: "MaskHitbox", b: RecurfaceHitbox) -> bool:
+        a_rect = a.absolute_rect
+        b_rect = b.absolute_rect
+
+        if b.is_inverted:
+            if b_rect.contains(a_rect):
+                return False
+
+            # Colliding if any of the mask's set pixels are outside of the inverted hitbox
+            return MaskHitbox._get_overlap_area(a.mask, a_rect, b_rect) < a.mask.count()
+        else:
+            if not a_rect.colliderect(b_rect):
+                return False
+
+            return MaskHitbox._get_overlap_area(a.mask, a_rect, b_rect) > 0
+
+    @staticmethod
+    def _get_overlap_area(hitbox_mask: Mask, mask_rect: Rect, rect: Rect) -> int:
+        """
+        Returns the number of set pixels in the provided mask which are inside the provided rect
+        """
+
+        overlap_rect = mask_rect.clip(rect)
+        if not overlap_rect:
+            return 0
+
+        return hitbox_mask.overlap_area(
+            Mask(overlap_rect.size, fill=True),
+            (overlap_rect.x - mask_rect.x, overlap_rect.y - mask_rect.y)
+        )
+
+    def _generate_mask(self, surface: Surface) -> Mask:
+        animation = getattr(self.parent_renderable, "animation", None)
+
+        if (animation is not None) and (animation.frame is surface):
+            return animation.mask
+
+        return mask.from_surface(surface)
+
+    def _generate_absolute_rect(self) -> Optional[Rect]:
+        return self._get_parent_surface_rect()
+
+
+Hitbox.collision_registry.register(MaskHitbox, MaskHitbox, MaskHitbox._is_collision_maskhitbox)
+Hitbox.collision_registry.register(MaskHitbox, RecurfaceHitbox, MaskHitbox._is_collision_recurfacehitbox)
@@ -0,0 +1,248 @@
+from pygame import Rect
+
+from typing import Sequence, Tuple, List, Optional
+from math import floor, ceil, sqrt, inf
+
+
+class Geometry:
+    """
+    Helper methods for the collision checkers and ray tests of shape-based hitboxes.
+    Polygons are represented as sequences of (x, y) points, and are assumed to be convex
+    """
+
+    @staticmethod
+    def get_bounding_rect(left: float, top: float, right: float, bottom: float) -> Rect:
+        """
+        Returns the smallest integer rect which fully contains the provided float bounds
+        """
+
+        left, top = floor(left), floor(top)
+
+        return Rect(left, top, ceil(right) - left, ceil(bottom) - top)
+
+    @staticmethod
+    def get_rect_points(left: float, top: float, right: float, bottom: float) -> Tuple[Tuple[float, float], ...]:
+        return (left, top), (right, top), (right, bottom), (left, bottom)
+
+    @staticmethod
+    def get_axes(points: Sequence[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        """
+        Returns the (unnormalised) normal of each edge of the provided polygon
+        """
+
+        result = []
+        for point_index, point in enumerate(points):
+            next_point = points[(point_index + 1) % len(points)]
+
+            result.append((point[1] - next_point[1], next_point[0] - point[0]))
+
+        return result
+
+    @staticmethod
+    def project(points: Sequence[Tuple[float, float]], axis: Tuple[float, float]) -> Tuple[float, float]:
+        projections = [(point[0] * axis[0]) + (point[1] * axis[1]) for point in points]
+
+        return min(projections), max(projections)
+
+    @staticmethod
+    def is_polygon_collision(a_points: Sequence[Tuple[float, float]], b_points: Sequence[Tuple[float, float]]) -> bool:
+        """
+        Uses the separating axis theorem; polygons which are only touching are not considered to be colliding
+        """
+
+        for axis in Geometry.get_axes(a_points) + Geometry.get_axes(b_points):
+            a_min, a_max = Geometry.project(a_points, axis)
+            b_min, b_max = Geometry.project(b_points, axis)
+
+            if (a_max <= b_min) or (b_max <= a_min):
+                return False
+
+        return True
+
+    @staticmethod
+    def is_polygon_circle_collision(
+            points: Sequence[Tuple[float, float]], centre: Tuple[float, float], radius: float
+    ) -> bool:
+        """
+        Uses the separating axis theorem, with the axis from the polygon's closest point to the circle's centre
+        checked in addition to the polygon's own edge normals
+        """
+
+        closest_point = min(points, key=lambda point: ((point[0] - centre[0]) ** 2) + ((point[1] - centre[1]) ** 2))
+        axes = Geometry.get_axes(points) + [(centre[0] - closest_point[0], centre[1] - closest_point[1])]
+
+        for axis in axes:
+            axis_length = ((axis[0] ** 2) + (axis[1] ** 2)) ** 0.5
+            if axis_length == 0:
+                continue
+
+            polygon_min, polygon_max = Geometry.project(points, axis)
+            centre_projection = (centre[0] * axis[0]) + (centre[1] * axis[1])
+            circle_min, circle_max = centre_projection - (radius * axis_length), centre_projection + (radius * axis_length)
+
+            if (polygon_max <= circle_min) or (circle_max <= polygon_min):
+                return False
+
+        return True
+
+    @staticmethod
+    def is_rect_circle_collision(
+            left: float, top: float, right: float, bottom: float, centre: Tuple[float, float], radius: float
+    ) -> bool:
+        closest_x = min(max(centre[0], left), right)
+        closest_y = min(max(centre[1], top), bottom)
+
+        return (((centre[0] - closest_x) ** 2) + ((centre[1] - closest_y) ** 2)) < (radius ** 2)
+
+    @staticmethod
+    def get_ray_rect_distance(
+            origin: Tuple[float, float], direction: Tuple[float, float],
+            left: float, top: float, right: float, bottom: float, is_inverted: bool = False
+    ) -> Optional[float]:
+        """
+        Returns the distance along the provided ray (whose direction should be normalised) at which it first
+        enters the provided rect, 0 if it starts inside the rect, or None if it never enters the rect.
+        Rays which only touch the edges of the rect are not considered to enter it.
+
+        If `is_inverted` is True, the area outside of the rect is treated as solid instead,
+        and so rays starting inside the rect hit it where they exit it
+        """
+
+        enter_distance, exit_distance = -inf, inf
+
+        for origin_value, direction_value, min_value, max_value in (
+                (origin[0], direction[0], left, right),
+                (origin[1], direction[1], top, bottom)
+        ):
+            if direction_value == 0:
+                if is_inverted:
+                    is_outside_slab = (origin_value < min_value) or (origin_value > max_value)
+                else:
+                    is_outside_slab = (origin_value <= min_value) or (origin_value >= max_value)
+
+                if is_outside_slab:
+                    enter_distance, exit_distance = inf, -inf  # Parallel to, and outside of, this axis' slab
+                continue
+
+            min_distance = (min_value - origin_value) / direction_value
+            max_distance = (max_value - origin_value) / direction_value
+            if min_distance > max_distance:
+                min_distance, max_distance = max_distance, min_distance
+
+            enter_distance = max(enter_distance, min_distance)
+            exit_distance = min(exit_distance, max_distance)
+
+        if is_inverted:
+            # Only the area outside of the rect is solid, and so points on its edges are not inside the solid area
+            if (left <= origin[0] <= right) and (top <= origin[1] <= bottom):
+                return max(exit_distance, 0)
+
+            return 0
+
+        if (left < origin[0] < right) and (top < origin[1] < bottom):
+            return 0
+        if (enter_distance >= exit_distance) or (exit_distance <= 0):
+            return None
+
+        return max(enter_distance, 0)
+
+    @staticmethod
+    def get_ray_circle_distance(
+            origin: Tuple[float, float], direction: Tuple[float, float], centre: Tuple[float, float], radius: float
+    ) -> Optional[float]:
+        """
+        Returns the distance along the provided ray (whose direction should be normalised) at which it first
+        enters the provided circle, 0 if it starts inside the circle, or None if it never enters the circle
+        """
+
+        offset_x, offset_y = origin[0] - centre[0], origin[1] - centre[1]
+
+        offset_dot_direction = (offset_x * direction[0]) + (offset_y * direction[1])
+        offset_length_excess = (offset_x ** 2) + (offset_y ** 2) - (radius ** 2)
+
+        if offset_length_excess < 0:
+            return 0
+        if offset_dot_direction >= 0:
+            return None  # Starts outside the circle and points away from it
+
+        discriminant = (offset_dot_direction ** 2) - offset_length_excess
+        if discriminant <= 0:
+            return None
+
+        return -offset_dot_direction - sqrt(discriminant)
+
+    @staticmethod
+    def get_ray_polygon_distance(
+            origin: Tuple[float, float], direction: Tuple[float, float], points: Sequence[Tuple[float, float]]
+    ) -> Optional[float]:
+        """
+        Returns the distance along the provided ray (whose direction should be normalised) at which it first
+        enters the provided polygon, 0 if it starts inside the polygon, or None if it never enters the polygon.
+        Clips the ray against each edge in turn, which relies on the polygon being convex
+        """
+
+        centroid_x = sum(point[0] for point in points) / len(points)
+        centroid_y = sum(point[1] for point in points) / len(points)
+
+        enter_distance, exit_distance = 0, inf
+
+        for point, axis in zip(points, Geometry.get_axes(points)):
+            # Each axis is made to point outwards, so that the inside of the edge is where projections are smaller
+            if (axis[0] * (centroid_x - point[0])) + (axis[1] * (centroid_y - point[1])) > 0:
+                axis = (-axis[0], -axis[1])
+
+            origin_projection = (axis[0] * (point[0] - origin[0])) + (axis[1] * (point[1] - origin[1]))
+            direction_projection = (axis[0] * direction[0]) + (axis[1] * direction[1])
+
+            if direction_projection == 0:
+                if origin_projection <= 0:
+                    return None  # Parallel to, and outside of, this edge
+            elif direction_projection < 0:
+                enter_distance = max(enter_distance, origin_projection / direction_projection)
+            else:
+                exit_distance = min(exit_distance, origin_projection / direction_projection)
+
+            if enter_distance >= exit_distance:
+                return None
+
+        return enter_distance
+
+    @staticmethod
+    def get_swept_rect_time_of_impact(
+            a_start: Rect, a_end: Rect, b_start: Rect, b_end: Rect, is_b_inverted: bool = False
+    ) -> Optional[float]:
+        """
+        Returns the earliest point in time at which rect a collides with rect b as both move in straight lines
+        from their start rects to their end rects, as a fraction of the movement between 0 and 1.
+        Returns None if the rects do not collide during the movement.
+
+        The movement is treated as relative to rect b, so that a can be tested as a single point moving through
+        rect b expanded by the size of rect a. Rects are assumed to keep their end sizes throughout the movement.
+
+        If `is_b_inverted` is True, the area outside of rect b is treated as solid instead,
+        and so a collides with it once a is no longer fully contained within it
+        """
+
+        relative_movement = (
+            (a_end.x - a_start.x) - (b_end.x - b_start.x),
+            (a_end.y - a_start.y) - (b_end.y - b_start.y)
+        )
+        start_offset = (a_start.x - b_start.x + b_end.x, a_start.y - b_start.y + b_end.y)
+
+        if is_b_inverted:
+            # The area within which a's top left corner can move while keeping a fully inside b
+            time_of_impact = Geometry.get_ray_rect_distance(
+                start_offset, relative_movement,
+                b_end.left, b_end.top, b_end.right - a_end.width, b_end.bottom - a_end.height,
+                is_inverted=True
+            )
+        else:
+            time_of_impact = Geometry.get_ray_rect_distance(
+                start_offset, relative_movement,
+                b_end.left - a_end.width, b_end.top - a_end.height, b_end.right, b_end.bottom
+            )
+
+        if (time_of_impact is None) or (time_of_impact > 1):
+            return None
+
+        return time_of_impact
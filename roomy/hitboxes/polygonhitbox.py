@@ -0,0 +1,101 @@
+from pygame import Rect
+
+from typing import Iterable, Optional, Tuple, Sequence
+
+from .hitbox import Hitbox
+from .recurfacehitbox import RecurfaceHitbox
+from .recthitbox import RectHitbox
+from .circlehitbox import CircleHitbox
+from .methods import Geometry
+
+
+class PolygonHitbox(Hitbox):
+    """
+    Convex polygonal hitbox, which is positioned relative to the parent Renderable object's render position.
+    Concave polygons are not supported, and should be split into multiple convex hitboxes instead
+    """
+
+    def __init__(
+            self, parent: "Renderable.with_extensions(Hitboxed)", points: Sequence[Tuple[float, float]],
+            tags: Iterable[str] = (), is_static: bool = False, is_continuous: bool = False
+    ):
+        """
+        `points` should be the offsets of the polygon's vertices from the parent's render position, in order
+        """
+
+        if len(points) < 3:
+            raise ValueError(f"a polygon requires at least 3 points (received: {len(points)})")
+
+        super().__init__(parent, tags=tags, is_static=is_static, is_continuous=is_continuous)
+
+        self._points = tuple(tuple(point) for point in points)
+        self._absolute_points: Optional[Tuple[Tuple[float, float], ...]] = None
+
+    @property
+    def points(self) -> Tuple[Tuple[float, float], ...]:
+        return self._points
+
+    @property
+    def absolute_points(self) -> Optional[Tuple[Tuple[float, float], ...]]:
+        """
+        Returns the positions of this hitbox's vertices, relative to the game window
+        """
+
+        if self.absolute_rect is None:  # Also regenerates the absolute points if they are outdated
+            return None
+
+        return self._absolute_points
+
+    def get_ray_distance(self, origin: Tuple[float, float], direction: Tuple[float, float]) -> Optional[float]:
+        absolute_points = self.absolute_points
+        if absolute_points is None:
+            return None
+
+        return Geometry.get_ray_polygon_distance(origin, direction, absolute_points)
+
+    @staticmethod
+    def _is_collision_polygonhitbox(a: "PolygonHitbox", b: "PolygonHitbox") -> bool:
+        return Geometry.is_polygon_collision(a.absolute_points, b.absolute_points)
+
+    @staticmethod
+    def _is_collision_recthitbox(a: "PolygonHitbox", b: RectHitbox) -> bool:
+        return Geometry.is_polygon_collision(a.absolute_points, Geometry.get_rect_points(*b.absolute_bounds))
+
+    @staticmethod
+    def _is_collision_circlehitbox(a: "PolygonHitbox", b: CircleHitbox) -> bool:
+        return Geometry.is_polygon_circle_collision(a.absolute_points, b.absolute_centre, b.radius)
+
+    @staticmethod
+    def _is_collision_recurfacehitbox(a: "PolygonHitbox", b: RecurfaceHitbox) -> bool:
+        b_rect = b.absolute_rect
+
+        if b.is_inverted:
+            # As the polygon is convex, it is only fully inside the rect if all of its vertices are
+            return any(
+                (x < b_rect.left) or (x > b_rect.right) or (y < b_rect.top) or (y > b_rect.bottom)
+                for x, y in a.absolute_points
+            )
+        else:
+            return Geometry.is_polygon_collision(
+                a.absolute_points, Geometry.get_rect_points(b_rect.left, b_rect.top, b_rect.right, b_rect.bottom)
+            )
+
+    def _generate_absolute_rect(self) -> Optional[Rect]:
+        absolute_position = self.parent_renderable.absolute_render_position
+        if absolute_position is None:
+            self._absolute_points = None
+            return None
+
+        self._absolute_points = tuple(
+            (absolute_position[0] + x, absolute_position[1] + y) for x, y in self._points
+        )
+
+        x_values = [point[0] for point in self._absolute_points]
+        y_values = [point[1] for point in self._absolute_points]
+        return Geometry.get_bounding_rect(min(x_values), min(y_values), max(x_values), max(y_values))
+
+
+Hitbox.collision_registry.register(PolygonHitbox, PolygonHitbox, PolygonHitbox._is_collision_polygonhitbox)
+Hitbox.collision_registry.register(PolygonHitbox, RectHitbox, PolygonHitbox._is_collision_recthitbox)
+Hitbox.collision_registry.register(PolygonHitbox, CircleHitbox, PolygonHitbox._is_collision_circlehitbox)
+Hitbox.collision_registry.register(PolygonHitbox, RecurfaceHitbox, PolygonHitbox._is_collision_recurfacehitbox)
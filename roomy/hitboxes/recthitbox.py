@@ -0,0 +1,81 @@
+from pygame import Rect
+
+from typing import Iterable, Optional, Tuple
+
+from .hitbox import Hitbox
+from .recurfacehitbox import RecurfaceHitbox
+from .methods import Geometry
+
+
+class RectHitbox(Hitbox):
+    """
+    Axis-aligned rectangular hitbox, which is positioned relative to the parent Renderable object's render position
+    but is otherwise independent of the parent's surface
+    """
+
+    def __init__(
+            self, parent: "Renderable.with_extensions(Hitboxed)", rect: Tuple[float, float, float, float],
+            tags: Iterable[str] = (), is_static: bool = False, is_continuous: bool = False
+    ):
+        """
+        `rect` should contain the x offset, y offset, width and height of the hitbox, respectively
+        """
+
+        super().__init__(parent, tags=tags, is_static=is_static, is_continuous=is_continuous)
+
+        self._rect = tuple(rect)
+        self._absolute_bounds: Optional[Tuple[float, float, float, float]] = None
+
+    @property
+    def rect(self) -> Tuple[float, float, float, float]:
+        return self._rect
+
+    @property
+    def absolute_bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Returns the left, top, right and bottom edges of this hitbox, positioned relative to the game window
+        """
+
+        if self.absolute_rect is None:  # Also regenerates the absolute bounds if they are outdated
+            return None
+
+        return self._absolute_bounds
+
+    def get_ray_distance(self, origin: Tuple[float, float], direction: Tuple[float, float]) -> Optional[float]:
+        absolute_bounds = self.absolute_bounds
+        if absolute_bounds is None:
+            return None
+
+        return Geometry.get_ray_rect_distance(origin, direction, *absolute_bounds)
+
+    @staticmethod
+    def _is_collision_recthitbox(a: "RectHitbox", b: "RectHitbox") -> bool:
+        a_left, a_top, a_right, a_bottom = a.absolute_bounds
+        b_left, b_top, b_right, b_bottom = b.absolute_bounds
+
+        return (a_left < b_right) and (b_left < a_right) and (a_top < b_bottom) and (b_top < a_bottom)
+
+    @staticmethod
+    def _is_collision_recurfacehitbox(a: "RectHitbox", b: RecurfaceHitbox) -> bool:
+        a_left, a_top, a_right, a_bottom = a.absolute_bounds
+        b_rect = b.absolute_rect
+
+        if b.is_inverted:
+            return (a_left < b_rect.left) or (a_right > b_rect.right) or (a_top < b_rect.top) or (a_bottom > b_rect.bottom)
+        else:
+            return (a_left < b_rect.right) and (b_rect.left < a_right) and (a_top < b_rect.bottom) and (b_rect.top < a_bottom)
+
+    def _generate_absolute_rect(self) -> Optional[Rect]:
+        absolute_position = self.parent_renderable.absolute_render_position
+        if absolute_position is None:
+            self._absolute_bounds = None
+            return None
+
+        left, top = absolute_position[0] + self._rect[0], absolute_position[1] + self._rect[1]
+        self._absolute_bounds = (left, top, left + self._rect[2], top + self._rect[3])
+
+        return Geometry.get_bounding_rect(*self._absolute_bounds)
+
+
+Hitbox.collision_registry.register(RectHitbox, RectHitbox, RectHitbox._is_collision_recthitbox)
+Hitbox.collision_registry.register(RectHitbox, RecurfaceHitbox, RectHitbox._is_collision_recurfacehitbox)
@@ -1,13 +1,17 @@
-from objectextensions import Decorators
+from pygame import Rect
 
-from typing import Dict, Type, Callable, Iterable
+from typing import Iterable, Optional, Tuple
 
 from .hitbox import Hitbox
+from .methods import Geometry
 
 
 class RecurfaceHitbox(Hitbox):
-    def __init__(self, parent: "Renderable.with_extensions(Hitboxed)", tags: Iterable[str] = (), is_inverted: bool = False):
-        super().__init__(parent, tags=tags)
+    def __init__(
+            self, parent: "Renderable.with_extensions(Hitboxed)", tags: Iterable[str] = (), is_inverted: bool = False,
+            is_static: bool = False, is_continuous: bool = False
+    ):
+        super().__init__(parent, tags=tags, is_static=is_static, is_continuous=is_continuous)
 
         self._is_inverted = is_inverted
 
@@ -15,49 +19,65 @@ class RecurfaceHitbox(Hitbox):
     def is_inverted(self) -> bool:
         return self._is_inverted
 
-    @Decorators.classproperty
-    def COLLISION_CHECKERS(cls) -> Dict[Type[Hitbox], Callable[[Hitbox, Hitbox], bool]]:
-        return {
-            cls: cls._is_collision_recurfacehitbox
-        }
+    @property
+    def is_bounded(self) -> bool:
+        """
+        Inverted hitboxes collide with anything that is not fully inside them
+        """
 
-    @staticmethod
-    def _is_collision_recurfacehitbox(a: "RecurfaceHitbox", b: "RecurfaceHitbox") -> bool:
-        a_absolute_position = a.parent_renderable.absolute_render_position
-        b_absolute_position = b.parent_renderable.absolute_render_position
+        return not self._is_inverted
 
-        a_left, a_right = (
-            a_absolute_position[0],
-            a_absolute_position[0] + a.parent_renderable.surface.get_width()
-        )
-        a_top, a_bottom = (
-            a_absolute_position[1],
-            a_absolute_position[1] + a.parent_renderable.surface.get_height()
-        )
+    def get_ray_distance(self, origin: Tuple[float, float], direction: Tuple[float, float]) -> Optional[float]:
+        """
+        Rays starting inside an inverted hitbox hit it where they leave its rect
+        """
 
-        b_left, b_right = (
-            b_absolute_position[0],
-            b_absolute_position[0] + b.parent_renderable.surface.get_width()
+        absolute_rect = self.absolute_rect
+        if absolute_rect is None:
+            return None
+
+        return Geometry.get_ray_rect_distance(
+            origin, direction, absolute_rect.left, absolute_rect.top, absolute_rect.right, absolute_rect.bottom,
+            is_inverted=self._is_inverted
         )
-        b_top, b_bottom = (
-            b_absolute_position[1],
-            b_absolute_position[1] + b.parent_renderable.surface.get_height()
+
+    def get_time_of_impact(self, other: Hitbox) -> Optional[float]:
+        """
+        Hitboxes which are inside an inverted hitbox collide with it at the point they start to leave it
+        """
+
+        if not self._is_inverted:
+            return super().get_time_of_impact(other)
+
+        if isinstance(other, RecurfaceHitbox) and other.is_inverted:
+            return 0
+
+        if (self.absolute_rect is None) or (other.absolute_rect is None):
+            return None
+
+        # The relative movement of the two hitboxes is the same regardless of which one is treated as moving
+        return Geometry.get_swept_rect_time_of_impact(
+            other.previous_absolute_rect, other.absolute_rect, self.previous_absolute_rect, self.absolute_rect,
+            is_b_inverted=True
         )
 
+    @staticmethod
+    def _is_collision_recurfacehitbox(a: "RecurfaceHitbox", b: "RecurfaceHitbox") -> bool:
         if a.is_inverted and b.is_inverted:
             return True
-        elif a.is_inverted and (not b.is_inverted):
-            return (
-                    (b_left < a_left) or (b_right > a_right) or
-                    (b_top < a_top) or (b_bottom > a_bottom)
-            )
+
+        a_rect = a.absolute_rect
+        b_rect = b.absolute_rect
+
+        if a.is_inverted and (not b.is_inverted):
+            return not a_rect.contains(b_rect)
         elif (not a.is_inverted) and b.is_inverted:
-            return (
-                    (a_left < b_left) or (a_right > b_right) or
-                    (a_top < b_top) or (a_bottom > b_bottom)
-            )
+            return not b_rect.contains(a_rect)
         else:
-            return (
-                    (a_left < b_right) and (b_left < a_right) and
-                    (a_top < b_bottom) and (b_top < a_bottom)
-            )
+            return a_rect.colliderect(b_rect)
+
+    def _generate_absolute_rect(self) -> Optional[Rect]:
+        return self._get_parent_surface_rect()
+
+
+Hitbox.collision_registry.register(RecurfaceHitbox, RecurfaceHitbox, RecurfaceHitbox._is_collision_recurfacehitbox)
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Tuple, Optional
 from abc import ABC
 
 from ..extensions import Hitboxed
@@ -12,10 +12,26 @@ class Entity(Renderable.with_extensions(Hitboxed), ABC):
     """
 
     def __init__(self, parent: Renderable, render_position: Tuple[int, int], surface=None, priority=None):
+        # Hoisted so that it is available if this object is added to a physics system while being initialised
+        self._physics_system: Optional["PhysicsSystem"] = None
+
         super().__init__(
             parent.game, parent=parent, surface=surface, render_position=render_position, priority=priority
         )
 
+    @property
+    def physics_system(self) -> Optional["PhysicsSystem"]:
+        """
+        The physics system currently integrating this object's movement, if any.
+        Set automatically by PhysicsSystem as this object is added to and removed from it
+        """
+
+        return self._physics_system
+
+    @physics_system.setter
+    def physics_system(self, value: Optional["PhysicsSystem"]):
+        self._physics_system = value
+
     @property
     def speed(self) -> Tuple[Stat, Stat]:
         """
@@ -42,3 +58,10 @@ class Entity(Renderable.with_extensions(Hitboxed), ABC):
         """
 
         raise NotImplementedError
+
+    def _on_bounds_changed(self) -> None:
+        super()._on_bounds_changed()
+
+        # Keeps the physics system's stored position in sync with moves made by other code
+        if self._physics_system is not None:
+            self._physics_system.flag_moved(self)
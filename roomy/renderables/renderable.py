@@ -3,7 +3,11 @@ from objectextensions import Extendable
 from pygame import Surface
 
 from abc import ABC
-from typing import Optional, Tuple, Any
+from typing import Optional, Tuple, Any, List, Callable, Union, Literal
+from weakref import ref
+from itertools import count
+
+from ..utils import RemoveCallback
 
 
 class Renderable(Extendable, Recurface, ABC):
@@ -15,12 +19,33 @@ class Renderable(Extendable, Recurface, ABC):
       from a static origin
     """
 
+    # Shared between all instances, so that objects with the same update divisor are spread out across ticks
+    _update_phases = count()
+
     def __init__(
             self, game: "Game",
             surface: Optional[Surface] = None, render_position: Optional[Tuple[float, float]] = None,
             parent: Optional["Renderable"] = None, priority: Any = None,
     ):
         Extendable.__init__(self)
+
+        # Flattened sequence of `._update()` methods to call each tick, generated as needed
+        self._update_schedule: Optional[List[Callable]] = None
+
+        self._update_divisor = 1
+        self._ticks_until_update = 1
+        self._divided_elapsed_ms = 0  # Elapsed time accumulated over ticks which were skipped due to the divisor
+
+        self._is_dormant = False
+        self._sleep_token = None  # Replaced each time this object is put to sleep, to invalidate any older wake-ups
+        # The pending wake-up callback registered with the game event handler, and the event key it is registered to
+        self._wake_event_callback: Optional[Tuple[Callable, Any]] = None
+
+        # The size of the surface as of the last bounds change, so that surfaces of the same size can be swapped freely
+        self._surface_size: Optional[Tuple[int, int]] = None
+        # Set while the parent is being changed, as Recurface sets it again partway through when removing the old parent
+        self._is_changing_parent = False
+
         Recurface.__init__(self, surface=surface, position=render_position, parent=parent, priority=priority)
 
         self._game = game
@@ -29,6 +54,136 @@ class Renderable(Extendable, Recurface, ABC):
     def game(self):
         return self._game
 
+    @Recurface.render_position.setter
+    def render_position(self, value: Optional[Tuple[float, float]]):
+        previous_value = self.render_position
+        Recurface.render_position.fset(self, value)
+
+        if self.render_position != previous_value:
+            self._flag_bounds_changed()
+
+    @Recurface.x_render_position.setter
+    def x_render_position(self, value: float):
+        previous_value = self.render_position
+        Recurface.x_render_position.fset(self, value)
+
+        if self.render_position != previous_value:
+            self._flag_bounds_changed()
+
+    @Recurface.y_render_position.setter
+    def y_render_position(self, value: float):
+        previous_value = self.render_position
+        Recurface.y_render_position.fset(self, value)
+
+        if self.render_position != previous_value:
+            self._flag_bounds_changed()
+
+    @Recurface.parent_recurface.setter
+    def parent_recurface(self, value: Optional["Renderable"]):
+        if self._is_changing_parent:
+            Recurface.parent_recurface.fset(self, value)
+            return
+
+        previous_absolute_position = self.absolute_render_position
+
+        self._is_changing_parent = True
+        try:
+            Recurface.parent_recurface.fset(self, value)
+        finally:
+            self._is_changing_parent = False
+
+        if self.absolute_render_position != previous_absolute_position:
+            self._flag_bounds_changed()
+
+    @property
+    def update_divisor(self) -> int:
+        """
+        This object, and everything below it in the hierarchy, will only be updated once every this many ticks.
+        Each of these updates will be passed the total `elapsed_ms` since this object's previous update, but only
+        the current tick's input events.
+
+        Objects with the same divisor are offset from each other, so that their updates are spread evenly across ticks
+        rather than all landing on the same one. Note that the divisor only applies when this object is updated by
+        an object above it in the hierarchy
+        """
+
+        return self._update_divisor
+
+    @update_divisor.setter
+    def update_divisor(self, value: int):
+        if value < 1:
+            raise ValueError(f"update divisor must be an int >= 1 (received: {value})")
+        if value == self._update_divisor:
+            return
+
+        self._update_divisor = value
+        self._ticks_until_update = (next(Renderable._update_phases) % value) + 1
+        self._invalidate_update_schedule()
+
+    @property
+    def is_dormant(self) -> bool:
+        """
+        Dormant objects, and all objects below them in the hierarchy, are skipped by `.update()` and `.frame()`
+        until they are woken. See `.sleep()`
+        """
+
+        return self._is_dormant
+
+    def sleep(
+            self, duration_ms: Optional[float] = None,
+            wake_event_key: Optional[Union[str, Tuple[Literal["before", "after"], str]]] = None
+    ) -> None:
+        """
+        Makes this object dormant, so that neither it nor anything below it in the hierarchy is visited by the game's
+        ticks or frames, until `.wake()` is invoked.
+
+        Optionally, this object can also be woken automatically once `duration_ms` of game time has passed,
+        and/or the next time the game event represented by `wake_event_key` is triggered
+        via the game's GameEventHandler - whichever comes first.
+
+        Note that dormant objects remain in the rendering hierarchy, and any hitboxes they have remain registered,
+        so that other objects are still able to collide with them
+        """
+
+        self._is_dormant = True
+        self._invalidate_update_schedule()
+
+        sleep_token = object()
+        self._sleep_token = sleep_token
+        self._remove_wake_event_callback()
+
+        if duration_ms is not None:
+            self.game.screen.set_timer(duration_ms, self._generate_wake_callback(sleep_token))
+
+        if wake_event_key is not None:
+            renderable_ref = ref(self)
+
+            def wake_event_callback(*args, **kwargs):
+                renderable = renderable_ref()
+
+                if (renderable is not None) and (renderable._sleep_token is sleep_token):
+                    # Removed by the event handler once this raises, so .wake() should not also remove it
+                    renderable._wake_event_callback = None
+                    renderable.wake()
+
+                raise RemoveCallback
+
+            self._wake_event_callback = (wake_event_callback, wake_event_key)
+            self.game.game_event_handler.add_callback(wake_event_callback, wake_event_key)
+
+    def wake(self) -> None:
+        if not self._is_dormant:
+            return
+
+        # The update divisor is kept, but time accumulated before this object fell dormant is discarded
+        self._ticks_until_update = (next(Renderable._update_phases) % self._update_divisor) + 1
+        self._divided_elapsed_ms = 0
+
+        self._is_dormant = False
+        self._sleep_token = None
+        self._remove_wake_event_callback()
+        self._invalidate_update_schedule()
+
     def update(self, tick_number: int, elapsed_ms: int, input_events: list, *args, **kwargs) -> None:
         """
         Lifecycle method, called automatically each game tick.
@@ -49,20 +204,22 @@ class Renderable(Extendable, Recurface, ABC):
         As seen below, `._update()` is carried out for any child Renderable objects before the current
         Renderable object, and on high-priority children before low-priority children. This means that updates
         propagate from the 'front' of the display to the 'back' (the objects rendered on top of everything else
-        are the ones updated first)
+        are the ones updated first).
+
+        Rather than recursing through the hierarchy each tick, this order is flattened into a cached schedule which is
+        only regenerated when a child Renderable is added, removed or reprioritised somewhere below this object.
+        Any child Renderable which overrides `.update()` is still invoked via that override, and is responsible
+        for updating its own children
         """
 
-        try:
-            # This will place high-priority children at the front of the sequence
-            child_recurfaces = reversed(self.ordered_child_recurfaces)
-        except TypeError:
-            child_recurfaces = self.child_recurfaces
+        if self._is_dormant:
+            return
 
-        child: Renderable
-        for child in child_recurfaces:
-            child.update(tick_number, elapsed_ms, input_events, *args, **kwargs)
+        if self._update_schedule is None:
+            self._update_schedule = self._generate_update_schedule()
 
-        self._update(tick_number, elapsed_ms, input_events, *args, **kwargs)
+        for update_method in self._update_schedule:
+            update_method(tick_number, elapsed_ms, input_events, *args, **kwargs)
 
     def _update(self, tick_number: int, elapsed_ms: int, input_events: list, *args, **kwargs) -> None:
         """
@@ -74,3 +231,182 @@ class Renderable(Extendable, Recurface, ABC):
         """
 
         pass
+
+    def frame(self, ms_since_last_tick: int, ms_since_last_frame: int) -> None:
+        """
+        Lifecycle method, called automatically each time a frame is about to be rendered.
+
+        `ms_since_last_tick` is the amount of elapsed time that has not yet been simulated by a tick, and can be used
+        to interpolate visual state between ticks. `ms_since_last_frame` is the time elapsed since the previous frame.
+
+        Purely visual work (such as advancing animations) belongs here rather than in `.update()`, as the game's
+        tick rate and framerate are independent of each other - visual work done once per tick would be wasted
+        whenever ticks run more often than frames are rendered.
+
+        `._frame()` is carried out on child Renderable objects in the same order as `._update()`
+        """
+
+        if self._is_dormant:
+            return
+
+        child: Renderable
+        for child in self._get_update_ordered_children():
+            child.frame(ms_since_last_tick, ms_since_last_frame)
+
+        self._frame(ms_since_last_tick, ms_since_last_frame)
+
+    def _frame(self, ms_since_last_tick: int, ms_since_last_frame: int) -> None:
+        """
+        Lifecycle method, called automatically each frame.
+        Can optionally be overridden.
+
+        Complete any visual work necessary for this object each frame
+        """
+
+        pass
+
+    def move_render_position(self, x_offset: float = 0, y_offset: float = 0) -> Tuple[float, float]:
+        """
+        Moves this object by the provided offset as a single position change,
+        so that bounds changes are only flagged once rather than once per axis
+        """
+
+        if self.render_position is None:
+            raise ValueError("`.render_position` is not currently set")
+
+        x_render_position, y_render_position = self.render_position
+        self.render_position = (x_render_position + x_offset, y_render_position + y_offset)
+
+        return self.render_position
+
+    def update_surface(self) -> None:
+        super().update_surface()
+
+        # Invoked by Recurface whenever this object's surface is replaced or its position is changed.
+        # Position changes are flagged for the whole subtree by the position setters above,
+        # so only a change in this object's own size needs to be flagged here
+        surface_size = None if (self.surface is None) else self.surface.get_size()
+        if surface_size != self._surface_size:
+            self._surface_size = surface_size
+            self._on_bounds_changed()
+
+    def _flag_bounds_changed(self) -> None:
+        """
+        Notifies this object and every object below it in the hierarchy that their absolute bounds may have changed
+        """
+
+        stack: List[Renderable] = [self]
+        while stack:
+            renderable = stack.pop()
+
+            renderable._on_bounds_changed()
+            stack.extend(renderable.child_recurfaces)
+
+    def _on_bounds_changed(self) -> None:
+        """
+        Lifecycle method, called automatically whenever the absolute position or size of this object may have changed
+        (including when an object above it in the hierarchy has moved).
+        Can optionally be overridden
+        """
+
+        pass
+
+    def _update_divided(self, tick_number: int, elapsed_ms: int, input_events: list, *args, **kwargs) -> None:
+        """
+        Invoked in place of `.update()` each tick if this object has an update divisor,
+        to determine whether this object should be updated on the current tick
+        """
+
+        self._divided_elapsed_ms += elapsed_ms
+
+        self._ticks_until_update -= 1
+        if self._ticks_until_update > 0:
+            return
+
+        divided_elapsed_ms = self._divided_elapsed_ms
+        self._ticks_until_update = self._update_divisor
+        self._divided_elapsed_ms = 0
+
+        self.update(tick_number, divided_elapsed_ms, input_events, *args, **kwargs)
+
+    def _organise_child_recurfaces(self) -> None:
+        super()._organise_child_recurfaces()
+
+        self._invalidate_update_schedule()
+
+    def _invalidate_update_schedule(self) -> None:
+        """
+        Discards the cached update schedule of this object and of every object above it in the hierarchy,
+        as all of those schedules include this object's children
+        """
+
+        current_obj = self
+        while current_obj is not None:
+            current_obj._update_schedule = None
+
+            current_obj = current_obj.parent_recurface
+
+    def _generate_update_schedule(self) -> List[Callable]:
+        """
+        Returns the `._update()` methods of this object and all objects below it in the hierarchy,
+        in the order described in `.update()`
+        """
+
+        result = []
+
+        # Each entry holds a Renderable, and whether its children have already been added to the stack
+        stack: List[Tuple[Renderable, bool]] = [(self, False)]
+        while stack:
+            renderable, is_expanded = stack.pop()
+
+            if is_expanded:
+                result.append(renderable._update)
+            elif (renderable is not self) and renderable.is_dormant:
+                continue
+            elif (renderable is not self) and (renderable.update_divisor > 1):
+                result.append(renderable._update_divided)
+            elif (renderable is not self) and (type(renderable).update is not Renderable.update):
+                result.append(renderable.update)
+            else:
+                stack.append((renderable, True))
+                # Reversed, so that the first child to be updated is the first to be popped off the stack
+                stack.extend((child, False) for child in reversed(renderable._get_update_ordered_children()))
+
+        return result
+
+    def _generate_wake_callback(self, sleep_token: object) -> Callable[[], None]:
+        """
+        Returns a function which wakes this object, but only if it has not been woken
+        and put back to sleep since the provided sleep token was generated
+        """
+
+        renderable_ref = ref(self)  # Weakref so that a pending wake-up does not keep this object alive
+
+        def wake_callback():
+            renderable = renderable_ref()
+
+            if (renderable is not None) and (renderable._sleep_token is sleep_token):
+                renderable.wake()
+
+        return wake_callback
+
+    def _remove_wake_event_callback(self) -> None:
+        """
+        Unregisters the pending wake-up callback from the game event handler, if there is one,
+        so that callbacks for wake-ups which can no longer happen do not accumulate
+        """
+
+        if self._wake_event_callback is None:
+            return
+
+        wake_event_callback, wake_event_key = self._wake_event_callback
+        self._wake_event_callback = None
+
+        self.game.game_event_handler.remove_callback(wake_event_callback, wake_event_key)
+
+    def _get_update_ordered_children(self) -> Tuple["Renderable", ...]:
+        try:
+            # This will place high-priority children at the front of the sequence
+            return tuple(reversed(self.ordered_child_recurfaces))
+        except TypeError:
+            return tuple(self.child_recurfaces)
@@ -3,9 +3,12 @@ from managedstate import State
 from managedstate.extensions import Registrar
 
 from abc import ABC
-from typing import Optional
+from typing import Optional, Callable, List, Tuple
+from contextlib import nullcontext
+from heapq import heappush, heappop
+from itertools import count
 
-from ..utils import HitboxManager
+from ..utils import HitboxManager, Contact, ProfilerMetric
 from .renderable import Renderable
 
 
@@ -20,7 +23,14 @@ class Screen(Renderable, ABC):
         super().__init__(game, surface=surface, render_position=(0, 0), parent=None, priority=None)
 
         self._state = state
-        self._hitbox_manager = HitboxManager()
+        self._hitbox_manager = HitboxManager(game.hitbox_tag_index, cell_size=game.config.HITBOX_CELL_SIZE)
+
+        self._elapsed_ms = 0  # Total game time that has been simulated by this screen's ticks
+        self._timers: List[Tuple[float, int, Callable[[], None]]] = []  # Heap, ordered by due time then creation order
+        self._timer_ids = count()
+
+        self._is_collision_pass_enabled = False  # Opt-in, see .is_collision_pass_enabled
+        self._contacts: List[Contact] = []
 
         self.register_paths(self._state)
 
@@ -32,12 +42,78 @@ class Screen(Renderable, ABC):
     def hitbox_manager(self) -> HitboxManager:
         return self._hitbox_manager
 
+    @property
+    def elapsed_ms(self) -> float:
+        """
+        The total amount of game time that has been simulated by this screen's ticks
+        """
+
+        return self._elapsed_ms
+
+    @property
+    def is_collision_pass_enabled(self) -> bool:
+        """
+        If True, after each tick's updates have been applied this screen checks every hitbox in its hitbox manager
+        for collisions in a single pass, and invokes `.collide()` on both Renderable objects involved in each
+        collision found. Objects using this should not also check for their collisions via `.check_collisions()`.
+        Defaults to False
+        """
+
+        return self._is_collision_pass_enabled
+
+    @is_collision_pass_enabled.setter
+    def is_collision_pass_enabled(self, value: bool):
+        self._is_collision_pass_enabled = value
+
+        if not value:
+            self._contacts = []
+
+    @property
+    def contacts(self) -> List[Contact]:
+        """
+        The contacts found by the most recent collision pass, in the order they were dispatched
+        """
+
+        return self._contacts
+
+    def set_timer(self, delay_ms: float, callback: Callable[[], None]) -> None:
+        """
+        Invokes the provided callback at the start of the first tick by which at least `delay_ms` of game time
+        has passed on this screen
+        """
+
+        heappush(self._timers, (self._elapsed_ms + delay_ms, next(self._timer_ids), callback))
+
+    def update(self, tick_number: int, elapsed_ms: int, input_events: list, *args, **kwargs) -> None:
+        self._hitbox_manager.store_previous_rects()
+
+        self._elapsed_ms += elapsed_ms
+
+        while self._timers and (self._timers[0][0] <= self._elapsed_ms):
+            due_ms, timer_id, callback = heappop(self._timers)
+            callback()
+
+        super().update(tick_number, elapsed_ms, input_events, *args, **kwargs)
+
+        if self._is_collision_pass_enabled:
+            profiler = self.game.profiler
+            with nullcontext() if (profiler is None) else profiler.measure(ProfilerMetric.COLLISION_PASS):
+                self._run_collision_pass()
+
     def _update(self, tick_number: int, elapsed_ms: int, input_events: list, *args, **kwargs) -> None:
         """
         This method can be further extended as necessary in subclasses
         """
 
         self._hitbox_manager.reset_checked_collisions()
+        self._hitbox_manager.clear_query_cache()
+
+    def _run_collision_pass(self) -> None:
+        self._contacts = self._hitbox_manager.find_contacts()
+
+        for hitbox, other in self._contacts:
+            hitbox.parent_renderable.collide(other.parent_renderable)
+            other.parent_renderable.collide(hitbox.parent_renderable)
 
     @staticmethod
     def register_paths(state: State.with_extensions(Registrar)):
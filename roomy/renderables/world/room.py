@@ -1,10 +1,12 @@
-from typing import List, Type
+from typing import List, Type, Optional
 from os import path
 
 from ...extensions import Hitboxed
 from ...hitboxes import RecurfaceHitbox
 from ...methods import Methods
+from ...utils import PhysicsSystem
 from ..renderable import Renderable
+from ..entity import Entity
 from ..enums import RenderableHitboxTag
 from .enums import RenderableDataKey
 
@@ -16,9 +18,12 @@ class Room(Renderable.with_extensions(Hitboxed)):
     """
 
     def __init__(self, parent: "World", room_id: str):
+        self._physics: Optional[PhysicsSystem] = None  # Hoisted so that it is available if children are organised
+
         super().__init__(parent.game, parent=parent, render_position=(0, 0), priority=0)
 
         self._room_id = room_id
+        self._physics = self.generate_physics()
         self.surface = self._generate_surface()
 
         self._load_room()
@@ -27,8 +32,25 @@ class Room(Renderable.with_extensions(Hitboxed)):
     def room_id(self) -> str:
         return self._room_id
 
+    @property
+    def physics(self) -> Optional[PhysicsSystem]:
+        return self._physics
+
+    def generate_physics(self) -> Optional[PhysicsSystem]:
+        """
+        Can optionally be overridden.
+        Return a new PhysicsSystem here to have the movement of every Entity object directly inside this room
+        integrated by it each tick, and their collisions resolved by it, in which case those entities should not
+        also move themselves in their own `._update()` methods. Entities are added to and removed from
+        the physics system automatically as they enter and leave this room.
+
+        Returns None by default, which disables this behaviour
+        """
+
+        return None
+
     def generate_hitboxes(self):
-        return [RecurfaceHitbox(self, tags=(RenderableHitboxTag.ROOM, ), is_inverted=True)]
+        return [RecurfaceHitbox(self, tags=(RenderableHitboxTag.ROOM, ), is_inverted=True, is_static=True)]
 
     def check_collisions(self) -> None:
         """
@@ -47,6 +69,26 @@ class Room(Renderable.with_extensions(Hitboxed)):
 
         pass
 
+    def _update(self, tick_number: int, elapsed_ms: int, input_events: list, *args, **kwargs) -> None:
+        """
+        Occupants are updated before the room itself, so the physics step applies any changes they made this tick
+        """
+
+        if self._physics is not None:
+            self._physics.step(elapsed_ms, hitbox_manager=self.game.screen.hitbox_manager)
+
+    def add_child_recurface(self, child: Renderable) -> None:
+        super().add_child_recurface(child)
+
+        if (self._physics is not None) and isinstance(child, Entity):
+            self._physics.add(child)
+
+    def remove_child_recurface(self, child: Renderable) -> None:
+        super().remove_child_recurface(child)
+
+        if (self._physics is not None) and isinstance(child, Entity):
+            self._physics.remove(child)
+
     def _generate_surface(self):
         """
         Loads the background image for the room object as a new Surface.
@@ -1,5 +1,16 @@
 from .animationcache import AnimationCache
+from .framediskcache import FrameDiskCache
+from .textureatlasbuilder import TextureAtlasBuilder
 from .classregistrar import ClassRegistrar
 from .hitboxmanager import HitboxManager
+from .hitboxtagindex import HitboxTagIndex
+from .raycasthit import RaycastHit
+from .contact import Contact
+from .spatialhash import SpatialHash
+from .sweepandprune import SweepAndPrune
+from .boundingvolumehierarchy import BoundingVolumeHierarchy
+from .hitboxbatch import HitboxBatch
+from .physicssystem import PhysicsSystem
 from .gameeventhandler import GameEventHandler, RemoveCallback
-from .enums import GameEventType, AnimationDataKey
+from .frameprofiler import FrameProfiler
+from .enums import GameEventType, AnimationDataKey, ProfilerMetric, CatchUpPolicy
@@ -1,28 +1,124 @@
-from pygame import Surface, transform
+from pygame import Surface, Rect, transform, mask
+from pygame.mask import Mask
 
 from os import path
 from json import loads
-from typing import Type, Dict, Any, Tuple, Union, Literal
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import SimpleQueue, Empty
+from weakref import WeakKeyDictionary
+from typing import Type, Dict, Any, Tuple, Union, Literal, Iterable, Set, Hashable, List, Optional
 
 from ..methods import Methods
-from .enums import AnimationDataKey
+from .enums import AnimationDataKey, GameEventType
+from .framediskcache import FrameDiskCache
 
 
 class AnimationCache:
     """
-    Helper class which retrieves and caches files and data for animations, to optimise memory usage
+    Helper class which retrieves and caches files and data for animations, to optimise memory usage.
+
+    If a byte budget is set (see Config.ANIMATION_CACHE_BUDGET_BYTES), the least recently used frames are evicted
+    whenever the total size of the cached frames exceeds it. Frames which have been pinned via .pin_frames()
+    (as FileAnimation does for its own frames) are not evicted for as long as the object which pinned them is alive
     """
 
     def __init__(self, game):
         self._game = game
 
+        self._budget_bytes = self._game.config.ANIMATION_CACHE_BUDGET_BYTES
+        self._total_bytes = 0
+
+        # Optional, stores decoded and scaled images across runs
+        disk_cache_path = self._game.config.ANIMATION_DISK_CACHE_PATH
+        self._disk_cache = None if disk_cache_path is None else FrameDiskCache(disk_cache_path)
+
         # The below attributes cache data for performance optimisation
         # Stores animation data which has already been loaded before, by (Animated) class name
         self._animation_data = {}
         # Stores data for any sprite sheets loaded as part of animation data, under the sprite sheet's label
         self._sprite_sheets_data = {}
-        # Stores frames which have already been generated, under their frame key & size
-        self._frames = {}
+        # Stores sprite sheet images which have already been decoded, under the sprite sheet's label.
+        # Frames cut from these at a size modifier of 1 share their pixels, so each sheet's size is only counted once
+        self._sprite_sheets: Dict[str, Surface] = {}
+        # Stores the area of each sprite within its sprite sheet, under the sprite sheet's label
+        self._sprite_rects: Dict[str, List[Rect]] = {}
+        # Maps frame keys which have been packed into a texture atlas to the atlas sprite which should be loaded instead
+        self._atlas_frame_keys: Dict[Hashable, Tuple[str, int]] = {}
+        # Stores frames which have already been generated, under their frame key & size.
+        # Ordered from least to most recently used, so that the front of this dict is evicted first
+        self._frames: "OrderedDict[Tuple[Hashable, float], Surface]" = OrderedDict()
+        # Stores the number of bytes each cached frame counts towards the cache's total size
+        self._frame_bytes: Dict[Tuple[Hashable, float], int] = {}
+        # Stores collision masks for frames which have already been generated, under their frame key & size.
+        # Masks are evicted alongside their frames
+        self._masks: Dict[Tuple[Hashable, float], Mask] = {}
+
+        # Stores the frames pinned by each object, under their frame key & size
+        self._pins: "WeakKeyDictionary[Any, Set[Tuple[Hashable, float]]]" = WeakKeyDictionary()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        # Frames are decoded on this thread pool by .preload_frames_async(), which is only created once first needed
+        self._preload_executor: Optional[ThreadPoolExecutor] = None
+        # Stores the finished decoding jobs for each asynchronous preload, until they are inserted on the game thread
+        self._finished_preload_jobs: "SimpleQueue[Tuple[Future, Future]]" = SimpleQueue()
+        # Stores the target class, frames inserted so far, total frames and remaining jobs for each asynchronous preload
+        self._preload_progress: Dict[Future, Tuple[type, int, int, int]] = {}
+
+        atlas_manifest_path = self._game.config.ANIMATION_ATLAS_MANIFEST_PATH
+        if atlas_manifest_path is not None:
+            self.load_atlas_manifest(atlas_manifest_path)
+
+    @property
+    def budget_bytes(self) -> int:
+        """
+        The maximum total size of the cached frames, in bytes. A value of 0 indicates no limit
+        """
+
+        return self._budget_bytes
+
+    @budget_bytes.setter
+    def budget_bytes(self, value: int):
+        if value < 0:
+            raise ValueError(f"budget must be >= 0 (received: {value})")
+
+        self._budget_bytes = value
+        self._enforce_budget()
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        The total size of the frames currently cached, in bytes
+        """
+
+        return self._total_bytes
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of frame retrievals which were served from the cache
+        """
+
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        The number of frame retrievals which required the frame to be loaded
+        """
+
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        The number of frames which have been evicted from the cache, either to stay within its budget or via .clear()
+        """
+
+        return self._evictions
 
     def register_sprite_sheet(
         self,
@@ -37,6 +133,29 @@ class AnimationCache:
 
         self._sprite_sheets_data[sprite_sheet_label] = sprite_data
 
+        # Any previously decoded image for this label, and any frames cut from it, may no longer match its data.
+        # The frames are evicted first, as those at a size modifier of 1 share the image's pixels
+        self._evict_sprite_sheet_frames(sprite_sheet_label)
+        self._unload_sprite_sheet(sprite_sheet_label)
+
+    def load_atlas_manifest(self, manifest_path: str) -> None:
+        """
+        Loads a texture atlas manifest written by TextureAtlasBuilder (relative to the designated resource folder).
+        Any frame packed into the atlas is then loaded from it instead of from its original source,
+        so that frames at a size modifier of 1 are views into one of a small number of large atlas images.
+
+        This is done automatically when the game is initialised, if Config.ANIMATION_ATLAS_MANIFEST_PATH is set
+        """
+
+        with open(path.join(self._game.config.RESOURCE_FOLDER_PATH, manifest_path), "r") as file:
+            manifest = loads(file.read())
+
+        for sprite_sheet_label, sprite_sheet_data in manifest[AnimationDataKey.SPRITE_SHEETS].items():
+            self.register_sprite_sheet(sprite_sheet_label, sprite_sheet_data)
+
+        for frame_key, atlas_frame_key in manifest[AnimationDataKey.FRAMES]:
+            self._atlas_frame_keys[self._get_hashable_frame_key(frame_key)] = tuple(atlas_frame_key)
+
     def get_settings(self, target_cls: Type["Renderable.with_extensions(Animated)"], animation_key: str) -> Dict[str, Any]:
         """
         Retrieves the animation settings associated with the provided class and animation key,
@@ -57,12 +176,68 @@ class AnimationCache:
         (relative beginning from the designated resource folder, as indicated in the game's config),
         or it should be a sequence of 2 items
         (the first a sprite sheet label which refers to an already loaded sprite sheet,
-        and the second an index for which sprite within in that sprite sheet is the desired frame)
+        and the second an index for which sprite within in that sprite sheet is the desired frame).
+
+        Sprite sheet frames at a size modifier of 1 are views into the sprite sheet's image rather than copies of it,
+        and so should not be drawn onto
+        """
+
+        cache_key = (self._get_hashable_frame_key(frame_key), size)
+
+        if cache_key in self._frames:
+            self._hits += 1
+            self._frames.move_to_end(cache_key)
+
+            return self._frames[cache_key]
+
+        self._misses += 1
+        return self._load_frame(*cache_key)
+
+    def get_mask(self, frame_key: Union[str, Tuple[str, int]], size: float = 1) -> Mask:
         """
+        Retrieves a collision mask for the animation frame with the provided frame key and size modifier,
+        generating the mask (and loading the frame) if necessary.
 
-        self._load_frame(frame_key, size)
+        Masks are generated once per frame key & size and then cached, so that objects which swap frames
+        do not need to regenerate a mask each time
+        """
+
+        cache_key = (self._get_hashable_frame_key(frame_key), size)
+
+        frame = self.get_frame(frame_key, size)  # Also marks the frame as recently used
+        if cache_key not in self._masks:
+            self._masks[cache_key] = mask.from_surface(frame)
+
+        return self._masks[cache_key]
+
+    def pin_frames(self, owner: Any, frame_keys: Iterable[Union[str, Tuple[str, int]]], size: float = 1) -> None:
+        """
+        Prevents the frames with the provided frame keys and size modifier from being evicted from the cache,
+        for as long as `owner` is alive. Any frames previously pinned by the same owner are unpinned.
+        Frames do not need to be loaded to be pinned; they will simply not be evicted once they are loaded.
+
+        `owner` must support weak references
+        """
+
+        self._pins[owner] = set((self._get_hashable_frame_key(frame_key), size) for frame_key in frame_keys)
+
+    def unpin_frames(self, owner: Any) -> None:
+        """
+        Unpins any frames pinned by `owner`, allowing them to be evicted again
+        """
+
+        self._pins.pop(owner, None)
+        self._enforce_budget()
+
+    def clear(self) -> None:
+        """
+        Evicts every cached frame which is not pinned, and discards any loaded animation data.
+        Animation data is reloaded as needed, and any manually registered sprite sheets are kept
+        """
+
+        self._evict_frames(stop_at_budget=False)
 
-        return self._frames[frame_key][size]
+        self._animation_data.clear()
 
     def preload_frames(self, target_cls: Type["Renderable.with_extensions(Animated)"], sizes: Tuple[int, ...] = (1,)) -> None:
         """
@@ -78,7 +253,118 @@ class AnimationCache:
         for animation_key, settings in class_animation_settings.items():
             for frame_key in settings[AnimationDataKey.FRAMES]:
                 for size in sizes:
-                    self._load_frame(frame_key, size)
+                    if (frame_key, size) not in self._frames:
+                        self._load_frame(frame_key, size)
+
+    def preload_frames_async(
+            self, target_cls: Type["Renderable.with_extensions(Animated)"], sizes: Tuple[int, ...] = (1,)
+    ) -> Future:
+        """
+        Loads animation frames into memory ahead of time, without blocking the calling thread.
+        Returns a future which completes once every frame has been added to the cache.
+
+        Frames are decoded and scaled on a background thread pool, but are only added to the cache on the game thread,
+        each time .process_preloaded_frames() is called (which the game does automatically at the start of each tick).
+        A GameEventType.PRELOAD_PROGRESS event is triggered each time more of the frames have been added,
+        so that loading screens are able to display the preload's progress.
+
+        Since the future is completed on the game thread, it should not be waited on from the game thread
+        """
+
+        self._load_data(target_cls)
+
+        class_animation_data = self._animation_data[target_cls.__name__]
+        class_animation_settings = class_animation_data[AnimationDataKey.ANIMATION_SETTINGS]
+
+        # Frames are grouped by the image they are decoded from, so that each image is only decoded once
+        file_frame_sizes: Dict[str, List[float]] = {}
+        sprite_sheet_frames: Dict[str, Dict[Tuple[Hashable, float], int]] = {}
+        for settings in class_animation_settings.values():
+            for frame_key in settings[AnimationDataKey.FRAMES]:
+                source_frame_key = self._atlas_frame_keys.get(frame_key, frame_key)
+
+                for size in sizes:
+                    if (frame_key, size) in self._frames:
+                        continue
+
+                    if type(source_frame_key) is str:
+                        frame_sizes = file_frame_sizes.setdefault(frame_key, [])
+                        if size not in frame_sizes:
+                            frame_sizes.append(size)
+                    else:
+                        sprite_sheet_frames.setdefault(source_frame_key[0], {})[(frame_key, size)] = source_frame_key[1]
+
+        if self._preload_executor is None:
+            max_workers = self._game.config.ANIMATION_PRELOAD_THREADS or None
+            self._preload_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="roomy-preload")
+
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        jobs = [
+            self._preload_executor.submit(self._decode_file_frames, frame_key, frame_sizes)
+            for frame_key, frame_sizes in file_frame_sizes.items()
+        ] + [
+            self._preload_executor.submit(
+                self._decode_sprite_sheet_frames,
+                sprite_sheet_label, sprite_indexes, self._sprite_sheets.get(sprite_sheet_label)
+            )
+            for sprite_sheet_label, sprite_indexes in sprite_sheet_frames.items()
+        ]
+
+        total_frames = (
+            sum(len(frame_sizes) for frame_sizes in file_frame_sizes.values()) +
+            sum(len(sprite_indexes) for sprite_indexes in sprite_sheet_frames.values())
+        )
+
+        if not jobs:
+            future.set_result(None)
+            return future
+
+        self._preload_progress[future] = (target_cls, 0, total_frames, len(jobs))
+        for job in jobs:
+            # Done callbacks are run on the worker thread, so the job is only queued here
+            job.add_done_callback(lambda finished_job: self._finished_preload_jobs.put((future, finished_job)))
+
+        return future
+
+    def process_preloaded_frames(self) -> None:
+        """
+        Adds any frames which have finished being decoded by .preload_frames_async() to the cache.
+        Must be called on the game thread; this is done automatically at the start of each tick
+        """
+
+        while True:
+            try:
+                future, job = self._finished_preload_jobs.get_nowait()
+            except Empty:
+                break
+
+            if future not in self._preload_progress:
+                continue  # An earlier job for this preload has already failed
+
+            if job.exception() is not None:
+                del self._preload_progress[future]
+                future.set_exception(job.exception())
+                continue
+
+            target_cls, loaded_frames, total_frames, remaining_jobs = self._preload_progress[future]
+
+            loaded_frames += self._insert_decoded_frames(*job.result())
+            remaining_jobs -= 1
+
+            if remaining_jobs:
+                self._preload_progress[future] = (target_cls, loaded_frames, total_frames, remaining_jobs)
+            else:
+                del self._preload_progress[future]
+
+            self._game.game_event_handler.on_event(
+                GameEventType.PRELOAD_PROGRESS,
+                target_cls=target_cls, loaded_frames=loaded_frames, total_frames=total_frames
+            )
+
+            if not remaining_jobs:
+                future.set_result(None)
 
     def _load_data(self, target_cls: Type["Renderable.with_extensions(Animated)"]) -> None:
         """
@@ -107,30 +393,281 @@ class AnimationCache:
                 data = loads(file.read())
                 sprite_sheets_data = data.get(AnimationDataKey.SPRITE_SHEETS, {})
 
+                # Sprite sheet frame keys are decoded from JSON as lists, which cannot be used as cache keys
+                for settings in data.get(AnimationDataKey.ANIMATION_SETTINGS, {}).values():
+                    settings[AnimationDataKey.FRAMES] = [
+                        self._get_hashable_frame_key(frame_key) for frame_key in settings[AnimationDataKey.FRAMES]
+                    ]
+
                 self._animation_data[target_cls.__name__] = data
                 self._sprite_sheets_data.update(sprite_sheets_data)
 
-    def _load_frame(self, frame_key: Union[str, Tuple[str, int]], size: float) -> None:
+    def _load_frame(self, frame_key: Union[str, Tuple[str, int]], size: float) -> Surface:
         """
-        Loads the animation frame at the target size modifier, if it is not already loaded.
+        Loads the animation frame at the target size modifier, stores it in the cache and then returns it.
+        The frame should not already be loaded, and its frame key should be hashable
         """
 
-        if frame_key not in self._frames or size not in self._frames[frame_key]:
-            if type(frame_key) is str:  # frame_key is a file path
-                surface = Methods.load_image(
-                    path.join(
-                        self._game.config.RESOURCE_FOLDER_PATH,
-                        frame_key
-                    )
+        # Frames which have been packed into a texture atlas are loaded from there instead
+        source_frame_key = self._atlas_frame_keys.get(frame_key, frame_key)
+
+        if type(source_frame_key) is str:  # frame_key is a file path
+            surface = self._read_image(source_frame_key, size=size)
+
+            self._store_frame((frame_key, size), surface, self._get_surface_bytes(surface))
+
+        else:  # frame_key is a sprite sheet label
+            sprite_sheet_label = source_frame_key[0]
+            sprite_index = source_frame_key[1]
+
+            if sprite_sheet_label not in self._sprite_sheets:
+                self._store_sprite_sheet(sprite_sheet_label, *self._decode_sprite_sheet(sprite_sheet_label))
+
+            sprite_sheet = self._sprite_sheets[sprite_sheet_label]
+            sprite_rect = self._sprite_rects[sprite_sheet_label][sprite_index]
+
+            if size == 1:
+                # Shares the sprite sheet's pixels, which have already been counted towards the total size
+                surface = sprite_sheet.subsurface(sprite_rect)
+                self._store_frame((frame_key, size), surface, 0)
+            else:
+                sprite_sheet_file_path = self._sprite_sheets_data[sprite_sheet_label][AnimationDataKey.FILE_PATH]
+                surface = self._read_image(
+                    sprite_sheet_file_path, size=size, sprite_rect=sprite_rect,
+                    decoded_images={sprite_sheet_file_path: sprite_sheet}
                 )
+                self._store_frame((frame_key, size), surface, self._get_surface_bytes(surface))
+
+        return surface
+
+    def _decode_file_frames(self, frame_key: str, sizes: List[float]) -> Tuple[Dict, Optional[tuple]]:
+        """
+        Decodes the image file for the provided frame key once, and scales it to each of the provided sizes.
+        Returns the frames in the same format as ._decode_sprite_sheet_frames().
+
+        Does not modify the cache, so that it can be run on a background thread
+        """
+
+        decoded_images = {}
+
+        frames = {
+            (frame_key, size): self._read_image(frame_key, size=size, decoded_images=decoded_images) for size in sizes
+        }
+
+        return frames, None
+
+    def _decode_sprite_sheet_frames(
+            self, sprite_sheet_label: str, sprite_indexes: Dict[Tuple[Hashable, float], int],
+            sprite_sheet: Optional[Surface]
+    ) -> Tuple[Dict, Optional[tuple]]:
+        """
+        Decodes the image for the sprite sheet with the provided label if it is not provided, and scales the
+        requested sprites from it (`sprite_indexes` maps the cache key of each requested frame to its index within
+        the sprite sheet). Returns the scaled frames under their cache keys,
+        along with the sprite sheet's label, image and sprite rects if the image was decoded here.
+        Frames at a size modifier of 1 are omitted, since they are only views into the sprite sheet's image.
+
+        Does not modify the cache, so that it can be run on a background thread
+        """
+
+        decoded_sprite_sheet = None
+        # The sprite sheet itself is only needed here for views into it, since scaled frames may be stored on disk
+        if (sprite_sheet is None) and any(size == 1 for frame_key, size in sprite_indexes):
+            sprite_sheet, sprite_rects = self._decode_sprite_sheet(sprite_sheet_label)
+            decoded_sprite_sheet = (sprite_sheet_label, sprite_sheet, sprite_rects)
+        else:
+            sprite_rects = self._get_sprite_rects(sprite_sheet_label)
+
+        sprite_sheet_file_path = self._sprite_sheets_data[sprite_sheet_label][AnimationDataKey.FILE_PATH]
+        decoded_images = {} if (sprite_sheet is None) else {sprite_sheet_file_path: sprite_sheet}
+
+        frames = {
+            (frame_key, size): self._read_image(
+                sprite_sheet_file_path, size=size, sprite_rect=sprite_rects[sprite_index], decoded_images=decoded_images
+            )
+            for (frame_key, size), sprite_index in sprite_indexes.items() if size != 1
+        }
+        frames.update({cache_key: None for cache_key in sprite_indexes if cache_key[1] == 1})
+
+        return frames, decoded_sprite_sheet
+
+    def _insert_decoded_frames(self, frames: Dict, decoded_sprite_sheet: Optional[tuple]) -> int:
+        """
+        Adds frames decoded on a background thread to the cache, skipping any which have been loaded in the meantime.
+        Frames stored as None are views into their sprite sheet, which are created here.
+        Returns the number of frames processed
+        """
+
+        if (decoded_sprite_sheet is not None) and (decoded_sprite_sheet[0] not in self._sprite_sheets):
+            self._store_sprite_sheet(*decoded_sprite_sheet)
+
+        for cache_key, surface in frames.items():
+            if cache_key in self._frames:
+                continue
+
+            if surface is None:
+                self._load_frame(*cache_key)
+            else:
+                self._store_frame(cache_key, surface, self._get_surface_bytes(surface))
+
+        return len(frames)
+
+    def _decode_sprite_sheet(self, sprite_sheet_label: str) -> Tuple[Surface, List[Rect]]:
+        """
+        Decodes the image for the sprite sheet with the provided label, and returns it along with its sprite rects.
+
+        Does not modify the cache, so that it can be run on a background thread
+        """
+
+        sprite_rects = self._get_sprite_rects(sprite_sheet_label)
+        sprite_sheet = self._read_image(self._sprite_sheets_data[sprite_sheet_label][AnimationDataKey.FILE_PATH])
+
+        return sprite_sheet, sprite_rects
+
+    def _get_sprite_rects(self, sprite_sheet_label: str) -> List[Rect]:
+        sprite_sheet_data = self._sprite_sheets_data[sprite_sheet_label]
+
+        parse_type = sprite_sheet_data[AnimationDataKey.PARSE_TYPE]
+        if parse_type != AnimationDataKey.PARSE_TYPE_INDIVIDUAL:
+            raise ValueError(f"unrecognised sprite sheet parse type: {parse_type}")
+
+        return [
+            Rect(start, (end[0] - start[0], end[1] - start[1]))
+            for start, end in sprite_sheet_data[AnimationDataKey.PARSE_DATA]
+        ]
+
+    def _read_image(
+            self, file_path: str, size: Optional[float] = None, sprite_rect: Optional[Rect] = None,
+            decoded_images: Optional[Dict[str, Surface]] = None
+    ) -> Surface:
+        """
+        Returns the image at the provided file path (relative to the designated resource folder),
+        cropped to `sprite_rect` and then scaled by `size` if they are provided.
+        If an on-disk frame cache has been configured, the result is retrieved from (or stored in) it.
+
+        `decoded_images` may contain full images which have already been decoded, under their file paths,
+        and any image decoded here is added to it so that it can be reused by later calls.
+
+        Does not modify the cache, so that it can be run on a background thread
+        """
+
+        full_file_path = path.join(self._game.config.RESOURCE_FOLDER_PATH, file_path)
+
+        if self._disk_cache is not None:
+            surface = self._disk_cache.get(full_file_path, size=size, sprite_rect=sprite_rect)
+            if surface is not None:
+                return surface
+
+        if (size is None) and (sprite_rect is None):
+            surface = Methods.load_image(full_file_path)
+        else:
+            if decoded_images is None:
+                decoded_images = {}
+            if file_path not in decoded_images:
+                decoded_images[file_path] = Methods.load_image(full_file_path)
+
+            surface = decoded_images[file_path]
+            if sprite_rect is not None:
+                surface = surface.subsurface(sprite_rect)
+            if size is not None:
                 surface = transform.rotozoom(surface, 0, size)
 
-                frame_sizes = self._frames.setdefault(frame_key, {})
-                frame_sizes[size] = surface
+        if self._disk_cache is not None:
+            self._disk_cache.put(full_file_path, surface, size=size, sprite_rect=sprite_rect)
+
+        return surface
+
+    def _store_sprite_sheet(self, sprite_sheet_label: str, sprite_sheet: Surface, sprite_rects: List[Rect]) -> None:
+        self._sprite_sheets[sprite_sheet_label] = sprite_sheet
+        self._sprite_rects[sprite_sheet_label] = sprite_rects
+
+        self._total_bytes += self._get_surface_bytes(sprite_sheet)
+
+    def _evict_sprite_sheet_frames(self, sprite_sheet_label: str) -> None:
+        """
+        Evicts every cached frame and mask cut from the sprite sheet, at any size and whether or not it is pinned,
+        including frames which were redirected to it by a texture atlas
+        """
+
+        for cache_key in tuple(self._frames):
+            frame_key, size = cache_key
+            source_frame_key = self._atlas_frame_keys.get(frame_key, frame_key)
+
+            if (type(source_frame_key) is not tuple) or (source_frame_key[0] != sprite_sheet_label):
+                continue
+
+            del self._frames[cache_key]
+            self._masks.pop(cache_key, None)
+
+            self._total_bytes -= self._frame_bytes.pop(cache_key)
+            self._evictions += 1
+
+    def _unload_sprite_sheet(self, sprite_sheet_label: str) -> None:
+        if sprite_sheet_label not in self._sprite_sheets:
+            return
+
+        sprite_sheet = self._sprite_sheets.pop(sprite_sheet_label)
+        del self._sprite_rects[sprite_sheet_label]
+
+        self._total_bytes -= self._get_surface_bytes(sprite_sheet)
+
+    def _store_frame(self, cache_key: Tuple[Hashable, float], surface: Surface, byte_count: int) -> None:
+        """
+        Adds a newly loaded frame to the cache as its most recently used frame,
+        evicting older frames if this causes the budget to be exceeded
+        """
+
+        self._frames[cache_key] = surface
+        self._frame_bytes[cache_key] = byte_count
+        self._total_bytes += byte_count
+
+        self._enforce_budget()
+
+    def _enforce_budget(self) -> None:
+        if self._budget_bytes and (self._total_bytes > self._budget_bytes):
+            self._evict_frames(stop_at_budget=True)
+
+    def _evict_frames(self, stop_at_budget: bool) -> None:
+        """
+        Evicts unpinned frames in order from least to most recently used, followed by any decoded sprite sheets
+        which no cached frames still share pixels with.
+        If `stop_at_budget` is True, stops once the total size of the cached frames is within budget
+        """
+
+        pinned = set()
+        for pinned_cache_keys in self._pins.values():
+            pinned |= pinned_cache_keys
+
+        for cache_key in tuple(self._frames):
+            if stop_at_budget and (self._total_bytes <= self._budget_bytes):
+                break
+            if cache_key in pinned:
+                continue
+
+            del self._frames[cache_key]
+            self._masks.pop(cache_key, None)
+
+            self._total_bytes -= self._frame_bytes.pop(cache_key)
+            self._evictions += 1
+
+        shared_sprite_sheet_labels = set()
+        for frame_key, size in self._frames:
+            source_frame_key = self._atlas_frame_keys.get(frame_key, frame_key)
+
+            if (type(source_frame_key) is tuple) and (size == 1):
+                shared_sprite_sheet_labels.add(source_frame_key[0])
+        for sprite_sheet_label in tuple(self._sprite_sheets):
+            if stop_at_budget and (self._total_bytes <= self._budget_bytes):
+                break
+            if sprite_sheet_label in shared_sprite_sheet_labels:
+                continue
+
+            self._unload_sprite_sheet(sprite_sheet_label)
 
-            else:  # frame_key is a sprite sheet label
-                sprite_sheet_label = frame_key[0]
-                sprite_index = frame_key[1]
+    @staticmethod
+    def _get_hashable_frame_key(frame_key: Union[str, Tuple[str, int], List]) -> Union[str, Tuple[str, int]]:
+        return tuple(frame_key) if type(frame_key) is list else frame_key
 
-                sprite_sheet_data = self._sprite_sheets_data[sprite_sheet_label]
-                pass  # TODO: Add logic to load & store sprites from sprite sheet data at provided zoom
+    @staticmethod
+    def _get_surface_bytes(surface: Surface) -> int:
+        return surface.get_bytesize() * surface.get_width() * surface.get_height()
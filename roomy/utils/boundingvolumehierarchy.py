@@ -0,0 +1,142 @@
+from pygame import Rect
+
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+from ..hitboxes.methods import Geometry
+
+
+class BoundingVolumeHierarchy:
+    """
+    Binary tree of nested bounding rects, built once over a fixed collection of items.
+    Retrieving the items in a given region only visits the branches whose bounds overlap that region,
+    making it well suited to large numbers of items which do not move (such as a room's walls and platforms).
+
+    The tree cannot be modified after being built; if any of its items change, a new tree should be built instead
+    """
+
+    LEAF_SIZE = 4  # Maximum number of items stored in each leaf node
+
+    def __init__(self, items: Iterable[Tuple[Hashable, Rect]] = ()):
+        """
+        `items` should contain each item to store, paired with the rect it occupies
+        """
+
+        self._rects: Dict[Hashable, Rect] = {}
+
+        # Each node is stored as (left, top, right, bottom, children), where children is either a tuple containing
+        # the indexes of the node's two child nodes, or a list of items if the node is a leaf
+        self._nodes: List[tuple] = []
+
+        entries = []
+        for item, rect in items:
+            self._rects[item] = rect
+            entries.append((rect.centerx, rect.centery, item))
+
+        if entries:
+            self._build_node(entries)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._rects
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def query(self, rect: Rect) -> Set[Hashable]:
+        """
+        Returns every item whose rect overlaps the provided rect
+        """
+
+        result = set()
+
+        if not self._nodes:
+            return result
+
+        nodes = self._nodes
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+
+        node_indexes = [0]
+        while node_indexes:
+            node_left, node_top, node_right, node_bottom, children = nodes[node_indexes.pop()]
+
+            if not ((node_left < right) and (left < node_right) and (node_top < bottom) and (top < node_bottom)):
+                continue
+
+            if type(children) is tuple:
+                node_indexes.extend(children)
+            else:
+                for item in children:
+                    item_rect = self._rects[item]
+
+                    if (
+                            (item_rect.left < right) and (left < item_rect.right) and
+                            (item_rect.top < bottom) and (top < item_rect.bottom)
+                    ):
+                        result.add(item)
+
+        return result
+
+    def query_ray(
+            self, origin: Tuple[float, float], direction: Tuple[float, float], max_distance: float
+    ) -> Set[Hashable]:
+        """
+        Returns every item whose rect is entered by the provided ray before `max_distance` along it.
+        `direction` should be normalised
+        """
+
+        result = set()
+
+        if not self._nodes:
+            return result
+
+        nodes = self._nodes
+
+        node_indexes = [0]
+        while node_indexes:
+            node_left, node_top, node_right, node_bottom, children = nodes[node_indexes.pop()]
+
+            node_distance = Geometry.get_ray_rect_distance(
+                origin, direction, node_left, node_top, node_right, node_bottom
+            )
+            if (node_distance is None) or (node_distance > max_distance):
+                continue
+
+            if type(children) is tuple:
+                node_indexes.extend(children)
+            else:
+                for item in children:
+                    item_rect = self._rects[item]
+
+                    item_distance = Geometry.get_ray_rect_distance(
+                        origin, direction, item_rect.left, item_rect.top, item_rect.right, item_rect.bottom
+                    )
+                    if (item_distance is not None) and (item_distance <= max_distance):
+                        result.add(item)
+
+        return result
+
+    def _build_node(self, entries: List[Tuple[float, float, Hashable]]) -> int:
+        """
+        Recursively builds a node containing the provided entries, and returns that node's index
+        """
+
+        node_index = len(self._nodes)
+        self._nodes.append(None)  # Reserved, so that this node's index precedes its children's
+
+        bounds = self._rects[entries[0][2]].unionall([self._rects[entry[2]] for entry in entries[1:]])
+
+        if len(entries) <= self.LEAF_SIZE:
+            children = [entry[2] for entry in entries]
+        else:
+            # Entries are split in half along whichever axis their centres are most spread out on
+            x_spread = max(entry[0] for entry in entries) - min(entry[0] for entry in entries)
+            y_spread = max(entry[1] for entry in entries) - min(entry[1] for entry in entries)
+            axis = 0 if x_spread >= y_spread else 1
+
+            entries.sort(key=lambda entry: entry[axis])
+            split_index = len(entries) // 2
+
+            children = (self._build_node(entries[:split_index]), self._build_node(entries[split_index:]))
+
+        self._nodes[node_index] = (bounds.left, bounds.top, bounds.right, bounds.bottom, children)
+
+        return node_index
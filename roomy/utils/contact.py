@@ -0,0 +1,10 @@
+from typing import NamedTuple
+
+
+class Contact(NamedTuple):
+    """
+    Describes a collision detected between two hitboxes belonging to different Renderable objects
+    """
+
+    hitbox: "Hitbox"
+    other: "Hitbox"
@@ -13,6 +13,40 @@ class GameEventType(str, Enum):
     CHANGE_SCREEN = "change_screen"
     CHANGE_ROOM = "change_room"
 
+    CATCH_UP_TICKS_LIMITED = "catch_up_ticks_limited"
+    CATCH_UP_BUDGET_EXCEEDED = "catch_up_budget_exceeded"
+
+    PROFILER_SNAPSHOT = "profiler_snapshot"
+
+    PRELOAD_PROGRESS = "preload_progress"
+
+
+class CatchUpPolicy(str, Enum):
+    """
+    Constants representing how the game loop should treat any remaining backlog of ticks,
+    once it has stopped catching up early due to the limits set in the game's config
+    """
+
+    DROP = "drop"  # Discard the backlog, so that the game clock permanently falls behind real time
+    # Carry the backlog over into later loops, so that the game clock runs slow until it is able to catch up.
+    # The carried-over backlog is capped at the number of ticks that were just run, so that it cannot grow indefinitely
+    SLOW = "slow"
+
+
+class ProfilerMetric(str, Enum):
+    """
+    Constants representing the metrics recorded by FrameProfiler for each loop of the game
+    """
+
+    INPUT = "input"  # Time spent polling pygame for input events
+    TICK = "tick"  # Time spent updating the screen, per tick
+    SCREEN_FRAME = "screen_frame"  # Time spent in the screen's `.frame()` method
+    SCREEN_RENDER = "screen_render"  # Time spent in the screen's `.render()` method
+    DISPLAY_UPDATE = "display_update"  # Time spent in `pygame.display.update()`
+    COLLISION_PASS = "collision_pass"  # Time spent in the screen's collision pass, per tick (if it is enabled)
+
+    CATCH_UP_TICKS = "catch_up_ticks"  # Number of ticks run in a single loop (not a time value)
+
 
 class AnimationDataKey(str, Enum):
     """
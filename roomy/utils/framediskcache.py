@@ -0,0 +1,128 @@
+from pygame import Surface, Rect, image
+
+from os import path, makedirs, replace, remove, stat
+from hashlib import sha1
+from mmap import mmap, ACCESS_READ
+from struct import Struct
+from tempfile import mkstemp
+from typing import Optional
+
+
+class FrameDiskCache:
+    """
+    Stores decoded (and optionally cropped and scaled) images as raw pixel data in a folder on disk,
+    so that they can be loaded on later runs without being decoded and scaled again.
+
+    Each image is stored in its own file, consisting of a small header (dimensions, pitch and pixel format)
+    followed by its raw pixels. Files are memory-mapped when read, and are keyed by the source image's path,
+    modification time and file size along with the crop and scale applied, so that they are ignored
+    as soon as the source image changes.
+
+    Reading and writing are safe to do from multiple threads at once
+    """
+
+    FORMAT = "RGBA"  # Pixel format that images are stored in
+    HEADER = Struct("<4sHIII4s")  # Magic, version, width, height, pitch, pixel format
+    MAGIC = b"RMYF"
+    VERSION = 1
+
+    def __init__(self, folder_path: str):
+        """
+        `folder_path` is created if it does not already exist
+        """
+
+        self._folder_path = folder_path
+
+        makedirs(self._folder_path, exist_ok=True)
+
+    @property
+    def folder_path(self) -> str:
+        return self._folder_path
+
+    def get(
+            self, source_path: str, size: Optional[float] = None, sprite_rect: Optional[Rect] = None
+    ) -> Optional[Surface]:
+        """
+        Returns the stored image for the provided source image, crop and scale,
+        or None if no up-to-date image has been stored for them.
+        A `size` of None indicates that the image is unscaled, and a `sprite_rect` of None that it is uncropped
+        """
+
+        cache_file_path = self._get_cache_file_path(source_path, size, sprite_rect)
+        if cache_file_path is None:
+            return None
+
+        try:
+            with open(cache_file_path, "rb") as file, mmap(file.fileno(), 0, access=ACCESS_READ) as data:
+                return self._read(data)
+        except (FileNotFoundError, ValueError):  # mmap raises ValueError for empty files
+            return None
+
+    def put(
+            self, source_path: str, surface: Surface,
+            size: Optional[float] = None, sprite_rect: Optional[Rect] = None
+    ) -> None:
+        """
+        Stores the provided image as the result of applying the provided crop and scale to the source image
+        """
+
+        cache_file_path = self._get_cache_file_path(source_path, size, sprite_rect)
+        if cache_file_path is None:
+            return
+
+        width, height = surface.get_size()
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, width, height, width * 4, self.FORMAT.encode())
+
+        # Written to a temporary file first, so that partially written files are never read
+        file_descriptor, temp_file_path = mkstemp(dir=self._folder_path, suffix=".tmp")
+        try:
+            with open(file_descriptor, "wb") as file:
+                file.write(header)
+                file.write(image.tobytes(surface, self.FORMAT))
+
+            replace(temp_file_path, cache_file_path)
+        except BaseException:
+            remove(temp_file_path)
+            raise
+
+    def _read(self, data: mmap) -> Optional[Surface]:
+        if len(data) < self.HEADER.size:
+            return None
+
+        magic, version, width, height, pitch, pixel_format = self.HEADER.unpack_from(data)
+        if (
+                (magic != self.MAGIC) or (version != self.VERSION) or (pixel_format != self.FORMAT.encode()) or
+                (pitch != width * 4) or (len(data) != self.HEADER.size + (pitch * height))
+        ):
+            return None
+
+        pixels = memoryview(data)[self.HEADER.size:]
+        try:
+            # The surface created here shares the mapped memory, so it is converted to a standalone copy
+            # (in the display's pixel format) before the memory is unmapped
+            shared_surface = image.frombuffer(pixels, (width, height), self.FORMAT)
+            surface = shared_surface.convert_alpha()
+
+            del shared_surface
+        finally:
+            pixels.release()
+
+        return surface
+
+    def _get_cache_file_path(
+            self, source_path: str, size: Optional[float], sprite_rect: Optional[Rect]
+    ) -> Optional[str]:
+        """
+        Returns the path of the file which would store the provided source image, crop and scale,
+        or None if the source image does not exist
+        """
+
+        try:
+            source_stat = stat(source_path)
+        except FileNotFoundError:
+            return None
+
+        sprite_area = None if sprite_rect is None else tuple(sprite_rect)
+        key = f"{path.abspath(source_path)}|{source_stat.st_mtime_ns}|{source_stat.st_size}|{size}|{sprite_area}"
+
+        return path.join(self._folder_path, f"{sha1(key.encode()).hexdigest()}.frame")
@@ -0,0 +1,101 @@
+from typing import Dict, Deque
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+from math import ceil
+
+from .enums import ProfilerMetric
+
+
+class FrameProfiler:
+    """
+    Optional instrumentation for the game loop, which records how long each phase of the loop takes
+    (see ProfilerMetric for the full list of recorded metrics).
+
+    Samples are stored in fixed-size ring buffers, so that memory usage does not grow over long sessions.
+    While attached to a Game instance, a summary of the stored samples is periodically passed to any callbacks
+    registered to GameEventType.PROFILER_SNAPSHOT on the game's GameEventHandler
+    """
+
+    PERCENTILES = {
+        "p50": 0.5,
+        "p95": 0.95,
+        "p99": 0.99
+    }
+
+    def __init__(self, buffer_size: int = 600, snapshot_interval_ms: float = 1000):
+        self._buffer_size = buffer_size
+        self._snapshot_interval_ms = snapshot_interval_ms
+
+        self._samples: Dict[ProfilerMetric, Deque[float]] = {
+            metric: deque(maxlen=buffer_size) for metric in ProfilerMetric
+        }
+        self._last_snapshot_time = perf_counter()
+
+    @property
+    def buffer_size(self) -> int:
+        return self._buffer_size
+
+    @property
+    def snapshot_interval_ms(self) -> float:
+        return self._snapshot_interval_ms
+
+    @property
+    def is_snapshot_due(self) -> bool:
+        return ((perf_counter() - self._last_snapshot_time) * 1000) >= self._snapshot_interval_ms
+
+    @contextmanager
+    def measure(self, metric: ProfilerMetric):
+        """
+        Records the wall time taken by the code inside the `with` block, in ms, under the provided metric
+        """
+
+        start_time = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(metric, (perf_counter() - start_time) * 1000)
+
+    def record(self, metric: ProfilerMetric, value: float) -> None:
+        self._samples[metric].append(value)
+
+    def summary(self) -> Dict[ProfilerMetric, Dict[str, float]]:
+        """
+        Returns the p50, p95 and p99 values for each metric which currently has samples stored
+        """
+
+        result = {}
+        for metric, samples in self._samples.items():
+            if not samples:
+                continue
+
+            sorted_samples = sorted(samples)
+            result[metric] = {
+                percentile_key: self._get_percentile(sorted_samples, percentile)
+                for percentile_key, percentile in self.PERCENTILES.items()
+            }
+
+        return result
+
+    def snapshot(self) -> Dict[ProfilerMetric, Dict[str, float]]:
+        """
+        Returns a summary of the currently stored samples, and restarts the countdown until the next snapshot is due
+        """
+
+        self._last_snapshot_time = perf_counter()
+
+        return self.summary()
+
+    def clear(self) -> None:
+        for samples in self._samples.values():
+            samples.clear()
+
+    @staticmethod
+    def _get_percentile(sorted_samples: list, percentile: float) -> float:
+        """
+        Uses the nearest-rank method, so that the returned value is always one of the recorded samples
+        """
+
+        rank = max(ceil(percentile * len(sorted_samples)), 1)
+
+        return sorted_samples[rank - 1]
@@ -0,0 +1,185 @@
+try:
+    import numpy
+except ImportError:  # NumPy is an optional dependency, which is only required by this class
+    numpy = None
+
+from typing import Iterable, Tuple
+
+from ..hitboxes import RecurfaceHitbox
+
+
+class HitboxBatch:
+    """
+    Packs the absolute rects of a group of RecurfaceHitbox objects into contiguous NumPy arrays, so that collisions
+    across the whole group can be checked in a handful of vectorised operations rather than one call per pair.
+
+    Collisions are checked using the same rules as RecurfaceHitbox's own collision checker
+    (including for inverted hitboxes), and collisions between hitboxes with the same parent Renderable are excluded.
+    Pairs involving a continuous hitbox which do not collide as of the end of the tick are narrowed down by their
+    swept rects, and the remainder are checked individually via `Hitbox.get_time_of_impact()`.
+    A batch is a snapshot of its hitboxes' rects at the time it was created, and does not update if they move.
+
+    Requires NumPy to be installed
+    """
+
+    # Maximum number of hitboxes checked against the rest of the batch at once by `.collision_pairs()`,
+    # to limit the size of the intermediate arrays
+    PAIRS_BLOCK_SIZE = 512
+
+    def __init__(self, hitboxes: Iterable[RecurfaceHitbox]):
+        if numpy is None:
+            raise ImportError(f"{type(self).__name__} requires NumPy to be installed")
+
+        # Hitboxes which do not currently occupy any area are excluded
+        self._hitboxes: Tuple[RecurfaceHitbox, ...] = tuple(
+            hitbox for hitbox in hitboxes if hitbox.absolute_rect is not None
+        )
+
+        bounds = numpy.array(
+            [
+                (hitbox.absolute_rect.left, hitbox.absolute_rect.top,
+                 hitbox.absolute_rect.right, hitbox.absolute_rect.bottom)
+                for hitbox in self._hitboxes
+            ],
+            dtype=numpy.int64
+        ).reshape(-1, 4)
+
+        self._lefts = numpy.ascontiguousarray(bounds[:, 0])
+        self._tops = numpy.ascontiguousarray(bounds[:, 1])
+        self._rights = numpy.ascontiguousarray(bounds[:, 2])
+        self._bottoms = numpy.ascontiguousarray(bounds[:, 3])
+
+        swept_bounds = numpy.array(
+            [
+                (hitbox.swept_rect.left, hitbox.swept_rect.top, hitbox.swept_rect.right, hitbox.swept_rect.bottom)
+                for hitbox in self._hitboxes
+            ],
+            dtype=numpy.int64
+        ).reshape(-1, 4)
+
+        self._swept_lefts = numpy.ascontiguousarray(swept_bounds[:, 0])
+        self._swept_tops = numpy.ascontiguousarray(swept_bounds[:, 1])
+        self._swept_rights = numpy.ascontiguousarray(swept_bounds[:, 2])
+        self._swept_bottoms = numpy.ascontiguousarray(swept_bounds[:, 3])
+
+        self._is_inverted = numpy.array([hitbox.is_inverted for hitbox in self._hitboxes], dtype=bool)
+        self._is_continuous = numpy.array([hitbox.is_continuous for hitbox in self._hitboxes], dtype=bool)
+        self._parent_ids = numpy.array([id(hitbox.parent_renderable) for hitbox in self._hitboxes], dtype=numpy.int64)
+
+    @property
+    def hitboxes(self) -> Tuple[RecurfaceHitbox, ...]:
+        """
+        The hitboxes in this batch. Indexes returned by this batch's methods refer to positions in this tuple
+        """
+
+        return self._hitboxes
+
+    def __len__(self) -> int:
+        return len(self._hitboxes)
+
+    def collisions_with(self, hitbox: RecurfaceHitbox) -> "numpy.ndarray":
+        """
+        Returns the indexes of every hitbox in this batch which is colliding with the provided hitbox
+        """
+
+        rect = hitbox.absolute_rect
+        if rect is None:
+            return numpy.empty(0, dtype=numpy.intp)
+
+        lefts, tops, rights, bottoms = self._lefts, self._tops, self._rights, self._bottoms
+
+        if hitbox.is_inverted:
+            # Collides with anything not fully inside it
+            is_contained = (rect.left <= lefts) & (rights <= rect.right) & (rect.top <= tops) & (bottoms <= rect.bottom)
+            result = self._is_inverted | ~is_contained
+        else:
+            is_overlapping = (lefts < rect.right) & (rect.left < rights) & (tops < rect.bottom) & (rect.top < bottoms)
+            is_containing = (lefts <= rect.left) & (rect.right <= rights) & (tops <= rect.top) & (rect.bottom <= bottoms)
+            result = numpy.where(self._is_inverted, ~is_containing, is_overlapping)
+
+        result &= (self._parent_ids != id(hitbox.parent_renderable))
+        result[self._get_swept_collisions(hitbox, result)] = True
+
+        return numpy.flatnonzero(result)
+
+    def collision_pairs(self) -> "numpy.ndarray":
+        """
+        Returns an array of shape (n, 2), where each row holds the indexes of two colliding hitboxes in this batch.
+        Each colliding pair is included exactly once, with the lower index first
+        """
+
+        hitboxes_count = len(self._hitboxes)
+        column_indexes = numpy.arange(hitboxes_count)
+
+        result = [numpy.empty((0, 2), dtype=numpy.intp)]
+        for block_start in range(0, hitboxes_count, self.PAIRS_BLOCK_SIZE):
+            block = slice(block_start, block_start + self.PAIRS_BLOCK_SIZE)
+
+            # Block values are reshaped into columns, so that they broadcast against every hitbox in the batch
+            row_lefts, row_tops = self._lefts[block, None], self._tops[block, None]
+            row_rights, row_bottoms = self._rights[block, None], self._bottoms[block, None]
+            row_is_inverted = self._is_inverted[block, None]
+
+            lefts, tops, rights, bottoms = self._lefts, self._tops, self._rights, self._bottoms
+
+            is_overlapping = (row_lefts < rights) & (lefts < row_rights) & (row_tops < bottoms) & (tops < row_bottoms)
+            row_contains = (row_lefts <= lefts) & (rights <= row_rights) & (row_tops <= tops) & (bottoms <= row_bottoms)
+            row_is_contained = (
+                (lefts <= row_lefts) & (row_rights <= rights) & (tops <= row_tops) & (row_bottoms <= bottoms)
+            )
+
+            is_colliding = numpy.where(
+                row_is_inverted,
+                self._is_inverted | ~row_contains,
+                numpy.where(self._is_inverted, ~row_is_contained, is_overlapping)
+            )
+            is_colliding &= (self._parent_ids[block, None] != self._parent_ids)
+            is_colliding &= (column_indexes[block, None] < column_indexes)  # Each pair is only included once
+
+            block_pairs = numpy.argwhere(is_colliding)
+            block_pairs[:, 0] += block_start
+            result.append(block_pairs)
+
+        continuous_indexes = numpy.flatnonzero(self._is_continuous)
+        if not len(continuous_indexes):
+            return numpy.concatenate(result)
+
+        # Pairs which only collided partway through the tick are added by checking each continuous hitbox in turn,
+        # and then any pairs found more than once are merged
+        for index in continuous_indexes:
+            other_indexes = self.collisions_with(self._hitboxes[index])
+            result.append(numpy.sort(
+                numpy.column_stack((numpy.full(len(other_indexes), index), other_indexes)), axis=1
+            ))
+
+        return numpy.unique(numpy.concatenate(result), axis=0)
+
+    def _get_swept_collisions(self, hitbox: RecurfaceHitbox, is_colliding: "numpy.ndarray") -> "numpy.ndarray":
+        """
+        Returns the indexes of every hitbox in this batch which is not already flagged in `is_colliding`,
+        but which collided with the provided hitbox partway through the current tick because either of them
+        is continuous
+        """
+
+        is_candidate = ~is_colliding & (self._parent_ids != id(hitbox.parent_renderable))
+        if not hitbox.is_continuous:
+            is_candidate &= self._is_continuous
+
+        if not is_candidate.any():
+            return numpy.empty(0, dtype=numpy.intp)
+
+        if not hitbox.is_inverted:
+            # Inverted hitboxes cannot be ruled out by area, as they collide with anything outside of them
+            rect = hitbox.swept_rect
+            is_candidate &= self._is_inverted | (
+                (self._swept_lefts < rect.right) & (rect.left < self._swept_rights) &
+                (self._swept_tops < rect.bottom) & (rect.top < self._swept_bottoms)
+            )
+
+        return numpy.array(
+            [
+                index for index in numpy.flatnonzero(is_candidate)
+                if hitbox.get_time_of_impact(self._hitboxes[index]) is not None
+            ],
+            dtype=numpy.intp
+        )
@@ -1,16 +1,55 @@
-from typing import Set, FrozenSet, Optional, Callable, Iterable, Union
+from pygame import Rect
 
-from ..hitboxes import Hitbox
+from itertools import count
+from typing import Set, FrozenSet, Dict, List, Optional, Callable, Iterable, Union, Iterator, Tuple
+
+from ..hitboxes import Hitbox, RecurfaceHitbox
+from .spatialhash import SpatialHash
+from .sweepandprune import SweepAndPrune
+from .hitboxbatch import HitboxBatch
+from .hitboxtagindex import HitboxTagIndex
+from .boundingvolumehierarchy import BoundingVolumeHierarchy
+from .raycasthit import RaycastHit
+from .contact import Contact
 
 
 class HitboxManager:
-    def __init__(self):
+    def __init__(self, tag_index: HitboxTagIndex, cell_size: int = 64):
+        self._tag_index = tag_index
 
         self._hitboxes = set()
-        self._hitboxes_by_tag = {}
+        # Assigned to hitboxes in the order they are added, so that contacts can be ordered deterministically
+        self._sequence_numbers: Dict[Hitbox, int] = {}
+        self._sequence_number_counter = count()
+        self._hitboxes_by_tag_bit: Dict[int, Set[Hitbox]] = {}
+
+        # Results of tag-based queries, keyed by (tags_any mask, tags_all mask).
+        # Cleared whenever hitboxes are added or removed, and at the end of each tick
+        self._query_cache: Dict[Tuple[Optional[int], int], FrozenSet[Hitbox]] = {}
 
         self._checked_collisions = set()
 
+        # Bounded hitboxes are stored in the spatial hash by area, any others are stored separately
+        self._spatial_hash = SpatialHash(cell_size)
+        self._unbounded_hitboxes = set()
+        # Hitboxes which need to be placed in the spatial hash again before it is next queried
+        self._moved_hitboxes = set()
+
+        self._sweep_and_prune = SweepAndPrune(self._get_bounded_rect)
+
+        # Hitboxes belonging to objects which are currently at rest are not paired with each other,
+        # or with static hitboxes
+        self._resting_hitboxes = set()
+
+        # Continuous hitboxes are placed in the above structures by their swept rects instead of their absolute rects
+        self._continuous_hitboxes = set()
+
+        # Bounded static hitboxes are stored in a BVH instead of the above structures,
+        # which is rebuilt before the next area-based query whenever static hitboxes are added, removed or moved
+        self._static_hitboxes = set()
+        self._static_bvh = BoundingVolumeHierarchy()
+        self._is_static_bvh_outdated = False
+
     @property
     def checked_collisions(self) -> Set[FrozenSet[Union[Hitbox, "Renderable.with_extensions(Hitboxed)"]]]:
         """
@@ -21,24 +60,87 @@ class HitboxManager:
         return self._checked_collisions
 
     def add(self, hitbox: Hitbox) -> None:
-        for tag in hitbox.tags:
-            if tag not in self._hitboxes_by_tag:
-                self._hitboxes_by_tag[tag] = set()
+        for tag_bit in self._tag_index.iter_bits(hitbox.tag_mask):
+            if tag_bit not in self._hitboxes_by_tag_bit:
+                self._hitboxes_by_tag_bit[tag_bit] = set()
 
-            self._hitboxes_by_tag[tag].add(hitbox)
+            self._hitboxes_by_tag_bit[tag_bit].add(hitbox)
 
         self._hitboxes.add(hitbox)
+        self._sequence_numbers[hitbox] = next(self._sequence_number_counter)
+        self._query_cache.clear()
+        self._moved_hitboxes.add(hitbox)
+
+        if hitbox.is_static:
+            self._static_hitboxes.add(hitbox)
+        else:
+            self._sweep_and_prune.add(hitbox)
+
+        if hitbox.is_continuous:
+            self._continuous_hitboxes.add(hitbox)
 
     def remove(self, hitbox: Hitbox) -> None:
-        for tag in hitbox.tags:
-            self._hitboxes_by_tag[tag].remove(hitbox)
+        for tag_bit in self._tag_index.iter_bits(hitbox.tag_mask):
+            self._hitboxes_by_tag_bit[tag_bit].remove(hitbox)
 
         self._hitboxes.remove(hitbox)
+        del self._sequence_numbers[hitbox]
+        self._query_cache.clear()
+
+        self._unbounded_hitboxes.discard(hitbox)
+        self._moved_hitboxes.discard(hitbox)
+        self._continuous_hitboxes.discard(hitbox)
+        self._resting_hitboxes.discard(hitbox)
+
+        if hitbox.is_static:
+            self._static_hitboxes.remove(hitbox)
+            if hitbox in self._static_bvh:
+                self._is_static_bvh_outdated = True
+        else:
+            self._spatial_hash.remove(hitbox)
+            self._sweep_and_prune.remove(hitbox)
+
+    def flag_bounds_changed(self, hitbox: Hitbox) -> None:
+        """
+        Marks the provided hitbox as needing to be placed in the spatial hash (or the static BVH, for static hitboxes)
+        again before the next area-based query.
+        Hitboxes which are not stored in this manager are ignored
+        """
+
+        if hitbox in self._hitboxes:
+            self._moved_hitboxes.add(hitbox)
+
+    def set_resting(self, hitbox: Hitbox, is_resting: bool) -> None:
+        """
+        Marks the provided hitbox as belonging to an object which is currently at rest (or not).
+        Pairs of hitboxes which are each either resting or static are skipped by `.candidate_pairs()`,
+        as neither hitbox can have moved into the other.
+        Hitboxes which are not stored in this manager are ignored
+        """
+
+        if hitbox not in self._hitboxes:
+            return
+
+        if is_resting:
+            self._resting_hitboxes.add(hitbox)
+        else:
+            self._resting_hitboxes.discard(hitbox)
+
+    def store_previous_rects(self) -> None:
+        """
+        Stores the current absolute rect of each continuous hitbox as its previous absolute rect.
+        Should be invoked at the start of each tick, before anything has moved
+        """
+
+        for hitbox in self._continuous_hitboxes:
+            hitbox.store_previous_absolute_rect()
+            self._moved_hitboxes.add(hitbox)
 
     def get(
             self,
             tags_any: Optional[Iterable[str]] = None, tags_all: Optional[Iterable[str]] = None,
-            custom_filter_key: Optional[Callable] = None
+            custom_filter_key: Optional[Callable] = None,
+            near: Optional[Hitbox] = None, rect: Optional[Rect] = None
     ) -> FrozenSet[Hitbox]:
         """
         This is a querying method to retrieve a subsection of hitboxes in order to optimise collision checking.
@@ -46,33 +148,399 @@ class HitboxManager:
         of which all must be present in each returned hitbox and custom_filter_key will be used to further narrow
         down the results as a more specific filter key.
 
+        near and rect narrow down the results by area, using the spatial hash:
+        - near will only return hitboxes which are close enough to the provided hitbox that they may be colliding with it
+          (not including the provided hitbox itself, or any hitboxes which Config.HITBOX_TAG_COLLISION_MATRIX
+          does not allow it to collide with)
+        - rect will only return hitboxes whose absolute rects overlap the provided rect
+        Unbounded hitboxes (such as inverted hitboxes) are not narrowed down by area, and so can always be returned
+        by these two parameters.
+
         If None is provided for each of these parameters, they are simply not used to filter hitboxes down.
-        Therefore, providing None for all parameters will result in every hitbox being returned
-        """
+        Therefore, providing None for all parameters will result in every hitbox being returned.
 
-        if tags_any is None:
-            result = set(self._hitboxes)
-        else:
-            result = set()
+        Tag-based results are cached until hitboxes are next added or removed, or the current tick ends
+        """
 
-            for tag_to_include in tags_any:
-                for hitbox_with_tag_to_include in self._hitboxes_by_tag[tag_to_include]:
-                    result.add(hitbox_with_tag_to_include)
+        result = self._get_tagged(tags_any, tags_all)
 
-        if tags_all is None:
-            pass
-        else:
-            hitbox_has_required_tags = lambda hitbox: all(
-                required_tag in hitbox.tags for required_tag in tags_all
-            )
-            result = filter(hitbox_has_required_tags, result)
+        if (near is not None) or (rect is not None):
+            result = result & self._get_region(near, rect)
 
         if custom_filter_key is not None:
             result = frozenset(filter(custom_filter_key, result))
+
+        return result
+
+    def candidate_pairs(
+            self,
+            tags_any: Optional[Iterable[str]] = None, tags_all: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[Hitbox, Hitbox]]:
+        """
+        Yields every pair of hitboxes which may be colliding, out of those matching the provided tag filters
+        (which behave as they do in `.get()`). Pairs are found by sweep-and-prune over the hitboxes' absolute rects
+        (or swept rects, for continuous hitboxes), with unbounded hitboxes paired against every other matching hitbox.
+        Static hitboxes are paired with dynamic hitboxes by querying the static BVH, and are never paired
+        with each other. Similarly, resting hitboxes (see `.set_resting()`) are not paired with static hitboxes
+        or with each other.
+
+        Each pair is yielded exactly once, and pairs of hitboxes belonging to the same Renderable are skipped,
+        as are pairs which Config.HITBOX_TAG_COLLISION_MATRIX does not allow to collide.
+        This means collisions between the yielded hitboxes can be checked via `Hitbox.test_collision()` directly,
+        without needing `.checked_collisions` to prevent duplicate checks
+        """
+
+        included_hitboxes = self.get(tags_any=tags_any, tags_all=tags_all)
+
+        self._place_moved_hitboxes()
+
+        is_collision_possible = self._tag_index.is_collision_possible
+        resting_hitboxes = self._resting_hitboxes
+
+        for hitbox, other in self._sweep_and_prune.iter_pairs(included_hitboxes.__contains__):
+            if hitbox.parent_renderable is other.parent_renderable:
+                continue
+            if (hitbox in resting_hitboxes) and (other in resting_hitboxes):
+                continue
+            if not is_collision_possible(hitbox, other):
+                continue
+
+            yield hitbox, other
+
+        if len(self._static_bvh):
+            for hitbox in included_hitboxes:
+                if hitbox not in self._spatial_hash:
+                    continue  # Only bounded dynamic hitboxes which currently occupy an area are paired via the BVH
+                if hitbox in resting_hitboxes:
+                    continue
+
+                for other in self._static_bvh.query(hitbox.swept_rect):
+                    if other not in included_hitboxes:
+                        continue
+                    if hitbox.parent_renderable is other.parent_renderable:
+                        continue
+                    if not is_collision_possible(hitbox, other):
+                        continue
+
+                    yield hitbox, other
+
+        paired_unbounded_hitboxes = set()
+        for hitbox in self._unbounded_hitboxes & included_hitboxes:
+            paired_unbounded_hitboxes.add(hitbox)
+
+            for other in included_hitboxes:
+                if other in paired_unbounded_hitboxes:
+                    continue
+                if not self._is_placed(other):
+                    continue  # Hitboxes which do not currently occupy any area are excluded
+                if (hitbox.is_static or (hitbox in resting_hitboxes)) and (other.is_static or (other in resting_hitboxes)):
+                    continue
+                if hitbox.parent_renderable is other.parent_renderable:
+                    continue
+                if not is_collision_possible(hitbox, other):
+                    continue
+
+                yield hitbox, other
+
+    def find_contacts(
+            self,
+            tags_any: Optional[Iterable[str]] = None, tags_all: Optional[Iterable[str]] = None,
+            involving: Optional[Iterable[Hitbox]] = None
+    ) -> List[Contact]:
+        """
+        Checks every pair from `.candidate_pairs()` for a collision, and returns a contact for each pair of
+        Renderable objects found to be colliding. If multiple hitboxes of the same two objects are colliding,
+        only the first such pair of hitboxes is included.
+
+        If `involving` is provided, only pairs which include at least one of those hitboxes are checked.
+        These pairs are found by querying the area around each provided hitbox instead of sweeping over every hitbox,
+        so that only a small group of hitboxes (such as those of a PhysicsSystem's entities) can be checked cheaply.
+
+        Contacts are ordered by the sequence in which their hitboxes were added to this manager,
+        and so do not depend on set iteration order
+        """
+
+        sequence_numbers = self._sequence_numbers
+
+        if involving is None:
+            pairs = self.candidate_pairs(tags_any=tags_any, tags_all=tags_all)
         else:
-            result = frozenset(result)
+            pairs = self._iter_pairs_involving(involving, self.get(tags_any=tags_any, tags_all=tags_all))
+
+        ordered_pairs = []
+        for hitbox, other in pairs:
+            if sequence_numbers[hitbox] > sequence_numbers[other]:
+                hitbox, other = other, hitbox
+
+            ordered_pairs.append((sequence_numbers[hitbox], sequence_numbers[other], hitbox, other))
+
+        ordered_pairs.sort(key=lambda ordered_pair: (ordered_pair[0], ordered_pair[1]))
+
+        result = []
+        colliding_parents = set()
+        for _, _, hitbox, other in ordered_pairs:
+            # Ordered by id, so that the same two objects always produce the same key without building a frozenset
+            parent_id, other_parent_id = id(hitbox.parent_renderable), id(other.parent_renderable)
+            parents_key = (parent_id, other_parent_id) if parent_id < other_parent_id else (other_parent_id, parent_id)
+            if parents_key in colliding_parents:
+                continue
+
+            if hitbox.test_collision(other):
+                colliding_parents.add(parents_key)
+                result.append(Contact(hitbox, other))
 
         return result
 
+    def raycast(
+            self,
+            origin: Tuple[float, float], direction: Tuple[float, float], max_distance: float,
+            tags_any: Optional[Iterable[str]] = None, tags_all: Optional[Iterable[str]] = None,
+            custom_filter_key: Optional[Callable] = None
+    ) -> Optional[RaycastHit]:
+        """
+        Returns the nearest hitbox hit by the provided ray within `max_distance` of its origin, out of those matching
+        the provided filters (which behave as they do in `.get()`), or None if no such hitbox is hit.
+        `direction` does not need to be normalised, but must not be (0, 0).
+
+        Candidate hitboxes are retrieved by walking the ray through the spatial hash and the static BVH,
+        and are then tested individually via `Hitbox.get_ray_distance()`
+        """
+
+        hits = self._get_ray_hits(origin, direction, max_distance, tags_any, tags_all, custom_filter_key)
+
+        return min(hits, key=lambda hit: hit.distance, default=None)
+
+    def segment_query(
+            self,
+            start: Tuple[float, float], end: Tuple[float, float],
+            tags_any: Optional[Iterable[str]] = None, tags_all: Optional[Iterable[str]] = None,
+            custom_filter_key: Optional[Callable] = None
+    ) -> List[RaycastHit]:
+        """
+        Returns a hit for every hitbox which the line segment between the provided points passes through,
+        out of those matching the provided filters (which behave as they do in `.get()`), ordered by distance from
+        `start`
+        """
+
+        offset = (end[0] - start[0], end[1] - start[1])
+        length = ((offset[0] ** 2) + (offset[1] ** 2)) ** 0.5
+
+        # A zero-length segment only hits hitboxes that contain its start point, which any direction can detect
+        direction = offset if length else (1, 0)
+
+        hits = self._get_ray_hits(start, direction, length, tags_any, tags_all, custom_filter_key)
+
+        return sorted(hits, key=lambda hit: hit.distance)
+
+    def has_line_of_sight(
+            self,
+            start: Tuple[float, float], end: Tuple[float, float],
+            tags_any: Optional[Iterable[str]] = None, tags_all: Optional[Iterable[str]] = None,
+            custom_filter_key: Optional[Callable] = None
+    ) -> bool:
+        """
+        Checks that the line segment between the provided points does not pass through any hitboxes
+        matching the provided filters (which behave as they do in `.get()`)
+        """
+
+        return not self.segment_query(
+            start, end, tags_any=tags_any, tags_all=tags_all, custom_filter_key=custom_filter_key
+        )
+
+    def batch(
+            self,
+            tags_any: Optional[Iterable[str]] = None, tags_all: Optional[Iterable[str]] = None,
+            custom_filter_key: Optional[Callable] = None
+    ) -> HitboxBatch:
+        """
+        Packs every RecurfaceHitbox matching the provided filters (which behave as they do in `.get()`)
+        into a HitboxBatch, so that collisions between them can be checked in bulk using NumPy
+        """
+
+        return HitboxBatch(
+            hitbox for hitbox in self.get(tags_any=tags_any, tags_all=tags_all, custom_filter_key=custom_filter_key)
+            if isinstance(hitbox, RecurfaceHitbox)
+        )
+
     def reset_checked_collisions(self) -> None:
-        self._checked_collisions = set()
+        self._checked_collisions.clear()
+
+    def clear_query_cache(self) -> None:
+        self._query_cache.clear()
+
+    def _get_tagged(self, tags_any: Optional[Iterable[str]], tags_all: Optional[Iterable[str]]) -> FrozenSet[Hitbox]:
+        """
+        Returns the hitboxes which match the tag-based parameters accepted by `.get()`
+        """
+
+        any_mask = None if tags_any is None else self._tag_index.get_mask(tags_any)
+        all_mask = self._tag_index.get_mask(tags_all)
+
+        cache_key = (any_mask, all_mask)
+        if cache_key in self._query_cache:
+            return self._query_cache[cache_key]
+
+        if any_mask is None:
+            result = self._hitboxes
+        else:
+            result = set()
+            for tag_bit in self._tag_index.iter_bits(any_mask):
+                result.update(self._hitboxes_by_tag_bit.get(tag_bit, ()))
+
+        if all_mask:
+            result = (hitbox for hitbox in result if (hitbox.tag_mask & all_mask) == all_mask)
+
+        result = frozenset(result)
+        self._query_cache[cache_key] = result
+
+        return result
+
+    def _get_ray_hits(
+            self,
+            origin: Tuple[float, float], direction: Tuple[float, float], max_distance: float,
+            tags_any: Optional[Iterable[str]], tags_all: Optional[Iterable[str]],
+            custom_filter_key: Optional[Callable]
+    ) -> List[RaycastHit]:
+        """
+        Returns an unordered hit for every hitbox matching the provided filters that the provided ray hits
+        within `max_distance` of its origin
+        """
+
+        direction_length = ((direction[0] ** 2) + (direction[1] ** 2)) ** 0.5
+        if direction_length == 0:
+            raise ValueError("ray direction must not be (0, 0)")
+
+        direction = (direction[0] / direction_length, direction[1] / direction_length)
+
+        self._place_moved_hitboxes()
+
+        candidates = self._spatial_hash.query_ray(origin, direction, max_distance)
+        candidates.update(self._static_bvh.query_ray(origin, direction, max_distance))
+        candidates.update(self._unbounded_hitboxes)
+
+        candidates &= self._get_tagged(tags_any, tags_all)
+        if custom_filter_key is not None:
+            candidates = filter(custom_filter_key, candidates)
+
+        result = []
+        for hitbox in candidates:
+            distance = hitbox.get_ray_distance(origin, direction)
+
+            if (distance is not None) and (distance <= max_distance):
+                point = (origin[0] + (direction[0] * distance), origin[1] + (direction[1] * distance))
+                result.append(RaycastHit(hitbox, distance, point))
+
+        return result
+
+    def _iter_pairs_involving(
+            self, involving: Iterable[Hitbox], included_hitboxes: FrozenSet[Hitbox]
+    ) -> Iterator[Tuple[Hitbox, Hitbox]]:
+        """
+        Yields each pair that `.candidate_pairs()` would yield out of `included_hitboxes`
+        which includes at least one of the hitboxes in `involving`
+        """
+
+        self._place_moved_hitboxes()
+
+        static_hitboxes = self._static_hitboxes
+        resting_hitboxes = self._resting_hitboxes
+
+        paired_hitboxes = set()
+        for hitbox in involving:
+            if (hitbox in paired_hitboxes) or (hitbox not in included_hitboxes):
+                continue
+            if not self._is_placed(hitbox):
+                continue  # Hitboxes which do not currently occupy any area are excluded
+
+            paired_hitboxes.add(hitbox)
+            is_hitbox_inactive = (hitbox in static_hitboxes) or (hitbox in resting_hitboxes)
+
+            for other in self._get_region(hitbox, None):  # Also applies the collision matrix
+                if (other in paired_hitboxes) or (other not in included_hitboxes):
+                    continue
+                if not self._is_placed(other):
+                    continue
+                if is_hitbox_inactive and ((other in static_hitboxes) or (other in resting_hitboxes)):
+                    continue
+                if hitbox.parent_renderable is other.parent_renderable:
+                    continue
+
+                yield hitbox, other
+
+    def _get_region(self, near: Optional[Hitbox], rect: Optional[Rect]) -> Set[Hitbox]:
+        """
+        Returns the hitboxes which match the area-based parameters accepted by `.get()`
+        """
+
+        self._place_moved_hitboxes()
+
+        result = None
+
+        if near is not None:
+            near_rect = near.swept_rect
+
+            if not near.is_bounded:
+                result = set(self._hitboxes)  # Cannot be narrowed down by area
+            elif near_rect is None:
+                result = set(self._unbounded_hitboxes)
+            else:
+                result = self._spatial_hash.query(near_rect)
+                result.update(self._static_bvh.query(near_rect))
+                result.update(self._unbounded_hitboxes)
+
+            result.discard(near)
+
+            if self._tag_index.has_collision_matrix:
+                result = set(hitbox for hitbox in result if self._tag_index.is_collision_possible(near, hitbox))
+
+        if rect is not None:
+            rect_result = set(self._unbounded_hitboxes)
+            for hitbox in self._spatial_hash.query(rect):
+                if hitbox.absolute_rect.colliderect(rect):
+                    rect_result.add(hitbox)
+            rect_result.update(self._static_bvh.query(rect))
+
+            result = rect_result if result is None else (result & rect_result)
+
+        return result
+
+    def _place_moved_hitboxes(self) -> None:
+        for hitbox in self._moved_hitboxes:
+            hitbox_rect = hitbox.swept_rect
+
+            if hitbox.is_static:
+                if hitbox.is_bounded:
+                    self._unbounded_hitboxes.discard(hitbox)
+                    self._is_static_bvh_outdated = True
+                else:
+                    self._unbounded_hitboxes.add(hitbox)
+                    self._is_static_bvh_outdated |= hitbox in self._static_bvh
+            elif not hitbox.is_bounded:
+                self._spatial_hash.remove(hitbox)
+                self._unbounded_hitboxes.add(hitbox)
+            elif hitbox_rect is None:  # Hitboxes which do not currently occupy any area are excluded
+                self._spatial_hash.remove(hitbox)
+                self._unbounded_hitboxes.discard(hitbox)
+            else:
+                self._unbounded_hitboxes.discard(hitbox)
+                self._spatial_hash.set(hitbox, hitbox_rect)
+
+        self._moved_hitboxes.clear()
+
+        if self._is_static_bvh_outdated:
+            self._static_bvh = BoundingVolumeHierarchy(
+                (hitbox, hitbox.absolute_rect) for hitbox in self._static_hitboxes
+                if hitbox.is_bounded and (hitbox.absolute_rect is not None)
+            )
+            self._is_static_bvh_outdated = False
+
+    def _is_placed(self, hitbox: Hitbox) -> bool:
+        """
+        Checks whether the provided hitbox currently occupies any area, as of the most recent placement
+        """
+
+        return (hitbox in self._spatial_hash) or (hitbox in self._static_bvh) or (hitbox in self._unbounded_hitboxes)
+
+    @staticmethod
+    def _get_bounded_rect(hitbox: Hitbox) -> Optional[Rect]:
+        return hitbox.swept_rect if hitbox.is_bounded else None
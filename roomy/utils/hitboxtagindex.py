@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, Iterator, Optional
+
+
+class HitboxTagIndex:
+    """
+    Interns each valid hitbox tag (from Config.HITBOX_TAGS) to its own bit position,
+    so that sets of tags can be represented and compared as integer bitmasks.
+
+    Also stores which tags are able to collide with each other, as defined by Config.HITBOX_TAG_COLLISION_MATRIX
+    """
+
+    def __init__(self, game):
+        self._game = game
+
+        # Sorted so that the bit assigned to each tag does not depend on set iteration order
+        self._tag_bits: Dict[str, int] = {
+            tag: 1 << bit_position
+            for bit_position, tag in enumerate(sorted(self._game.config.HITBOX_TAGS))
+        }
+
+        collision_matrix = self._game.config.HITBOX_TAG_COLLISION_MATRIX
+        self._has_collision_matrix = collision_matrix is not None
+
+        # Maps each tag's bit to a mask of the tags it is able to collide with
+        self._collision_masks: Dict[int, int] = {tag_bit: 0 for tag_bit in self._tag_bits.values()}
+        if self._has_collision_matrix:
+            for tag, other_tags in collision_matrix.items():
+                tag_bit = self.get_mask((tag,))
+                other_tags_mask = self.get_mask(other_tags)
+
+                # Entries are symmetric, so each listed pair is stored in both directions
+                self._collision_masks[tag_bit] |= other_tags_mask
+                for other_tag_bit in self.iter_bits(other_tags_mask):
+                    self._collision_masks[other_tag_bit] |= tag_bit
+
+    @property
+    def has_collision_matrix(self) -> bool:
+        return self._has_collision_matrix
+
+    def get_mask(self, tags: Optional[Iterable[str]]) -> int:
+        """
+        Returns a bitmask representing the provided tags. None is treated as an empty collection of tags
+        """
+
+        mask = 0
+
+        for tag in (tags or ()):
+            try:
+                mask |= self._tag_bits[tag]
+            except KeyError:
+                raise ValueError(f"invalid tag provided: {tag}")
+
+        return mask
+
+    def get_collision_mask(self, tag_mask: int) -> int:
+        """
+        Returns a bitmask of every tag that an object with the provided tags is able to collide with,
+        according to the collision matrix
+        """
+
+        collision_mask = 0
+
+        for tag_bit in self.iter_bits(tag_mask):
+            collision_mask |= self._collision_masks[tag_bit]
+
+        return collision_mask
+
+    def is_collision_possible(self, hitbox: "Hitbox", other: "Hitbox") -> bool:
+        """
+        Checks whether the collision matrix allows the two provided hitboxes to collide.
+        If no collision matrix has been configured, every pair of hitboxes is able to collide
+        """
+
+        if not self._has_collision_matrix:
+            return True
+
+        return bool(hitbox.collision_mask & other.tag_mask)
+
+    @staticmethod
+    def iter_bits(mask: int) -> Iterator[int]:
+        """
+        Yields each individual set bit in the provided mask, from lowest to highest
+        """
+
+        while mask:
+            lowest_bit = mask & -mask
+            yield lowest_bit
+
+            mask ^= lowest_bit
@@ -0,0 +1,462 @@
+try:
+    import numpy
+except ImportError:  # NumPy is an optional dependency, which is only required by this class
+    numpy = None
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .contact import Contact
+
+
+class PhysicsSystem:
+    """
+    Moves a group of Entity objects according to their velocities and accelerations, integrating all of them
+    in a single vectorised step per tick rather than each entity moving itself in its own `._update()`.
+
+    The positions, velocities, accelerations and masses of the entities are stored in NumPy arrays,
+    which persist between steps so that no per-entity values need to be gathered at the start of each one:
+    - Velocities are owned by this system. Each entity's velocity is initialised from its speed stats when it is added,
+      and can be changed afterwards via `.set_velocity()` and `.apply_impulse()`
+    - Accelerations and masses are read from each entity's stats when it is added. Stats do not notify anything
+      when they change, so `.flag_stats_changed()` should be invoked after modifying an entity's acceleration or mass
+    - Positions are read from each entity when it is added, and again whenever the entity notifies this system
+      that it has been moved by other code (see `.flag_moved()`, which Entity invokes automatically).
+      As a fallback, any stored position which no longer matches its entity is also re-read at the start of each step.
+      After each step, only entities which actually moved have their render position set
+
+    If a hitbox manager is provided to `.step()`, collisions involving the entities are also resolved
+    (see `._resolve_contact()`), and groups of touching entities (islands) which have come to rest
+    while supported by an immovable object are put to sleep.
+    Sleeping entities are not integrated, and their hitboxes are not checked for collisions against each other
+    or against static hitboxes, until their island is woken again by being disturbed.
+
+    Speeds are in pixels per second, and accelerations are in pixels per second squared.
+    Requires NumPy to be installed
+    """
+
+    SOLVER_ITERATIONS = 4  # Number of passes made over each step's contacts, so that stacked entities settle
+    CONTACT_SLOP = 1  # Overlap in pixels which is left between entities in contact, so that their contact persists
+
+    def __init__(
+            self, capacity: int = 16,
+            restitution: float = 0,
+            sleep_speed: float = 2, sleep_acceleration: float = 20, sleep_delay_ms: float = 500
+    ):
+        """
+        `restitution` determines how much of the entities' approaching speed is retained when they collide,
+        from 0 (none) to 1 (all).
+
+        Entities moving slower than `sleep_speed` whose velocity is also changing by less than `sleep_acceleration`
+        (after any collisions have been resolved) are considered to be at rest. Islands of entities which have all been
+        at rest for at least `sleep_delay_ms` are put to sleep, as long as at least one of their entities is in contact
+        with an object that is not stored in this system (such as a static floor).
+        A `sleep_speed` of 0 disables sleeping
+        """
+
+        if numpy is None:
+            raise ImportError(f"{type(self).__name__} requires NumPy to be installed")
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1 (received: {capacity})")
+
+        self._restitution = restitution
+        self._sleep_speed = sleep_speed
+        self._sleep_acceleration = sleep_acceleration
+        self._sleep_delay_ms = sleep_delay_ms
+
+        self._entities: List["Entity"] = []
+        self._indexes: Dict["Entity", int] = {}
+
+        # Only the first `len(self._entities)` rows of each array are in use, the rest are spare capacity
+        self._positions = numpy.zeros((capacity, 2), dtype=numpy.float64)
+        self._velocities = numpy.zeros((capacity, 2), dtype=numpy.float64)
+        self._accelerations = numpy.zeros((capacity, 2), dtype=numpy.float64)
+        self._masses = numpy.ones(capacity, dtype=numpy.float64)
+        self._rest_ms = numpy.zeros(capacity, dtype=numpy.float64)  # How long each entity has been at rest for
+        self._is_sleeping = numpy.zeros(capacity, dtype=bool)
+
+        # The full island that each sleeping entity was put to sleep with, so that they can all be woken together
+        self._islands: Dict["Entity", Tuple["Entity", ...]] = {}
+
+        # Set while this system is moving entities itself, so that those moves are not mistaken for external ones
+        self._is_moving_entities = False
+
+    def __contains__(self, entity: "Entity") -> bool:
+        return entity in self._indexes
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    @property
+    def entities(self) -> Tuple["Entity", ...]:
+        return tuple(self._entities)
+
+    def add(self, entity: "Entity") -> None:
+        if entity in self._indexes:
+            return
+
+        index = len(self._entities)
+        if index == len(self._positions):
+            self._grow()
+
+        self._entities.append(entity)
+        self._indexes[entity] = index
+        entity.physics_system = self
+
+        self._positions[index] = entity.render_position
+        self._velocities[index] = (entity.speed[0].total, entity.speed[1].total)
+        self._accelerations[index] = (entity.acceleration[0].total, entity.acceleration[1].total)
+        self._masses[index] = entity.mass.total
+        self._rest_ms[index] = 0
+        self._is_sleeping[index] = False
+
+    def remove(self, entity: "Entity") -> None:
+        """
+        Removes the provided entity if it is stored. Does nothing otherwise.
+        If the entity is asleep, the rest of its island is woken, as it may have been resting on this entity
+        """
+
+        if entity not in self._indexes:
+            return
+
+        self.wake(entity)
+        index = self._indexes.pop(entity)
+        entity.physics_system = None
+
+        # The last entity is moved into the removed entity's rows, so that the in-use rows remain contiguous
+        last_index = len(self._entities) - 1
+        last_entity = self._entities.pop()
+
+        if index != last_index:
+            self._entities[index] = last_entity
+            self._indexes[last_entity] = index
+
+            for array in self._get_arrays():
+                array[index] = array[last_index]
+
+    def set_entities(self, entities: Iterable["Entity"]) -> None:
+        """
+        Adds and removes entities as necessary so that exactly the provided entities are stored.
+        Entities which were already stored keep their current velocities
+        """
+
+        entities = dict.fromkeys(entities)  # Preserves the provided order, so that entities are added deterministically
+
+        for entity in [entity for entity in self._entities if entity not in entities]:
+            self.remove(entity)
+
+        for entity in entities:
+            self.add(entity)
+
+    def flag_moved(self, entity: "Entity") -> None:
+        """
+        Re-reads the provided entity's render position, waking its island if it is asleep and has been moved.
+        Invoked automatically by Entity whenever its bounds may have changed; moves made by this system are ignored
+        """
+
+        if self._is_moving_entities or (entity not in self._indexes):
+            return
+
+        index = self._indexes[entity]
+        position = entity.render_position
+
+        if (position[0] == self._positions[index, 0]) and (position[1] == self._positions[index, 1]):
+            return  # Only an object above it in the hierarchy has moved
+
+        self._positions[index] = position
+        self.wake(entity)
+
+    def flag_stats_changed(self, entity: "Entity") -> None:
+        """
+        Re-reads the provided entity's acceleration and mass stats, waking its island if it is asleep.
+        Should be invoked whenever either of those stats is modified
+        """
+
+        index = self._indexes[entity]
+
+        self._accelerations[index] = (entity.acceleration[0].total, entity.acceleration[1].total)
+        self._masses[index] = entity.mass.total
+        self.wake(entity)
+
+    def get_velocity(self, entity: "Entity") -> Tuple[float, float]:
+        x_velocity, y_velocity = self._velocities[self._indexes[entity]]
+
+        return float(x_velocity), float(y_velocity)
+
+    def set_velocity(self, entity: "Entity", velocity: Tuple[float, float]) -> None:
+        self.wake(entity)
+
+        self._velocities[self._indexes[entity]] = velocity
+
+    def apply_impulse(self, entity: "Entity", impulse: Tuple[float, float]) -> None:
+        """
+        Changes the provided entity's velocity by the provided change in momentum, divided by its mass
+        """
+
+        self.wake(entity)
+        index = self._indexes[entity]
+
+        self._velocities[index] += numpy.asarray(impulse, dtype=numpy.float64) / self._masses[index]
+
+    def is_sleeping(self, entity: "Entity") -> bool:
+        return bool(self._is_sleeping[self._indexes[entity]])
+
+    def wake(self, entity: "Entity") -> None:
+        """
+        Wakes the provided entity's island, if it is asleep
+        """
+
+        for island_entity in self._islands.pop(entity, ()):
+            self._islands.pop(island_entity, None)
+
+            index = self._indexes[island_entity]
+            self._is_sleeping[index] = False
+            self._rest_ms[index] = 0
+
+            self._set_resting(island_entity, False)
+
+    def step(self, elapsed_ms: float, hitbox_manager: Optional["HitboxManager"] = None) -> None:
+        """
+        Advances every awake entity by the provided amount of time, using semi-implicit Euler integration
+        (velocities are updated before positions).
+
+        If a hitbox manager is provided, collisions between the entities' hitboxes and any others in the manager
+        are then resolved, and islands of entities which have come to rest are put to sleep
+        """
+
+        entity_count = len(self._entities)
+        if entity_count == 0:
+            return
+
+        entities = self._entities
+        elapsed_s = elapsed_ms / 1000
+
+        positions = self._positions[:entity_count]
+        velocities = self._velocities[:entity_count]
+        accelerations = self._accelerations[:entity_count]
+
+        self._resync_positions()
+
+        # Used to measure each entity's net acceleration over this step, once collisions have been resolved
+        previous_velocities = velocities.copy()
+
+        # Sleeping entities have no velocity, so only their velocities need to be excluded here
+        is_awake = ~self._is_sleeping[:entity_count]
+        velocities[is_awake] += accelerations[is_awake] * elapsed_s
+
+        new_positions = positions + (velocities * elapsed_s)
+        moved_indexes = numpy.flatnonzero((new_positions != positions).any(axis=1))
+        positions[:] = new_positions
+
+        self._is_moving_entities = True
+        try:
+            for index, (x, y) in zip(moved_indexes.tolist(), new_positions[moved_indexes].tolist()):
+                entities[index].render_position = (x, y)
+        finally:
+            self._is_moving_entities = False
+
+        if hitbox_manager is None:
+            return
+
+        # Used to group entities that are in contact with each other into islands
+        island_parents = list(range(entity_count))
+        # Whether each entity is in contact with an object that is not stored in this system
+        is_supported = numpy.zeros(entity_count, dtype=bool)
+
+        # Only pairs involving this system's entities are relevant, so the rest of the manager is not checked
+        contacts = tuple(hitbox_manager.find_contacts(
+            involving=(hitbox for entity in entities for hitbox in entity.hitboxes)
+        ))
+        for _ in range(self.SOLVER_ITERATIONS):
+            for contact in contacts:
+                self._resolve_contact(contact, island_parents, is_supported)
+
+        net_accelerations = numpy.zeros_like(velocities)
+        if elapsed_s:
+            net_accelerations = (velocities - previous_velocities) / elapsed_s
+        self._update_sleep_states(elapsed_ms, island_parents, is_supported, net_accelerations)
+
+    def _resolve_contact(self, contact: Contact, island_parents: List[int], is_supported: "numpy.ndarray") -> None:
+        """
+        Pushes the two objects involved in the provided contact apart along the axis they overlap least on,
+        and exchanges momentum between them if they are moving towards each other.
+        Objects which are not stored in this system are treated as having infinite mass, and so are not moved.
+
+        Only contacts between bounded hitboxes involving at least one entity stored in this system are resolved,
+        using the hitboxes' absolute rects. Overlaps are only corrected down to .CONTACT_SLOP, since hitboxes
+        which are merely touching do not collide and so resting contacts would otherwise be lost every other step
+        """
+
+        hitbox, other = contact
+
+        index = self._indexes.get(hitbox.parent_renderable)
+        other_index = self._indexes.get(other.parent_renderable)
+
+        if (index is None) and (other_index is None):
+            return
+        if not (hitbox.is_bounded and other.is_bounded):
+            return
+
+        # Contacts with a sleeping entity mean that it has been disturbed
+        for contact_index in (index, other_index):
+            if (contact_index is not None) and self._is_sleeping[contact_index]:
+                self.wake(self._entities[contact_index])
+
+        if (index is not None) and (other_index is not None):
+            island_parents[self._find_island(island_parents, index)] = self._find_island(island_parents, other_index)
+
+        inverse_mass = self._get_inverse_mass(index)
+        other_inverse_mass = self._get_inverse_mass(other_index)
+        total_inverse_mass = inverse_mass + other_inverse_mass
+        if total_inverse_mass == 0:
+            return
+
+        rect, other_rect = hitbox.absolute_rect, other.absolute_rect
+
+        x_overlap = min(rect.right, other_rect.right) - max(rect.left, other_rect.left)
+        y_overlap = min(rect.bottom, other_rect.bottom) - max(rect.top, other_rect.top)
+        if (x_overlap <= 0) or (y_overlap <= 0):
+            return
+
+        if other_index is None:
+            is_supported[index] = True
+        elif index is None:
+            is_supported[other_index] = True
+
+        # The collision normal points from the first object towards the other
+        if x_overlap < y_overlap:
+            normal = numpy.array((1 if other_rect.centerx >= rect.centerx else -1, 0), dtype=numpy.float64)
+            depth = x_overlap
+        else:
+            normal = numpy.array((0, 1 if other_rect.centery >= rect.centery else -1), dtype=numpy.float64)
+            depth = y_overlap
+
+        correction = max(depth - self.CONTACT_SLOP, 0)
+        self._move(index, normal * (-correction * inverse_mass / total_inverse_mass))
+        self._move(other_index, normal * (correction * other_inverse_mass / total_inverse_mass))
+
+        velocity = self._velocities[index] if (index is not None) else numpy.zeros(2)
+        other_velocity = self._velocities[other_index] if (other_index is not None) else numpy.zeros(2)
+
+        approach_speed = numpy.dot(other_velocity - velocity, normal)
+        if approach_speed >= 0:
+            return  # Already moving apart
+
+        impulse = normal * (-(1 + self._restitution) * approach_speed / total_inverse_mass)
+        if index is not None:
+            self._velocities[index] -= impulse * inverse_mass
+        if other_index is not None:
+            self._velocities[other_index] += impulse * other_inverse_mass
+
+    def _update_sleep_states(
+            self, elapsed_ms: float, island_parents: List[int],
+            is_supported: "numpy.ndarray", net_accelerations: "numpy.ndarray"
+    ) -> None:
+        """
+        Puts to sleep any awake, supported islands whose entities have all been at rest for long enough
+        """
+
+        if self._sleep_speed <= 0:
+            return
+
+        entity_count = len(self._entities)
+
+        speeds_squared = (self._velocities[:entity_count] ** 2).sum(axis=1)
+        net_accelerations_squared = (net_accelerations ** 2).sum(axis=1)
+        is_at_rest = (
+            (speeds_squared < (self._sleep_speed ** 2)) &
+            (net_accelerations_squared < (self._sleep_acceleration ** 2))
+        )
+
+        rest_ms = self._rest_ms[:entity_count]
+        rest_ms[:] = numpy.where(is_at_rest, rest_ms + elapsed_ms, 0)
+
+        islands: Dict[int, List[int]] = {}
+        for index in numpy.flatnonzero(~self._is_sleeping[:entity_count]).tolist():
+            islands.setdefault(self._find_island(island_parents, index), []).append(index)
+
+        for island_indexes in islands.values():
+            if rest_ms[island_indexes].min() < self._sleep_delay_ms:
+                continue
+            if not is_supported[island_indexes].any():
+                continue  # Islands in free flight may be moving slowly, but are not resting on anything
+
+            island = tuple(self._entities[index] for index in island_indexes)
+            for index, entity in zip(island_indexes, island):
+                self._islands[entity] = island
+                self._is_sleeping[index] = True
+                self._velocities[index] = 0
+
+                self._set_resting(entity, True)
+
+    def _resync_positions(self) -> None:
+        """
+        Re-reads the positions of any entities which were moved without this system being notified
+        """
+
+        entity_count = len(self._entities)
+
+        current_positions = numpy.array(
+            [entity.render_position for entity in self._entities], dtype=numpy.float64
+        ).reshape((entity_count, 2))
+        moved_indexes = numpy.flatnonzero((current_positions != self._positions[:entity_count]).any(axis=1))
+
+        for index in moved_indexes.tolist():
+            self.flag_moved(self._entities[index])
+
+    def _move(self, index: Optional[int], offset: "numpy.ndarray") -> None:
+        """
+        Moves the entity at the provided index immediately, so that its hitboxes are up to date for later contacts
+        """
+
+        if (index is None) or (not offset.any()):
+            return
+
+        self._positions[index] += offset
+
+        self._is_moving_entities = True
+        try:
+            self._entities[index].render_position = tuple(self._positions[index].tolist())
+        finally:
+            self._is_moving_entities = False
+
+    def _get_inverse_mass(self, index: Optional[int]) -> float:
+        if index is None:
+            return 0
+
+        mass = self._masses[index]
+        return 0 if mass <= 0 else (1 / mass)  # Entities without a positive mass are treated as immovable
+
+    def _get_arrays(self) -> Tuple["numpy.ndarray", ...]:
+        return (
+            self._positions, self._velocities, self._accelerations, self._masses, self._rest_ms, self._is_sleeping
+        )
+
+    def _grow(self) -> None:
+        """
+        Doubles the capacity of each array
+        """
+
+        capacity = len(self._positions) * 2
+
+        for attribute_name in ("_positions", "_velocities", "_accelerations", "_masses", "_rest_ms", "_is_sleeping"):
+            array = getattr(self, attribute_name)
+
+            grown_array = numpy.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+            grown_array[:len(array)] = array
+
+            setattr(self, attribute_name, grown_array)
+
+    @staticmethod
+    def _set_resting(entity: "Entity", is_resting: bool) -> None:
+        hitbox_manager = entity.game.screen.hitbox_manager
+
+        for hitbox in entity.hitboxes:
+            hitbox_manager.set_resting(hitbox, is_resting)
+
+    @staticmethod
+    def _find_island(island_parents: List[int], index: int) -> int:
+        while island_parents[index] != index:
+            island_parents[index] = island_parents[island_parents[index]]  # Path halving
+            index = island_parents[index]
+
+        return index
@@ -0,0 +1,12 @@
+from typing import NamedTuple, Tuple
+
+
+class RaycastHit(NamedTuple):
+    """
+    Describes a single hitbox being hit by a ray or line segment.
+    `distance` is measured along the ray from its origin, and `point` is the position at which the hitbox was hit
+    """
+
+    hitbox: "Hitbox"
+    distance: float
+    point: Tuple[float, float]
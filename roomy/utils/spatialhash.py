@@ -0,0 +1,181 @@
+from pygame import Rect
+
+from typing import Dict, Set, Tuple, Hashable, Iterator, Optional
+from math import floor, inf
+
+
+class SpatialHash:
+    """
+    Uniform grid which buckets items by the area they occupy, so that items in a given region
+    can be retrieved without checking every stored item
+    """
+
+    def __init__(self, cell_size: int = 64):
+        if cell_size <= 0:
+            raise ValueError(f"cell size must be > 0 (received: {cell_size})")
+
+        self._cell_size = cell_size
+
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        # Stores the range of cells each item currently occupies, as (left, top, right, bottom) inclusive cell indexes
+        self._item_cell_ranges: Dict[Hashable, Tuple[int, int, int, int]] = {}
+        # The range of cells spanned by every stored item, in the same format. Recalculated as needed by .query_ray()
+        self._occupied_cell_range: Optional[Tuple[int, int, int, int]] = None
+
+    @property
+    def cell_size(self) -> int:
+        return self._cell_size
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._item_cell_ranges
+
+    def __len__(self) -> int:
+        return len(self._item_cell_ranges)
+
+    def set(self, item: Hashable, rect: Rect) -> None:
+        """
+        Adds the provided item under the area represented by `rect`, or moves it there if it is already stored.
+        Items which remain within the same cells are left untouched
+        """
+
+        cell_range = self._get_cell_range(rect)
+        current_cell_range = self._item_cell_ranges.get(item)
+
+        if cell_range == current_cell_range:
+            return
+
+        if current_cell_range is not None:
+            self._remove_from_cells(item, current_cell_range)
+
+        self._item_cell_ranges[item] = cell_range
+        self._occupied_cell_range = None
+        for cell in self._iter_cells(cell_range):
+            self._cells.setdefault(cell, set()).add(item)
+
+    def remove(self, item: Hashable) -> None:
+        """
+        Removes the provided item if it is stored. Does nothing otherwise
+        """
+
+        cell_range = self._item_cell_ranges.pop(item, None)
+
+        if cell_range is not None:
+            self._remove_from_cells(item, cell_range)
+            self._occupied_cell_range = None
+
+    def query(self, rect: Rect) -> Set[Hashable]:
+        """
+        Returns every item which occupies at least one of the cells overlapped by `rect`.
+        Since cells are coarser than the stored areas, this may include items which do not overlap `rect` themselves
+        """
+
+        result = set()
+        for cell in self._iter_cells(self._get_cell_range(rect)):
+            cell_items = self._cells.get(cell)
+
+            if cell_items:
+                result.update(cell_items)
+
+        return result
+
+    def query_ray(
+            self, origin: Tuple[float, float], direction: Tuple[float, float], max_distance: float
+    ) -> Set[Hashable]:
+        """
+        Returns every item which occupies at least one of the cells that the provided ray passes through,
+        up to `max_distance` along it. `direction` should be normalised.
+        Cells are visited in order by stepping from one cell boundary to the next (a grid DDA traversal),
+        stopping once the ray has left the range of occupied cells, so `max_distance` may be infinite
+        """
+
+        result = set()
+
+        if not self._item_cell_ranges:
+            return result
+
+        if self._occupied_cell_range is None:
+            cell_ranges = self._item_cell_ranges.values()
+            self._occupied_cell_range = (
+                min(cell_range[0] for cell_range in cell_ranges),
+                min(cell_range[1] for cell_range in cell_ranges),
+                max(cell_range[2] for cell_range in cell_ranges),
+                max(cell_range[3] for cell_range in cell_ranges)
+            )
+
+        occupied_left, occupied_top, occupied_right, occupied_bottom = self._occupied_cell_range
+        cell_size = self._cell_size
+
+        cell_x, cell_y = floor(origin[0] / cell_size), floor(origin[1] / cell_size)
+        step_x = 1 if direction[0] > 0 else -1
+        step_y = 1 if direction[1] > 0 else -1
+
+        # The distance along the ray at which it crosses into the next column/row of cells,
+        # and the distance along the ray between each column/row boundary
+        if direction[0] == 0:
+            next_x_distance, x_distance_delta = inf, inf
+        else:
+            next_x_boundary = (cell_x + (step_x > 0)) * cell_size
+            next_x_distance = (next_x_boundary - origin[0]) / direction[0]
+            x_distance_delta = cell_size / abs(direction[0])
+
+        if direction[1] == 0:
+            next_y_distance, y_distance_delta = inf, inf
+        else:
+            next_y_boundary = (cell_y + (step_y > 0)) * cell_size
+            next_y_distance = (next_y_boundary - origin[1]) / direction[1]
+            y_distance_delta = cell_size / abs(direction[1])
+
+        while True:
+            # Once the ray is past the occupied cells on either axis, it cannot reach any more items
+            if (
+                    ((cell_x > occupied_right) and (direction[0] >= 0)) or
+                    ((cell_x < occupied_left) and (direction[0] <= 0)) or
+                    ((cell_y > occupied_bottom) and (direction[1] >= 0)) or
+                    ((cell_y < occupied_top) and (direction[1] <= 0))
+            ):
+                break
+
+            cell_items = self._cells.get((cell_x, cell_y))
+            if cell_items:
+                result.update(cell_items)
+
+            if next_x_distance < next_y_distance:
+                if next_x_distance > max_distance:
+                    break
+
+                cell_x += step_x
+                next_x_distance += x_distance_delta
+            else:
+                if next_y_distance > max_distance:
+                    break
+
+                cell_y += step_y
+                next_y_distance += y_distance_delta
+
+        return result
+
+    def _get_cell_range(self, rect: Rect) -> Tuple[int, int, int, int]:
+        cell_size = self._cell_size
+
+        return (
+            rect.left // cell_size,
+            rect.top // cell_size,
+            max(rect.right - 1, rect.left) // cell_size,
+            max(rect.bottom - 1, rect.top) // cell_size
+        )
+
+    def _remove_from_cells(self, item: Hashable, cell_range: Tuple[int, int, int, int]) -> None:
+        for cell in self._iter_cells(cell_range):
+            cell_items = self._cells[cell]
+            cell_items.remove(item)
+
+            if not cell_items:
+                del self._cells[cell]
+
+    @staticmethod
+    def _iter_cells(cell_range: Tuple[int, int, int, int]) -> Iterator[Tuple[int, int]]:
+        left, top, right, bottom = cell_range
+
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                yield x, y
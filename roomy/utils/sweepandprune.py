@@ -0,0 +1,69 @@
+from pygame import Rect
+
+from typing import Callable, Hashable, Iterator, Tuple, Optional, List
+from operator import itemgetter
+
+
+class SweepAndPrune:
+    """
+    Generates pairs of items whose rects overlap, by sorting the rects by their left edges and sweeping across them.
+
+    The sorted order of the items is retained between sweeps. Since items typically only move a short distance
+    between ticks, this order is usually almost correct already, which makes re-sorting it close to linear
+    """
+
+    def __init__(self, get_rect: Callable[[Hashable], Optional[Rect]]):
+        """
+        `get_rect` should return the current rect for a provided item,
+        or None if that item should be excluded from sweeps
+        """
+
+        self._get_rect = get_rect
+
+        self._items: List[Hashable] = []  # Sorted by left edge, as of the most recent sweep
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item: Hashable) -> None:
+        self._items.append(item)
+
+    def remove(self, item: Hashable) -> None:
+        self._items.remove(item)
+
+    def iter_pairs(self, is_included: Optional[Callable[[Hashable], bool]] = None) -> Iterator[Tuple[Hashable, Hashable]]:
+        """
+        Yields each pair of items whose rects overlap exactly once.
+        If `is_included` is provided, only items for which it returns True are paired
+        """
+
+        get_rect = self._get_rect
+
+        entries = []
+        excluded_items = []
+        for item in self._items:
+            rect = get_rect(item)
+
+            if rect is None:
+                excluded_items.append(item)
+            else:
+                entries.append((rect.left, rect.right, rect.top, rect.bottom, item))
+
+        entries.sort(key=itemgetter(0))
+        self._items = [entry[4] for entry in entries] + excluded_items
+
+        if is_included is not None:
+            entries = [entry for entry in entries if is_included(entry[4])]
+
+        active_entries = []
+        for entry in entries:
+            left, right, top, bottom, item = entry
+
+            # Any entries that end before this one starts cannot overlap it or any entries after it
+            active_entries = [active_entry for active_entry in active_entries if active_entry[1] > left]
+
+            for active_entry in active_entries:
+                if (active_entry[2] < bottom) and (top < active_entry[3]):
+                    yield active_entry[4], item
+
+            active_entries.append(entry)
@@ -0,0 +1,179 @@
+from pygame import Surface, Rect, image, SRCALPHA
+
+from os import path, makedirs
+from glob import glob
+from json import loads, dumps
+from typing import Dict, Hashable, List, Tuple
+
+from .enums import AnimationDataKey
+
+
+class TextureAtlasBuilder:
+    """
+    Build step which packs every frame referenced by the animation data files in a resource folder
+    into a small number of large atlas images, and writes a manifest describing where each frame was placed.
+    Intended to be run ahead of time (for example, as part of packaging a game) rather than while the game is running.
+
+    Once Config.ANIMATION_ATLAS_MANIFEST_PATH has been set to the written manifest, AnimationCache loads
+    each packed frame from the atlas instead of from its original image file or sprite sheet.
+
+    The manifest is a JSON file with the following structure, where each atlas image is stored as a sprite sheet:
+    {
+        "sprite_sheets": {
+            "<atlas label>": {<sprite sheet data, as in animation data files>},
+            ...
+        },
+        "frames": [
+            [<original frame key>, ["<atlas label>", <int sprite index>]],
+            ...
+        ]
+    }
+
+    Sprite sheet frames can only be packed if their sprite sheet is defined in an animation data file;
+    frames from sprite sheets registered manually via AnimationCache.register_sprite_sheet() are left as they are
+    """
+
+    LABEL_PREFIX = "atlas_"  # Prepended to the index of each atlas image, to form its sprite sheet label
+    MANIFEST_FILE_NAME = "manifest.json"
+
+    def __init__(self, resource_folder_path: str, page_size: Tuple[int, int] = (2048, 2048), padding: int = 1):
+        """
+        `page_size` is the maximum size of each atlas image, and `padding` is the number of transparent pixels
+        left between packed frames (to prevent neighbouring frames bleeding into each other when scaled)
+        """
+
+        self._resource_folder_path = resource_folder_path
+        self._page_size = page_size
+        self._padding = padding
+
+    def build(self, output_folder: str = "atlas") -> str:
+        """
+        Packs the frames and writes the atlas images and manifest into `output_folder`
+        (relative to the resource folder). Returns the path of the manifest relative to the resource folder,
+        which is the value that Config.ANIMATION_ATLAS_MANIFEST_PATH should be set to
+        """
+
+        frames = self._load_frames()
+        placements = self._pack([(frame_key, frame.get_size()) for frame_key, frame in frames.items()])
+
+        page_extents: List[Tuple[int, int]] = []
+        for frame_key, page_index, rect in placements:
+            if page_index == len(page_extents):
+                page_extents.append((0, 0))
+
+            page_extents[page_index] = (
+                max(page_extents[page_index][0], rect.right), max(page_extents[page_index][1], rect.bottom)
+            )
+
+        pages = [Surface(page_extent, SRCALPHA) for page_extent in page_extents]
+        sprite_sheets_data = {
+            f"{self.LABEL_PREFIX}{page_index}": {
+                AnimationDataKey.FILE_PATH: f"{output_folder}/{self.LABEL_PREFIX}{page_index}.png",
+                AnimationDataKey.PARSE_TYPE: AnimationDataKey.PARSE_TYPE_INDIVIDUAL,
+                AnimationDataKey.PARSE_DATA: []
+            }
+            for page_index in range(len(pages))
+        }
+        atlas_frame_keys = []
+
+        for frame_key, page_index, rect in placements:
+            pages[page_index].blit(frames[frame_key], rect)
+
+            parse_data = sprite_sheets_data[f"{self.LABEL_PREFIX}{page_index}"][AnimationDataKey.PARSE_DATA]
+            atlas_frame_keys.append((frame_key, (f"{self.LABEL_PREFIX}{page_index}", len(parse_data))))
+            parse_data.append((rect.topleft, rect.bottomright))
+
+        output_folder_path = path.join(self._resource_folder_path, output_folder)
+        makedirs(output_folder_path, exist_ok=True)
+
+        for page_index, page in enumerate(pages):
+            image.save(page, path.join(output_folder_path, f"{self.LABEL_PREFIX}{page_index}.png"))
+
+        manifest_path = f"{output_folder}/{self.MANIFEST_FILE_NAME}"
+        with open(path.join(self._resource_folder_path, manifest_path), "w") as file:
+            file.write(dumps({
+                AnimationDataKey.SPRITE_SHEETS: sprite_sheets_data,
+                AnimationDataKey.FRAMES: atlas_frame_keys
+            }))
+
+        return manifest_path
+
+    def _load_frames(self) -> Dict[Hashable, Surface]:
+        """
+        Loads every frame referenced by the animation data files in the resource folder, under its frame key.
+        Sprite sheet frames are cropped from their sprite sheet
+        """
+
+        frame_keys = {}  # Used as an ordered set
+        sprite_sheets_data = {}
+
+        animation_data_file_paths = sorted(glob(path.join(self._resource_folder_path, "*", "animation_data.json")))
+        for animation_data_file_path in animation_data_file_paths:
+            with open(animation_data_file_path, "r") as file:
+                data = loads(file.read())
+
+            sprite_sheets_data.update(data.get(AnimationDataKey.SPRITE_SHEETS, {}))
+            for settings in data.get(AnimationDataKey.ANIMATION_SETTINGS, {}).values():
+                for frame_key in settings[AnimationDataKey.FRAMES]:
+                    frame_keys[tuple(frame_key) if type(frame_key) is list else frame_key] = None
+
+        frames = {}
+        sprite_sheets = {}
+        for frame_key in frame_keys:
+            if type(frame_key) is str:  # frame_key is a file path
+                frames[frame_key] = image.load(path.join(self._resource_folder_path, frame_key))
+                continue
+
+            sprite_sheet_label, sprite_index = frame_key
+            if sprite_sheet_label not in sprite_sheets_data:
+                continue  # Registered manually at runtime, so cannot be packed here
+
+            sprite_sheet_data = sprite_sheets_data[sprite_sheet_label]
+
+            parse_type = sprite_sheet_data[AnimationDataKey.PARSE_TYPE]
+            if parse_type != AnimationDataKey.PARSE_TYPE_INDIVIDUAL:
+                raise ValueError(f"unrecognised sprite sheet parse type: {parse_type}")
+
+            if sprite_sheet_label not in sprite_sheets:
+                sprite_sheets[sprite_sheet_label] = image.load(
+                    path.join(self._resource_folder_path, sprite_sheet_data[AnimationDataKey.FILE_PATH])
+                )
+
+            start, end = sprite_sheet_data[AnimationDataKey.PARSE_DATA][sprite_index]
+            frames[frame_key] = sprite_sheets[sprite_sheet_label].subsurface(
+                Rect(start, (end[0] - start[0], end[1] - start[1]))
+            )
+
+        return frames
+
+    def _pack(self, frame_sizes: List[Tuple[Hashable, Tuple[int, int]]]) -> List[Tuple[Hashable, int, Rect]]:
+        """
+        Places each frame into an atlas image using shelf packing, tallest frames first.
+        Returns the atlas image index and rect for each frame
+        """
+
+        page_width, page_height = self._page_size
+
+        placements = []
+        page_index = 0
+        x = y = shelf_height = 0
+
+        for frame_key, (width, height) in sorted(frame_sizes, key=lambda item: (-item[1][1], -item[1][0])):
+            if (width > page_width) or (height > page_height):
+                raise ValueError(f"frame is larger than the atlas page size: {frame_key}")
+
+            # Start a new shelf, or a new page if this shelf would not fit on the current one
+            if x + width > page_width:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+            if y + height > page_height:
+                page_index += 1
+                x = y = shelf_height = 0
+
+            placements.append((frame_key, page_index, Rect(x, y, width, height)))
+
+            x += width + self._padding
+            shelf_height = max(shelf_height, height + self._padding)
+
+        return placements
@@ -29,6 +29,9 @@ setup(
         "recurfaces~=3.0.0",
         "objectextensions~=2.0.1"
     ],
+    extras_require={
+        "numpy": ["numpy~=1.26.0"]
+    },
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
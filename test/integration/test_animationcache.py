@@ -0,0 +1,253 @@
+import json
+from time import perf_counter, sleep
+
+from managedstate import State
+from managedstate.extensions import Registrar
+from pygame import Surface, image
+
+from roomy import Game, Config
+from roomy.methods import Methods
+from roomy.animations import RepeatAnimation
+from roomy.extensions import Animated
+from roomy.renderables import Renderable, Screen
+from roomy.utils import GameEventType, TextureAtlasBuilder
+
+
+class EmptyScreen(Screen):
+    def __init__(self, game):
+        super().__init__(game, State.with_extensions(Registrar)())
+
+
+class Spinner(Renderable.with_extensions(Animated)):
+    def __init__(self, parent):
+        super().__init__(parent.game, parent=parent)
+
+    def generate_animation(self):
+        return RepeatAnimation(self, "spin", priority=0)
+
+
+def write_resources(resource_folder_path):
+    for frame_index in range(4):
+        image.save(Surface((4, 4)), str(resource_folder_path / f"frame_{frame_index}.png"))
+
+    sprite_sheet = Surface((8, 4))
+    sprite_sheet.fill((255, 0, 0), ((4, 0), (4, 4)))
+    image.save(sprite_sheet, str(resource_folder_path / "sheet.png"))
+
+    (resource_folder_path / "Spinner").mkdir()
+    (resource_folder_path / "Spinner" / "animation_data.json").write_text(json.dumps({
+        "sprite_sheets": {
+            "sheet": {
+                "file_path": "sheet.png",
+                "parse_type": "individual",
+                "parse_data": [[[0, 0], [4, 4]], [[4, 0], [8, 4]]]
+            }
+        },
+        "animation_settings": {
+            "spin": {"frames": ["frame_0.png", "frame_1.png"]},
+            "flip": {"frames": [["sheet", 0], ["sheet", 1]]}
+        }
+    }))
+
+
+def setup_game(resource_folder_path, budget_bytes, disk_cache_path=None):
+    if not (resource_folder_path / "Spinner").exists():  # Rewriting the images would invalidate any stored on disk
+        write_resources(resource_folder_path)
+
+    class BudgetConfig(Config):
+        RESOURCE_FOLDER_PATH = str(resource_folder_path)
+        ANIMATION_CACHE_BUDGET_BYTES = budget_bytes
+        ANIMATION_DISK_CACHE_PATH = disk_cache_path
+
+    game = Game.headless(config=BudgetConfig)
+    screen = EmptyScreen(game)
+    game.screen = screen
+
+    return game, screen
+
+
+class TestAnimationCache:
+    def test_evicts_least_recently_used_unpinned_frames(self, tmp_path):
+        # Setup
+        frame_bytes = 4 * 4 * 4
+        game, screen = setup_game(tmp_path, budget_bytes=frame_bytes * 3)
+        animation_cache = game.animation_cache
+
+        # The spinner's frames are pinned by its animation, and so should survive any evictions
+        spinner = Spinner(screen)
+        assert animation_cache.misses == 1
+        assert animation_cache.total_bytes == frame_bytes
+
+        animation_cache.get_frame("frame_2.png")
+        animation_cache.get_frame("frame_3.png")
+        animation_cache.get_frame("frame_2.png")  # Marks frame 2 as more recently used than frame 3
+        assert (animation_cache.hits, animation_cache.misses, animation_cache.evictions) == (1, 3, 0)
+
+        animation_cache.get_frame("frame_1.png")
+        assert animation_cache.evictions == 1
+        assert animation_cache.total_bytes == frame_bytes * 3
+
+        animation_cache.get_frame("frame_2.png")
+        animation_cache.get_frame("frame_3.png")
+        assert (animation_cache.hits, animation_cache.misses) == (2, 5)
+
+        # Lowering the budget should evict immediately, without evicting pinned frames
+        animation_cache.budget_bytes = frame_bytes
+        assert animation_cache.total_bytes == frame_bytes * 2
+        animation_cache.get_frame("frame_0.png")
+        animation_cache.get_frame("frame_1.png")
+        assert animation_cache.misses == 5
+
+        # Frames are unpinned once their animation is no longer in use
+        spinner.animation = RepeatAnimation(spinner, "spin", size=2, priority=1)
+        animation_cache.clear()
+        assert animation_cache.total_bytes == 0
+
+    def test_slices_sprite_sheet_frames_without_copying(self, tmp_path):
+        # Setup
+        frame_bytes = 4 * 4 * 4
+        game, screen = setup_game(tmp_path, budget_bytes=0)
+        animation_cache = game.animation_cache
+
+        spinner = Spinner(screen)
+        spinner.animation = RepeatAnimation(spinner, "flip", priority=1)
+        assert spinner.animation.frame_key == ("sheet", 0)
+
+        first_frame = animation_cache.get_frame(("sheet", 0))
+        second_frame = animation_cache.get_frame(["sheet", 1])
+        assert first_frame.get_parent() is second_frame.get_parent()
+        assert second_frame.get_at((0, 0)) == (255, 0, 0, 255)
+        assert animation_cache.total_bytes == frame_bytes * 3  # The spin animation's first frame, and the sprite sheet
+
+        # Other sizes are scaled copies
+        scaled_frame = animation_cache.get_frame(("sheet", 1), size=2)
+        assert scaled_frame.get_parent() is None
+        assert scaled_frame.get_size() == (8, 8)
+        assert animation_cache.total_bytes == frame_bytes * 7
+
+        # Re-registering the sprite sheet should evict every frame and mask cut from it, even if pinned
+        animation_cache.get_mask(("sheet", 1), size=2)
+        animation_cache.register_sprite_sheet("sheet", {
+            "file_path": "sheet.png",
+            "parse_type": "individual",
+            "parse_data": [[[4, 0], [8, 4]], [[0, 0], [4, 4]]]
+        })
+        assert animation_cache.total_bytes == frame_bytes
+
+        assert animation_cache.get_frame(("sheet", 0)).get_at((0, 0)) == (255, 0, 0, 255)
+        assert animation_cache.get_frame(("sheet", 1)).get_at((0, 0)) == (0, 0, 0, 255)
+        assert animation_cache.get_mask(("sheet", 1), size=2).count() == 8 * 8
+        assert animation_cache.total_bytes == frame_bytes * 7
+
+        # The sprite sheet is only evicted once no cached frames share its pixels
+        animation_cache.unpin_frames(spinner.animation)
+        animation_cache.clear()
+        assert animation_cache.total_bytes == 0
+
+    def test_preloads_frames_in_the_background(self, tmp_path):
+        # Setup
+        game, screen = setup_game(tmp_path, budget_bytes=0)
+        animation_cache = game.animation_cache
+
+        progress = []
+        game.game_event_handler.add_callback(
+            lambda event_key, target_cls, loaded_frames, total_frames: progress.append((loaded_frames, total_frames)),
+            GameEventType.PRELOAD_PROGRESS
+        )
+
+        future = animation_cache.preload_frames_async(Spinner, sizes=(1, 2))
+        assert animation_cache.total_bytes == 0  # Nothing is added to the cache until it is processed
+
+        deadline = perf_counter() + 5
+        while (not future.done()) and (perf_counter() < deadline):
+            sleep(0.01)
+            game.run_ticks(1)
+
+        assert future.result() is None
+        assert progress[-1] == (8, 8)
+        assert [loaded_frames for loaded_frames, total_frames in progress] == sorted(
+            loaded_frames for loaded_frames, total_frames in progress
+        )
+
+        for frame_key in ("frame_0.png", "frame_1.png", ("sheet", 0), ("sheet", 1)):
+            for size in (1, 2):
+                animation_cache.get_frame(frame_key, size)
+        assert animation_cache.misses == 0
+
+        # Frames which are already cached are not decoded again
+        assert animation_cache.preload_frames_async(Spinner).done()
+
+    def test_reuses_decoded_frames_stored_on_disk(self, tmp_path, monkeypatch):
+        # Setup
+        resource_folder_path = tmp_path / "res"
+        resource_folder_path.mkdir()
+        disk_cache_path = tmp_path / "cache"
+        game, screen = setup_game(resource_folder_path, budget_bytes=0, disk_cache_path=str(disk_cache_path))
+
+        game.animation_cache.register_sprite_sheet("sheet", {
+            "file_path": "sheet.png",
+            "parse_type": "individual",
+            "parse_data": [[[0, 0], [4, 4]], [[4, 0], [8, 4]]]
+        })
+        scaled_frame = game.animation_cache.get_frame("frame_0.png", size=2)
+        game.animation_cache.get_frame(("sheet", 1))
+        game.animation_cache.get_frame(("sheet", 1), size=2)
+        assert len(list(disk_cache_path.iterdir())) == 3  # The scaled frame, the sprite sheet and the scaled sprite
+
+        # A new cache (as on a later run) should not need to decode any images
+        def fail_to_load_image(file_path):
+            raise AssertionError(f"image was decoded: {file_path}")
+
+        game, screen = setup_game(resource_folder_path, budget_bytes=0, disk_cache_path=str(disk_cache_path))
+        game.animation_cache.register_sprite_sheet("sheet", {
+            "file_path": "sheet.png",
+            "parse_type": "individual",
+            "parse_data": [[[0, 0], [4, 4]], [[4, 0], [8, 4]]]
+        })
+
+        monkeypatch.setattr(Methods, "load_image", fail_to_load_image)
+        cached_frame = game.animation_cache.get_frame("frame_0.png", size=2)
+        assert cached_frame.get_size() == scaled_frame.get_size()
+        assert cached_frame.get_at((0, 0)) == scaled_frame.get_at((0, 0))
+        assert game.animation_cache.get_frame(("sheet", 1)).get_at((0, 0)) == (255, 0, 0, 255)
+        assert game.animation_cache.get_frame(("sheet", 1), size=2).get_at((7, 7)) == (255, 0, 0, 255)
+        monkeypatch.undo()
+
+        # Changing the source image should invalidate its stored frames
+        image.save(Surface((2, 2)), str(resource_folder_path / "frame_0.png"))
+        game.animation_cache.clear()
+        assert game.animation_cache.get_frame("frame_0.png", size=2).get_size() == (4, 4)
+
+    def test_loads_frames_from_a_texture_atlas(self, tmp_path):
+        # Setup
+        write_resources(tmp_path)
+
+        # Each page fits 2 rows of 2 frames, so the 4 frames should be packed onto a single page
+        manifest_path = TextureAtlasBuilder(str(tmp_path), page_size=(9, 16)).build()
+        assert sorted(file_path.name for file_path in (tmp_path / "atlas").iterdir()) == ["atlas_0.png", "manifest.json"]
+
+        class AtlasConfig(Config):
+            RESOURCE_FOLDER_PATH = str(tmp_path)
+            ANIMATION_ATLAS_MANIFEST_PATH = manifest_path
+
+        game = Game.headless(config=AtlasConfig)
+        game.screen = EmptyScreen(game)
+        animation_cache = game.animation_cache
+
+        file_frame = animation_cache.get_frame("frame_0.png")
+        sprite_sheet_frame = animation_cache.get_frame(("sheet", 1))
+        assert file_frame.get_parent() is sprite_sheet_frame.get_parent()
+        assert file_frame.get_parent().get_size() == (9, 9)
+        assert sprite_sheet_frame.get_size() == (4, 4)
+        assert sprite_sheet_frame.get_at((3, 3)) == (255, 0, 0, 255)
+
+        assert animation_cache.get_frame(("sheet", 1), size=2).get_at((7, 7)) == (255, 0, 0, 255)
+
+        # Preloading should also read from the atlas
+        future = animation_cache.preload_frames_async(Spinner)
+        deadline = perf_counter() + 5
+        while (not future.done()) and (perf_counter() < deadline):
+            sleep(0.01)
+            game.run_ticks(1)
+
+        assert animation_cache.get_frame("frame_1.png").get_parent() is file_frame.get_parent()
@@ -0,0 +1,145 @@
+import pytest
+
+from time import sleep
+
+from managedstate import State
+from managedstate.extensions import Registrar
+
+from roomy import Game, Config
+from roomy.renderables import Screen
+from roomy.utils import FrameProfiler, ProfilerMetric, GameEventType, CatchUpPolicy
+
+
+class CountingScreen(Screen):
+    def __init__(self, game):
+        super().__init__(game, State.with_extensions(Registrar)())
+
+        self.ticks = 0
+        self.total_elapsed_ms = 0
+
+    def _update(self, tick_number, elapsed_ms, input_events, *args, **kwargs):
+        super()._update(tick_number, elapsed_ms, input_events, *args, **kwargs)
+
+        self.ticks += 1
+        self.total_elapsed_ms += elapsed_ms
+
+
+class SlowScreen(CountingScreen):
+    def _update(self, tick_number, elapsed_ms, input_events, *args, **kwargs):
+        super()._update(tick_number, elapsed_ms, input_events, *args, **kwargs)
+
+        sleep(0.004)
+
+
+def setup_catch_up_game(screen_cls=CountingScreen, **config_values):
+    catch_up_config = type("CatchUpConfig", (Config, ), {"TICK_RATE": 50, **config_values})
+
+    game = Game.headless(config=catch_up_config)
+    screen = screen_cls(game)
+    game.screen = screen
+
+    limits = []
+    for event_type in (GameEventType.CATCH_UP_TICKS_LIMITED, GameEventType.CATCH_UP_BUDGET_EXCEEDED):
+        game.game_event_handler.add_callback(
+            lambda event_key, ticks, backlog_ms, policy: limits.append((event_key, ticks, backlog_ms, policy)),
+            event_type
+        )
+
+    return game, screen, limits
+
+
+class TestGame:
+    def test_can_fast_forward_headless_game(self):
+        # Setup
+        game = Game.headless()
+        screen = CountingScreen(game)
+        game.screen = screen
+
+        game.run_ticks(600)
+        assert screen.ticks == 600
+        assert game.tick_number == 600
+
+        # 10 seconds of game time at the default tick rate, plus some leftover time to be carried over
+        assert game.run_for(10005) == 600
+        assert game.run_for(20) == 1
+        assert screen.ticks == 1201
+        assert round(screen.total_elapsed_ms) == round(1201 * (1000/60))
+
+    def test_can_profile_game_loop_phases(self):
+        # Setup
+        game = Game.headless()
+        game.screen = CountingScreen(game)
+        game.profiler = FrameProfiler(buffer_size=100)
+
+        game.run_ticks(250)
+
+        summary = game.profiler.summary()
+        assert set(summary) == {ProfilerMetric.INPUT, ProfilerMetric.TICK, ProfilerMetric.CATCH_UP_TICKS}
+        assert summary[ProfilerMetric.TICK]["p50"] <= summary[ProfilerMetric.TICK]["p99"]
+        assert summary[ProfilerMetric.CATCH_UP_TICKS]["p50"] == 250
+
+    def test_emits_profiler_snapshots_in_headless_runs(self):
+        # Setup
+        game = Game.headless()
+        game.screen = CountingScreen(game)
+        game.profiler = FrameProfiler(buffer_size=100, snapshot_interval_ms=0)  # A snapshot is always due
+
+        snapshots = []
+        game.game_event_handler.add_callback(
+            lambda event_key, snapshot: snapshots.append(snapshot), GameEventType.PROFILER_SNAPSHOT
+        )
+
+        game.run_ticks(3)
+        assert len(snapshots) == 4  # One after each tick, and one after the run as a whole
+        assert set(snapshots[0]) == {ProfilerMetric.INPUT, ProfilerMetric.TICK}
+        assert snapshots[-1][ProfilerMetric.CATCH_UP_TICKS]["p50"] == 3
+
+
+    def test_catch_up_tick_limit_drops_or_carries_over_the_backlog(self):
+        tick_delay_ms = 20  # Exactly representable, so that repeatedly subtracting it leaves no rounding error
+
+        # Setup
+        game, screen, limits = setup_catch_up_game(MAX_CATCH_UP_TICKS=5, CATCH_UP_POLICY=CatchUpPolicy.DROP)
+
+        # A long frame leaves 60 ticks due, plus some leftover time
+        game._ms_since_tick = (tick_delay_ms * 60) + 10
+        assert game._catch_up(tick_delay_ms) == 5
+        assert screen.ticks == 5
+
+        # Only the leftover time which does not amount to a full tick is kept
+        assert game._ms_since_tick == pytest.approx(10)
+        assert limits == [(
+            GameEventType.CATCH_UP_TICKS_LIMITED, 5, pytest.approx((tick_delay_ms * 55) + 10), CatchUpPolicy.DROP
+        )]
+
+        game, screen, limits = setup_catch_up_game(MAX_CATCH_UP_TICKS=5, CATCH_UP_POLICY=CatchUpPolicy.SLOW)
+
+        # The backlog is carried over, but capped at the number of ticks which can be run in one loop
+        game._ms_since_tick = (tick_delay_ms * 60) + 10
+        assert game._catch_up(tick_delay_ms) == 5
+        assert game._ms_since_tick == pytest.approx(tick_delay_ms * 5)
+        assert [limit[0] for limit in limits] == [GameEventType.CATCH_UP_TICKS_LIMITED]
+
+        assert game._catch_up(tick_delay_ms) == 5
+        assert game._ms_since_tick == pytest.approx(0)
+        assert len(limits) == 1  # The carried-over backlog fits within the limit
+
+    def test_catch_up_budget_stops_running_ticks(self):
+        tick_delay_ms = 20
+
+        # Setup
+        game, screen, limits = setup_catch_up_game(
+            SlowScreen, CATCH_UP_BUDGET_MS=6, CATCH_UP_POLICY=CatchUpPolicy.DROP
+        )
+
+        game._ms_since_tick = tick_delay_ms * 60
+        ticks = game._catch_up(tick_delay_ms)
+
+        # At least one tick is always run, but each tick here takes long enough that the budget runs out well before 60
+        assert 1 <= ticks <= 2
+        assert screen.ticks == ticks
+        assert game._ms_since_tick == pytest.approx(0, abs=1e-6)
+        assert limits == [(
+            GameEventType.CATCH_UP_BUDGET_EXCEEDED, ticks, pytest.approx(tick_delay_ms * (60 - ticks)),
+            CatchUpPolicy.DROP
+        )]
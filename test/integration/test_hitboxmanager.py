@@ -0,0 +1,462 @@
+import math
+
+import pytest
+
+from managedstate import State
+from managedstate.extensions import Registrar
+from pygame import Surface, Rect, SRCALPHA
+
+from roomy import Game, Config
+from roomy.extensions import Hitboxed
+from roomy.hitboxes import RecurfaceHitbox, MaskHitbox, RectHitbox, CircleHitbox, PolygonHitbox
+from roomy.renderables import Renderable, Screen, RenderableHitboxTag
+
+
+class EmptyScreen(Screen):
+    def __init__(self, game):
+        super().__init__(game, State.with_extensions(Registrar)())
+
+
+class Box(Renderable.with_extensions(Hitboxed)):
+    def __init__(self, parent, render_position, size=(10, 10), is_inverted=False, is_static=False, is_continuous=False):
+        self._is_inverted = is_inverted
+        self._is_static = is_static
+        self._is_continuous = is_continuous
+
+        super().__init__(
+            parent.game, parent=parent, surface=Surface(size), render_position=render_position, priority=0
+        )
+
+    def generate_hitboxes(self):
+        return [RecurfaceHitbox(
+            self, tags=(RenderableHitboxTag.ROOM_OCCUPANT, ), is_inverted=self._is_inverted,
+            is_static=self._is_static, is_continuous=self._is_continuous
+        )]
+
+    @property
+    def hitbox(self):
+        return next(iter(self.hitboxes))
+
+
+class CornerSprite(Box):
+    """
+    Only the top-left 2x2 pixels of this sprite are opaque
+    """
+
+    def __init__(self, parent, render_position):
+        super().__init__(parent, render_position)
+
+        surface = Surface((10, 10), SRCALPHA)
+        surface.fill((255, 255, 255, 255), (0, 0, 2, 2))
+        self.surface = surface
+
+    def generate_hitboxes(self):
+        return [MaskHitbox(self, tags=(RenderableHitboxTag.ROOM_OCCUPANT, ))]
+
+
+class LayeredConfig(Config):
+    HITBOX_TAGS = {"player", "wall", "pickup", "decoration"}
+    HITBOX_TAG_COLLISION_MATRIX = {"player": ("wall", "pickup")}
+
+
+class LayeredBox(Box):
+    def __init__(self, parent, render_position, tags):
+        self._tags = tags
+
+        super().__init__(parent, render_position)
+
+    def generate_hitboxes(self):
+        return [RecurfaceHitbox(self, tags=self._tags)]
+
+
+def setup_screen(config=Config):
+    game = Game.headless(config=config)
+    screen = EmptyScreen(game)
+    game.screen = screen
+
+    return screen
+
+
+class TestHitboxManager:
+    def test_can_query_hitboxes_by_area(self):
+        # Setup
+        screen = setup_screen()
+        hitbox_manager = screen.hitbox_manager
+
+        box = Box(screen, (0, 0))
+        neighbour = Box(screen, (12, 0))
+        distant = Box(screen, (500, 500))
+        boundary = Box(screen, (0, 0), size=(1000, 1000), is_inverted=True)
+
+        assert hitbox_manager.get(near=box.hitbox) == {neighbour.hitbox, boundary.hitbox}
+        assert hitbox_manager.get(rect=Rect(495, 495, 10, 10)) == {distant.hitbox, boundary.hitbox}
+
+        # Moving a parent should also move its children's hitboxes
+        distant_child = Box(distant, (0, 0))
+        distant.render_position = (0, 20)
+        assert hitbox_manager.get(rect=Rect(0, 20, 5, 5)) == {distant.hitbox, distant_child.hitbox, boundary.hitbox}
+        assert hitbox_manager.get(rect=Rect(495, 495, 10, 10)) == {boundary.hitbox}
+
+    def test_area_queries_follow_every_kind_of_move(self):
+        # Setup
+        screen = setup_screen()
+        hitbox_manager = screen.hitbox_manager
+
+        box = Box(screen, (0, 0))
+        child = Box(box, (0, 0))
+        assert hitbox_manager.get(rect=Rect(0, 0, 5, 5)) == {box.hitbox, child.hitbox}
+
+        box.move_render_position(300, 300)
+        assert hitbox_manager.get(rect=Rect(0, 0, 5, 5)) == set()
+        assert hitbox_manager.get(rect=Rect(300, 300, 5, 5)) == {box.hitbox, child.hitbox}
+
+        box.x_render_position = 500
+        assert hitbox_manager.get(rect=Rect(300, 300, 5, 5)) == set()
+        assert hitbox_manager.get(rect=Rect(500, 300, 5, 5)) == {box.hitbox, child.hitbox}
+
+        child.y_render_position = 50
+        assert hitbox_manager.get(rect=Rect(500, 350, 5, 5)) == {child.hitbox}
+
+    def test_collisions_follow_every_kind_of_move(self):
+        # Setup
+        screen = setup_screen()
+
+        a = Box(screen, (0, 0))
+        b = Box(screen, (100, 0))
+        b_child = Box(b, (0, 50))
+        assert not a.hitbox.test_collision(b.hitbox)  # Also caches each hitbox's absolute rect
+
+        b.move_render_position(-100, 0)
+        assert a.hitbox.test_collision(b.hitbox)
+        assert b_child.hitbox.absolute_rect.topleft == (0, 50)
+
+        # Moving a parent should also refresh its children's absolute rects
+        b.x_render_position = 200
+        assert not a.hitbox.test_collision(b.hitbox)
+        assert b_child.hitbox.absolute_rect.topleft == (200, 50)
+
+        b_child.y_render_position = 0
+        b.x_render_position = 5
+        assert a.hitbox.test_collision(b_child.hitbox)
+        assert b_child.hitbox.absolute_rect.topleft == (5, 0)
+
+    def test_candidate_pairs_are_unique(self):
+        # Setup
+        screen = setup_screen()
+        hitbox_manager = screen.hitbox_manager
+
+        boxes = [Box(screen, (x * 5, 0)) for x in range(4)]  # Each box overlaps the next
+        Box(screen, (500, 500))
+        boundary = Box(screen, (0, 0), size=(1000, 1000), is_inverted=True)
+
+        for tick_index in range(2):  # Pairs should remain correct when boxes move between calls
+            pairs = [frozenset(pair) for pair in hitbox_manager.candidate_pairs()]
+            assert len(pairs) == len(set(pairs))
+
+            bounded_pairs = set(pair for pair in pairs if boundary.hitbox not in pair)
+            assert bounded_pairs == {
+                frozenset((boxes[index].hitbox, boxes[index + 1].hitbox)) for index in range(3)
+            }
+            assert len(pairs) - len(bounded_pairs) == 5
+
+            boxes.reverse()
+            for x, box in enumerate(boxes):
+                box.render_position = (x * 5, 0)
+
+        for hitbox_a, hitbox_b in hitbox_manager.candidate_pairs():
+            # Every box is inside the boundary, and overlaps any box it is paired with
+            assert hitbox_a.test_collision(hitbox_b) == (boundary.hitbox not in (hitbox_a, hitbox_b))
+
+    def test_batch_collisions_match_individual_collisions(self):
+        pytest.importorskip("numpy")
+
+        # Setup
+        screen = setup_screen()
+        hitbox_manager = screen.hitbox_manager
+
+        boxes = [Box(screen, ((x * 7) % 60, (x * 13) % 60)) for x in range(30)]
+        boxes.append(Box(screen, (5, 5), size=(40, 40), is_inverted=True))
+
+        batch = hitbox_manager.batch()
+        hitboxes = batch.hitboxes
+
+        expected_pairs = set()
+        for index_a, hitbox_a in enumerate(hitboxes):
+            for index_b in range(index_a + 1, len(hitboxes)):
+                if hitbox_a.test_collision(hitboxes[index_b]):
+                    expected_pairs.add((index_a, index_b))
+
+        assert set(map(tuple, batch.collision_pairs().tolist())) == expected_pairs
+
+        for index_a, hitbox_a in enumerate(hitboxes):
+            assert set(batch.collisions_with(hitbox_a).tolist()) == set(
+                index_b for index_b, hitbox_b in enumerate(hitboxes)
+                if (index_b != index_a) and hitbox_a.test_collision(hitbox_b)
+            )
+
+    def test_mask_hitboxes_only_collide_on_opaque_pixels(self):
+        # Setup
+        screen = setup_screen()
+
+        sprite = CornerSprite(screen, (0, 0))
+        overlapping_sprite = CornerSprite(screen, (1, 1))
+        distant_sprite = CornerSprite(screen, (5, 5))
+        box = Box(screen, (4, 4))
+        boundary = Box(screen, (1, 1), size=(100, 100), is_inverted=True)
+
+        assert sprite.hitbox.test_collision(overlapping_sprite.hitbox)
+        assert not sprite.hitbox.test_collision(distant_sprite.hitbox)
+
+        # Checkers are registered for both orders of mask and rect hitboxes
+        assert not sprite.hitbox.test_collision(box.hitbox)
+        assert box.hitbox.test_collision(distant_sprite.hitbox)
+        assert boundary.hitbox.test_collision(sprite.hitbox)
+        assert not distant_sprite.hitbox.test_collision(boundary.hitbox)
+
+    def test_shape_hitboxes_dispatch_to_registered_checkers(self):
+        # Setup
+        screen = setup_screen()
+        tags = (RenderableHitboxTag.ROOM_OCCUPANT, )
+
+        circle = CircleHitbox(Box(screen, (0, 0)), radius=5, centre=(0, 0), tags=tags)
+        rect = RectHitbox(Box(screen, (4, 0)), rect=(0, 0, 10, 10), tags=tags)
+        triangle = PolygonHitbox(Box(screen, (3, 3)), points=((0, 0), (10, 0), (0, 10)), tags=tags)
+        distant_triangle = PolygonHitbox(Box(screen, (20, 20)), points=((0, 0), (10, 0), (0, 10)), tags=tags)
+        boundary = Box(screen, (-2, -2), size=(40, 40), is_inverted=True)
+
+        assert circle.test_collision(rect) and rect.test_collision(circle)
+        assert triangle.test_collision(circle) and circle.test_collision(triangle)
+        assert triangle.test_collision(rect)
+        assert not distant_triangle.test_collision(triangle)
+
+        # The circle extends outside of the boundary, whereas the distant triangle is fully inside it
+        assert circle.test_collision(boundary.hitbox)
+        assert not boundary.hitbox.test_collision(distant_triangle)
+
+        class SubclassedCircleHitbox(CircleHitbox):
+            pass
+
+        subclassed_circle = SubclassedCircleHitbox(Box(screen, (0, 0)), radius=1, centre=(0, 0), tags=tags)
+        assert subclassed_circle.test_collision(circle)
+        with pytest.raises(TypeError):
+            subclassed_circle.test_collision(CornerSprite(screen, (0, 0)).hitbox)
+
+    def test_tag_queries_and_collision_matrix(self):
+        # Setup
+        screen = setup_screen(config=LayeredConfig)
+        hitbox_manager = screen.hitbox_manager
+
+        player = LayeredBox(screen, (0, 0), tags=("player", ))
+        wall = LayeredBox(screen, (5, 0), tags=("wall", "decoration"))
+        pickup = LayeredBox(screen, (0, 5), tags=("pickup", ))
+        decoration = LayeredBox(screen, (5, 5), tags=("decoration", ))
+
+        assert hitbox_manager.get(tags_any=("wall", "pickup")) == {wall.hitbox, pickup.hitbox}
+        assert hitbox_manager.get(tags_all=("wall", "decoration")) == {wall.hitbox}
+
+        # Cached results should be discarded when membership changes
+        other_pickup = LayeredBox(screen, (100, 100), tags=("pickup", ))
+        assert hitbox_manager.get(tags_any=("pickup", )) == {pickup.hitbox, other_pickup.hitbox}
+
+        # Pairs which the collision matrix does not allow are never generated, even though all four boxes overlap
+        pairs = set(frozenset(pair) for pair in hitbox_manager.candidate_pairs())
+        assert pairs == {frozenset((player.hitbox, wall.hitbox)), frozenset((player.hitbox, pickup.hitbox))}
+        assert hitbox_manager.get(near=wall.hitbox) == {player.hitbox}
+        assert hitbox_manager.get(near=decoration.hitbox) == set()
+
+        with pytest.raises(ValueError):
+            hitbox_manager.get(tags_any=("unknown", ))
+
+    def test_static_hitboxes_are_paired_with_dynamic_hitboxes(self):
+        # Setup
+        screen = setup_screen()
+        hitbox_manager = screen.hitbox_manager
+
+        walls = [Box(screen, (x * 10, 100), is_static=True) for x in range(100)]
+        faller = Box(screen, (55, 95))
+        bystander = Box(screen, (0, 0))
+
+        pairs = set(frozenset(pair) for pair in hitbox_manager.candidate_pairs())
+        assert pairs == {frozenset((faller.hitbox, walls[5].hitbox)), frozenset((faller.hitbox, walls[6].hitbox))}
+        assert hitbox_manager.get(near=faller.hitbox) == {walls[5].hitbox, walls[6].hitbox}
+        assert hitbox_manager.get(rect=Rect(0, 0, 15, 105)) == {bystander.hitbox, walls[0].hitbox, walls[1].hitbox}
+
+        # Changes to static membership should be reflected in subsequent queries
+        walls[5].hitboxes = ()
+        pairs = set(frozenset(pair) for pair in hitbox_manager.candidate_pairs())
+        assert pairs == {frozenset((faller.hitbox, walls[6].hitbox))}
+
+    def test_raycasts_find_hitboxes_in_order(self):
+        # Setup
+        screen = setup_screen()
+        hitbox_manager = screen.hitbox_manager
+
+        caster = Box(screen, (0, 0))
+        near_box = Box(screen, (100, 0))
+        wall = Box(screen, (200, -50), size=(10, 200), is_static=True)
+        circle_box = Box(screen, (300, 300))
+        circle = CircleHitbox(circle_box, radius=10, centre=(0, 0))
+        circle_box.hitboxes = [circle]
+        boundary = Box(screen, (-100, -100), size=(1000, 1000), is_inverted=True)
+
+        is_not_caster = lambda hitbox: hitbox is not caster.hitbox
+
+        hit = hitbox_manager.raycast((5, 5), (1, 0), 1000, custom_filter_key=is_not_caster)
+        assert (hit.hitbox, hit.distance, hit.point) == (near_box.hitbox, 95, (100, 5))
+
+        hits = hitbox_manager.segment_query((5, 5), (1000, 5), custom_filter_key=is_not_caster)
+        assert [hit.hitbox for hit in hits] == [near_box.hitbox, wall.hitbox, boundary.hitbox]
+        assert hits[-1].point == (900, 5)  # Inverted hitboxes are hit where the ray leaves them
+
+        assert not hitbox_manager.has_line_of_sight((5, 5), (150, 5), custom_filter_key=is_not_caster)
+        assert hitbox_manager.has_line_of_sight((5, 50), (150, 50), custom_filter_key=is_not_caster)
+
+        circle_hit = hitbox_manager.raycast((300, 0), (0, 1), 1000, custom_filter_key=is_not_caster)
+        assert (circle_hit.hitbox, circle_hit.distance) == (circle, 290)
+
+        # Unbounded rays should stop being traced once they leave the occupied area
+        unbounded_hit = hitbox_manager.raycast((5, 5), (1, 0), math.inf, custom_filter_key=is_not_caster)
+        assert (unbounded_hit.hitbox, unbounded_hit.distance) == (near_box.hitbox, 95)
+        assert hitbox_manager.raycast((5, 5), (-1, -1), math.inf, tags_any=()) is None
+        assert not hitbox_manager.has_line_of_sight((5, 5), (math.inf, 5), custom_filter_key=is_not_caster)
+
+        # Results should match testing the ray against every hitbox individually
+        for direction in ((1, 1), (-1, 3), (2, -1), (0, -1), (1, 0.001)):
+            for max_distance in (50, 150, 600):
+                direction_length = ((direction[0] ** 2) + (direction[1] ** 2)) ** 0.5
+                normalised = (direction[0] / direction_length, direction[1] / direction_length)
+
+                expected = set()
+                for hitbox in hitbox_manager.get():
+                    distance = hitbox.get_ray_distance((50, 50), normalised)
+                    if (distance is not None) and (distance <= max_distance):
+                        expected.add(hitbox)
+
+                hits = hitbox_manager.segment_query(
+                    (50, 50), (50 + (normalised[0] * max_distance), 50 + (normalised[1] * max_distance))
+                )
+                assert set(hit.hitbox for hit in hits) == expected
+
+    def test_collision_pass_dispatches_each_contact_once(self):
+        # Setup
+        screen = setup_screen()
+        screen.is_collision_pass_enabled = True
+        collisions = []
+
+        class RecordingBox(Box):
+            def collide(self, other):
+                collisions.append((self, other))
+
+        first = RecordingBox(screen, (0, 0))
+        second = RecordingBox(screen, (5, 0))
+        third = RecordingBox(screen, (5, 5))
+        RecordingBox(screen, (500, 500))
+
+        # Additional overlapping hitboxes on the same objects should not produce additional contacts
+        first.hitboxes = [first.hitbox, RectHitbox(first, (0, 0, 10, 10))]
+
+        screen.game.run_ticks(1)
+
+        assert [(contact.hitbox.parent_renderable, contact.other.parent_renderable) for contact in screen.contacts] == [
+            (first, second), (first, third), (second, third)
+        ]
+        assert collisions == [
+            (first, second), (second, first), (first, third), (third, first), (second, third), (third, second)
+        ]
+
+    def test_continuous_hitboxes_do_not_tunnel(self):
+        # Setup
+        screen = setup_screen()
+        screen.is_collision_pass_enabled = True
+
+        class Bullet(Box):
+            def _update(self, tick_number, elapsed_ms, input_events, *args, **kwargs):
+                self.render_position = (self.render_position[0] + 200, self.render_position[1])
+
+        wall = Box(screen, (100, 0), size=(2, 50), is_static=True)
+        bullet = Bullet(screen, (0, 0), is_continuous=True)
+        slow_bullet = Bullet(screen, (0, 20))
+
+        screen.game.run_ticks(1)
+
+        # Only the continuous hitbox should register having passed through the wall
+        assert [(contact.hitbox, contact.other) for contact in screen.contacts] == [(wall.hitbox, bullet.hitbox)]
+        assert bullet.hitbox.get_time_of_impact(wall.hitbox) == pytest.approx(90 / 200)
+        assert wall.hitbox.get_time_of_impact(bullet.hitbox) == pytest.approx(90 / 200)
+        assert slow_bullet.hitbox.get_time_of_impact(wall.hitbox) is None
+
+        # Leaving an inverted hitbox should also be detected, at the point it was left
+        boundary = Box(screen, (0, 0), size=(300, 300), is_inverted=True)
+        screen.game.run_ticks(1)
+        assert bullet.hitbox.get_time_of_impact(boundary.hitbox) == pytest.approx(90 / 200)
+        assert boundary.hitbox.get_time_of_impact(bullet.hitbox) == pytest.approx(90 / 200)
+
+    def test_continuous_hitboxes_do_not_tunnel_through_other_shapes(self):
+        # Setup
+        screen = setup_screen()
+        screen.is_collision_pass_enabled = True
+        tags = (RenderableHitboxTag.ROOM_OCCUPANT, )
+
+        class Bullet(Box):
+            def _update(self, tick_number, elapsed_ms, input_events, *args, **kwargs):
+                self.render_position = (self.render_position[0] + 200, self.render_position[1])
+
+        thin_wall = Box(screen, (100, 0))
+        thin_wall.hitboxes = [RectHitbox(thin_wall, (0, 0, 2, 100), tags=tags, is_static=True)]
+        bullet = Bullet(screen, (0, 0), is_continuous=True)
+        rect_bullet = Bullet(screen, (0, 50))
+        rect_bullet.hitboxes = [RectHitbox(rect_bullet, (0, 0, 10, 10), tags=tags, is_continuous=True)]
+        slow_bullet = Bullet(screen, (0, 80))
+
+        screen.game.run_ticks(1)
+
+        wall_hitbox = thin_wall.hitbox
+        assert set(frozenset((contact.hitbox, contact.other)) for contact in screen.contacts) == {
+            frozenset((wall_hitbox, bullet.hitbox)), frozenset((wall_hitbox, rect_bullet.hitbox))
+        }
+        assert bullet.hitbox.test_collision(wall_hitbox) and wall_hitbox.test_collision(bullet.hitbox)
+        assert not slow_bullet.hitbox.test_collision(wall_hitbox)
+
+    def test_batches_detect_continuous_hitboxes_passing_through_each_other(self):
+        pytest.importorskip("numpy")
+
+        # Setup
+        screen = setup_screen()
+
+        class Bullet(Box):
+            def _update(self, tick_number, elapsed_ms, input_events, *args, **kwargs):
+                self.render_position = (self.render_position[0] + 200, self.render_position[1])
+
+        thin_wall = Box(screen, (100, 0), size=(2, 50), is_static=True)
+        bullet = Bullet(screen, (0, 0), is_continuous=True)
+        slow_bullet = Bullet(screen, (0, 20))
+        Box(screen, (500, 500))
+
+        screen.game.run_ticks(1)
+
+        batch = screen.hitbox_manager.batch()
+        hitboxes = batch.hitboxes
+        wall_index, bullet_index = hitboxes.index(thin_wall.hitbox), hitboxes.index(bullet.hitbox)
+
+        assert batch.collision_pairs().tolist() == [sorted((wall_index, bullet_index))]
+        assert batch.collisions_with(thin_wall.hitbox).tolist() == [bullet_index]
+        assert batch.collisions_with(bullet.hitbox).tolist() == [wall_index]
+        assert not len(batch.collisions_with(slow_bullet.hitbox))
+
+    def test_contacts_can_be_limited_to_pairs_involving_given_hitboxes(self):
+        # Setup
+        screen = setup_screen()
+        hitbox_manager = screen.hitbox_manager
+
+        boxes = [Box(screen, ((x * 7) % 60, (x * 13) % 60)) for x in range(20)]
+        boxes.append(Box(screen, (0, 30), size=(60, 5), is_static=True))
+        boxes.append(Box(screen, (5, 5), size=(40, 40), is_inverted=True))
+        hitbox_manager.set_resting(boxes[0].hitbox, True)
+
+        all_contacts = hitbox_manager.find_contacts()
+        for involved_boxes in (boxes[:3], boxes[-2:], boxes[::4]):
+            involved = set(box.hitbox for box in involved_boxes)
+
+            assert hitbox_manager.find_contacts(involving=involved) == [
+                contact for contact in all_contacts if involved & {contact.hitbox, contact.other}
+            ]
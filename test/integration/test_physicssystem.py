@@ -0,0 +1,206 @@
+import pytest
+
+from managedstate import State
+from managedstate.extensions import Registrar
+from pygame import Surface
+
+from roomy import Game
+from roomy.extensions import Hitboxed
+from roomy.hitboxes import RecurfaceHitbox
+from roomy.renderables import Entity, Renderable, Screen, RenderableHitboxTag
+from roomy.stats import GenericStat
+from roomy.utils import PhysicsSystem
+
+
+class EmptyScreen(Screen):
+    def __init__(self, game):
+        super().__init__(game, State.with_extensions(Registrar)())
+
+
+class Ball(Entity):
+    def __init__(self, parent, render_position, speed=(0, 0), acceleration=(0, 0), mass=1):
+        self._speed = (GenericStat(base_value=speed[0]), GenericStat(base_value=speed[1]))
+        self._acceleration = (GenericStat(base_value=acceleration[0]), GenericStat(base_value=acceleration[1]))
+        self._mass = GenericStat(base_value=mass)
+
+        self.position_changes = 0
+
+        super().__init__(parent, render_position, surface=Surface((10, 10)))
+
+    @property
+    def speed(self):
+        return self._speed
+
+    @property
+    def acceleration(self):
+        return self._acceleration
+
+    @property
+    def mass(self):
+        return self._mass
+
+    def generate_hitboxes(self):
+        return [RecurfaceHitbox(self, tags=(RenderableHitboxTag.ROOM_OCCUPANT, ))]
+
+    def _on_bounds_changed(self):
+        super()._on_bounds_changed()
+
+        self.position_changes += 1
+
+
+class Floor(Renderable.with_extensions(Hitboxed)):
+    def __init__(self, parent, render_position):
+        super().__init__(parent.game, parent=parent, surface=Surface((100, 10)), render_position=render_position)
+
+    def generate_hitboxes(self):
+        return [RecurfaceHitbox(self, tags=(RenderableHitboxTag.ROOM_OCCUPANT, ), is_static=True)]
+
+
+def setup_screen():
+    game = Game.headless()
+    screen = EmptyScreen(game)
+    game.screen = screen
+
+    return screen
+
+
+class TestPhysicsSystem:
+    def test_integrates_and_only_moves_changed_entities(self):
+        pytest.importorskip("numpy")
+
+        # Setup
+        screen = setup_screen()
+        physics_system = PhysicsSystem(capacity=1)
+
+        rolling = Ball(screen, (0, 0), speed=(10, 0))
+        falling = Ball(screen, (0, 0), acceleration=(0, 20), mass=2)
+        resting = Ball(screen, (5, 5))
+
+        # Capacity should grow as needed
+        physics_system.set_entities((rolling, falling, resting))
+        assert len(physics_system) == 3
+
+        position_changes = resting.position_changes
+        physics_system.step(500)
+
+        assert rolling.render_position == (5, 0)
+        assert falling.render_position == (0, 5)  # Semi-implicit Euler: velocity is updated first
+        assert resting.render_position == (5, 5)
+        assert resting.position_changes == position_changes
+
+        # Stat modifiers are only picked up once the system has been notified of them
+        falling.acceleration[1].base_value = 0
+        physics_system.flag_stats_changed(falling)
+        physics_system.apply_impulse(falling, (0, -20))
+        physics_system.step(500)
+        assert physics_system.get_velocity(falling) == (0, 0)
+        assert falling.render_position == (0, 5)
+
+        # Removing an entity should not affect the others
+        assert rolling.render_position == (10, 0)
+        physics_system.remove(rolling)
+        physics_system.step(500)
+        assert rolling.render_position == (10, 0)
+        assert physics_system.entities == (resting, falling)
+        assert (rolling.physics_system, falling.physics_system) == (None, physics_system)
+        assert falling.render_position == (0, 5)
+
+        # Moves made by other code are kept in sync with the system's stored positions
+        physics_system.set_velocity(falling, (2, 0))
+        falling.render_position = (50, 50)
+        physics_system.step(500)
+        assert falling.render_position == (51, 50)
+
+    def test_entities_moved_between_steps_are_resynced(self):
+        pytest.importorskip("numpy")
+
+        # Setup
+        screen = setup_screen()
+        physics_system = PhysicsSystem()
+
+        ball = Ball(screen, (0, 0))
+        physics_system.add(ball)
+
+        ball.move_render_position(100, 100)
+        physics_system.set_velocity(ball, (10, 0))
+        physics_system.step(100)
+        assert ball.render_position == (101, 100)
+
+        ball.x_render_position = 0
+        physics_system.step(100)
+        assert ball.render_position == (1, 100)
+
+        # Stored positions which are out of date for any other reason should still be corrected before integrating
+        physics_system._positions[0] = (0, 0)
+        physics_system.step(100)
+        assert ball.render_position == (2, 100)
+
+    def test_resolves_contacts_and_sleeps_resting_islands(self):
+        pytest.importorskip("numpy")
+
+        # Setup
+        screen = setup_screen()
+        hitbox_manager = screen.hitbox_manager
+        physics_system = PhysicsSystem(restitution=1)
+
+        # Equal masses should fully exchange momentum in an elastic collision
+        striker = Ball(screen, (0, 0), speed=(100, 0))
+        target = Ball(screen, (9, 0))
+        physics_system.set_entities((striker, target))
+
+        physics_system.step(10, hitbox_manager=hitbox_manager)
+        assert physics_system.get_velocity(striker) == (0, 0)
+        assert physics_system.get_velocity(target) == (100, 0)
+        # Pushed apart, down to an overlap of PhysicsSystem.CONTACT_SLOP
+        assert striker.render_position[0] + 10 - PhysicsSystem.CONTACT_SLOP <= target.render_position[0]
+
+        # A stack of boxes falling onto a static floor should come to rest and be put to sleep as a single island
+        physics_system = PhysicsSystem()
+        floor = Floor(screen, (0, 100))
+        lower_box = Ball(screen, (50, 80), acceleration=(0, 600))
+        upper_box = Ball(screen, (50, 60), acceleration=(0, 600))
+        physics_system.set_entities((lower_box, upper_box))
+
+        for _ in range(120):
+            physics_system.step(1000 / 60, hitbox_manager=hitbox_manager)
+
+        assert physics_system.is_sleeping(lower_box) and physics_system.is_sleeping(upper_box)
+        assert 90 <= lower_box.render_position[1] < 92
+        assert 80 <= upper_box.render_position[1] < lower_box.render_position[1] - 8
+        assert not any(floor.hitboxes & set(pair) for pair in hitbox_manager.candidate_pairs())
+
+        # Disturbing one box should wake the whole island
+        physics_system.apply_impulse(upper_box, (0, -100))
+        assert not physics_system.is_sleeping(lower_box)
+
+    def test_does_not_sleep_unsupported_or_accelerating_entities(self):
+        pytest.importorskip("numpy")
+
+        # Setup
+        screen = setup_screen()
+        hitbox_manager = screen.hitbox_manager
+        physics_system = PhysicsSystem()
+
+        drifting = Ball(screen, (0, 0), speed=(1, 0))  # Slower than the sleep speed, but not resting on anything
+        floating = Ball(screen, (100, 0), acceleration=(0, 1))  # Only barely accelerating
+        physics_system.set_entities((drifting, floating))
+
+        for _ in range(120):
+            physics_system.step(1000 / 60, hitbox_manager=hitbox_manager)
+
+        assert not (physics_system.is_sleeping(drifting) or physics_system.is_sleeping(floating))
+        assert physics_system.get_velocity(drifting) == (1, 0)
+        assert drifting.render_position[0] == pytest.approx(2)
+        assert floating.render_position[1] == pytest.approx(2, abs=0.05)
+
+        # An entity pressed against a floor by a constant acceleration should still be able to sleep,
+        # but not while it is sliding along the floor under that acceleration
+        floor = Floor(screen, (0, 100))
+        sliding = Ball(screen, (10, 91), acceleration=(30, 600))
+        physics_system.set_entities((sliding, ))
+
+        for _ in range(120):
+            physics_system.step(1000 / 60, hitbox_manager=hitbox_manager)
+
+        assert not physics_system.is_sleeping(sliding)
+        assert physics_system.get_velocity(sliding)[0] == pytest.approx(60)
@@ -0,0 +1,236 @@
+from datetime import timedelta
+
+from managedstate import State
+from managedstate.extensions import Registrar
+from pygame import Surface
+
+from roomy import Game
+from roomy.animations import Animation
+from roomy.extensions import Animated
+from roomy.renderables import Renderable, Screen
+
+
+class RecordingScreen(Screen):
+    def __init__(self, game):
+        super().__init__(game, State.with_extensions(Registrar)())
+
+        self.updated = []
+        self.framed = []
+
+    def _update(self, tick_number, elapsed_ms, input_events, *args, **kwargs):
+        super()._update(tick_number, elapsed_ms, input_events, *args, **kwargs)
+
+        self.updated.append(self)
+
+    def _frame(self, ms_since_last_tick, ms_since_last_frame):
+        self.framed.append(self)
+
+
+class RecordingRenderable(Renderable):
+    def __init__(self, parent, priority):
+        super().__init__(parent.game, parent=parent, render_position=(0, 0), priority=priority)
+
+    def _update(self, tick_number, elapsed_ms, input_events, *args, **kwargs):
+        self.game.screen.updated.append(self)
+
+    def _frame(self, ms_since_last_tick, ms_since_last_frame):
+        self.game.screen.framed.append(self)
+
+
+class BoundsRecordingRenderable(RecordingRenderable):
+    def __init__(self, parent, priority):
+        self.bounds_changes = 0
+
+        super().__init__(parent, priority)
+
+    def _on_bounds_changed(self):
+        self.bounds_changes += 1
+
+
+class CountingAnimation(Animation):
+    def __init__(self, parent, animation_key):
+        super().__init__(parent, animation_key, priority=0)
+
+        self.updates = 0
+        self._frame = Surface((1, 1))
+
+    @property
+    def frame(self):
+        return self._frame
+
+    def _update(self, elapsed_ms):
+        self.updates += 1
+
+
+class AnimatedRenderable(Renderable.with_extensions(Animated)):
+    def __init__(self, parent):
+        super().__init__(parent.game, parent=parent, render_position=(0, 0), priority=0)
+
+    def generate_animation(self):
+        return CountingAnimation(self, "count")
+
+
+class TestRenderable:
+    def test_updates_follow_hierarchy_changes(self):
+        # Setup
+        game = Game.headless()
+        screen = RecordingScreen(game)
+        game.screen = screen
+
+        back = RecordingRenderable(screen, priority=0)
+        front = RecordingRenderable(screen, priority=1)
+        front_child = RecordingRenderable(front, priority=0)
+
+        game.run_ticks(1)
+        assert screen.updated == [front_child, front, back, screen]
+
+        # Reprioritising, adding and removing children should all be reflected in the next tick
+        screen.updated.clear()
+        back.render_priority = 2
+        back_child = RecordingRenderable(back, priority=0)
+        front_child.parent_recurface = None
+
+        game.run_ticks(1)
+        assert screen.updated == [back_child, back, front, screen]
+
+    def test_dormant_renderables_are_skipped_until_woken(self):
+        # Setup
+        game = Game.headless()
+        screen = RecordingScreen(game)
+        game.screen = screen
+
+        sleeper = RecordingRenderable(screen, priority=0)
+        sleeper_child = RecordingRenderable(sleeper, priority=0)
+
+        sleeper.sleep(duration_ms=100, wake_event_key="alarm")
+        game.run_ticks(1)
+        assert screen.updated == [screen]
+
+        # Wakes the sleeper ahead of its timer
+        game.game_event_handler.on_event("alarm")
+        game.run_ticks(1)
+        assert screen.updated == [screen, sleeper_child, sleeper, screen]
+
+        screen.updated.clear()
+        sleeper.sleep(duration_ms=50)
+        game.run_ticks(3, ms_per_tick=20)
+        assert screen.updated == [screen, screen, sleeper_child, sleeper, screen]
+
+    def test_wake_event_callbacks_do_not_accumulate(self):
+        # Setup
+        game = Game.headless()
+        screen = RecordingScreen(game)
+        game.screen = screen
+
+        sleeper = RecordingRenderable(screen, priority=0)
+
+        def count_callbacks(event_key):
+            return len(game.game_event_handler._callbacks.get(event_key, set()))
+
+        # Woken directly
+        for _ in range(5):
+            sleeper.sleep(wake_event_key="never")
+            sleeper.wake()
+        assert count_callbacks("never") == 0
+
+        # Put back to sleep before being woken
+        for _ in range(5):
+            sleeper.sleep(wake_event_key="never")
+        assert count_callbacks("never") == 1
+
+        # Woken by a timer
+        sleeper.sleep(duration_ms=20, wake_event_key="never")
+        game.run_ticks(2, ms_per_tick=20)
+        assert not sleeper.is_dormant
+        assert count_callbacks("never") == 0
+
+        # Woken by the event itself
+        sleeper.sleep(wake_event_key="alarm")
+        game.game_event_handler.on_event("alarm")
+        assert not sleeper.is_dormant
+        assert count_callbacks("alarm") == 0
+
+    def test_update_divisors_are_spread_across_ticks(self):
+        # Setup
+        game = Game.headless()
+        screen = RecordingScreen(game)
+        game.screen = screen
+
+        divided = [RecordingRenderable(screen, priority=0) for renderable_index in range(4)]
+        for renderable in divided:
+            renderable.update_divisor = 4
+
+        for tick_index in range(8):
+            screen.updated.clear()
+            game.run_ticks(1)
+
+            assert len(screen.updated) == 2
+
+        # Waking should keep the divisor, but discard any time accumulated before falling dormant
+        sleeper = divided[0]
+        game.run_ticks(1)
+        sleeper.sleep()
+        sleeper.wake()
+        assert sleeper.update_divisor == 4
+
+        screen.updated.clear()
+        game.run_ticks(4)
+        assert screen.updated.count(sleeper) == 1
+
+    def test_frames_follow_update_order_and_advance_animations_once_per_frame(self):
+        # Setup
+        game = Game.headless()
+        screen = RecordingScreen(game)
+        game.screen = screen
+
+        back = RecordingRenderable(screen, priority=0)
+        front = RecordingRenderable(screen, priority=1)
+        front_child = RecordingRenderable(front, priority=0)
+        animated = AnimatedRenderable(front_child)
+
+        game.run_ticks(1)
+        screen.frame(0, 0)
+        assert screen.framed == screen.updated == [front_child, front, back, screen]
+
+        # Several ticks are run per frame here, but animations should only advance when a frame is rendered
+        animation = animated.animation
+        animation_updates = animation.updates
+        animation_elapsed = animation.elapsed
+
+        game.run_ticks(3, ms_per_tick=20)
+        assert animation.updates == animation_updates
+        screen.frame(0, 60)
+        assert animation.updates == animation_updates + 1
+
+        game.run_ticks(2, ms_per_tick=20, do_render=True)
+        assert animation.updates == animation_updates + 3
+        assert animation.elapsed - animation_elapsed == timedelta(milliseconds=100)
+
+    def test_bounds_changes_are_only_flagged_once_when_bounds_change(self):
+        # Setup
+        game = Game.headless()
+        screen = RecordingScreen(game)
+        game.screen = screen
+
+        parent = BoundsRecordingRenderable(screen, priority=0)
+        child = BoundsRecordingRenderable(parent, priority=0)
+        parent.surface = Surface((10, 10))
+        parent.bounds_changes = child.bounds_changes = 0
+
+        parent.render_position = (5, 5)
+        assert (parent.bounds_changes, child.bounds_changes) == (1, 1)
+
+        # Nothing has changed here, so nothing should be flagged
+        parent.render_position = (5, 5)
+        parent.surface = Surface((10, 10))
+        parent.update_surface()
+        child.parent_recurface = parent
+        assert (parent.bounds_changes, child.bounds_changes) == (1, 1)
+
+        # A new surface size only changes the parent's own bounds
+        parent.surface = Surface((20, 20))
+        assert (parent.bounds_changes, child.bounds_changes) == (2, 1)
+
+        # Moving to a parent at a different absolute position changes the child's bounds
+        child.parent_recurface = screen
+        assert child.bounds_changes == 2